@@ -0,0 +1,58 @@
+"""Tokens per second of the PLY lexer against the hand-written scanner.
+
+    python benchmarks/lexer_throughput.py [statements]
+
+Both run over the same generated program, after checking that they produce
+the same token stream. Literal values are read from every token, as the
+parser does, so the scanner's lazy boxing is not left out of the timing.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from muni_lexer import build_lexer
+from muni_scanner import Scanner
+
+
+def program(statements):
+    lines = []
+    for i in range(statements // 4):
+        lines.append(f"int v{i} = {i} * 2 + 1; # counter")
+        lines.append(f"float f{i} = {i}.5 / 3.0e2 - 2j;")
+        lines.append(f'string s{i} = "item {i}"; list<int> l{i} = [1, 2, {i}];')
+        lines.append(f"if (v{i} >= 10 & true) {{ v{i} -= 1; }} else {{ v{i} += (0..{i})[0]; }}")
+    return "\n".join(lines)
+
+
+def tokenize(lexer, source):
+    lexer.lineno = 1
+    lexer.input(source)
+    return [(token.type, str(token.value), token.lineno, token.lexpos) for token in lexer]
+
+
+def measure(lexer, source):
+    lexer.input(source)
+    count = 0
+    started = time.perf_counter()
+    for token in lexer:
+        token.value
+        count += 1
+    return count, time.perf_counter() - started
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = program(statements)
+    ply_lexer, scanner = build_lexer(), Scanner()
+    if tokenize(ply_lexer, source) != tokenize(scanner, source):
+        sys.exit("The scanner and the PLY lexer disagree on the benchmark program")
+
+    for name, lexer in [("ply", ply_lexer), ("scanner", scanner)]:
+        count, seconds = measure(lexer, source)
+        print(f"{name:<10}{count:>10} tokens{seconds:>9.3f} s{count / seconds:>12.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Parse time against input size for the shapes that grow a sequence one
+item per grammar reduction: statements, list and dict literals, call
+arguments and function parameters, plus arithmetic heavy statements.
+
+    python benchmarks/parser_scaling.py [sizes...]
+
+Time per item should stay roughly flat as the size grows. Every shape is
+parsed with each parser of muni_parser.PARSERS, after checking they agree.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.setrecursionlimit(100000)
+
+import muni_parser
+from muni_test import tree_shape
+
+
+def statements(size):
+    return "\n".join(f"int v{i} = {i};" for i in range(size))
+
+def list_literal(size):
+    return "list l = [" + ", ".join(str(i) for i in range(size)) + "];"
+
+def dict_literal(size):
+    return "dict d = {" + ", ".join(f"{i}: {i}" for i in range(size)) + "};"
+
+def arguments(size):
+    return "f(" + ", ".join(str(i) for i in range(size)) + ");"
+
+def parameters(size):
+    return "int f(" + ", ".join(f"int a{i}" for i in range(size)) + ") { return 0; }"
+
+def arithmetic(size):
+    return "\n".join(f"x = (a{i} + {i}) * b - c / 2 > d[{i}] -> float;" for i in range(size))
+
+shapes = [statements, list_literal, dict_literal, arguments, parameters, arithmetic]
+
+
+def measure(source, parser):
+    muni_parser.set_parser(parser)
+    started = time.perf_counter()
+    ast = muni_parser.parse(source)
+    return time.perf_counter() - started, ast
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [5000, 10000, 20000, 40000]
+    header = "".join(f"{parser + ' s':>10}{'us/item':>10}" for parser in muni_parser.PARSERS)
+    print(f"{'shape':<14}{'size':>8}{header}{'speedup':>10}")
+    for shape in shapes:
+        for size in sizes:
+            source = shape(size)
+            results = [measure(source, parser) for parser in muni_parser.PARSERS]
+            if len({repr(tree_shape(ast)) for _, ast in results}) != 1:
+                sys.exit(f"The parsers disagree on {shape.__name__} {size}")
+            columns = "".join(f"{seconds:>10.3f}{seconds / size * 1e6:>10.2f}" for seconds, _ in results)
+            print(f"{shape.__name__:<14}{size:>8}{columns}{results[0][0] / results[-1][0]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import os
 import sys
 import requests
 import json
+import threading
 
 current_dir = os.path.dirname(os.path.realpath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -15,4 +16,46 @@ def get(url, headers=None, params=None, data=None, timeout=10):
 
 def post(url, data=None):
     return json.loads(requests.post(url, json=data.to_standard_type()).text)
-    
\ No newline at end of file
+    
+
+# Responses of the async requests, by the signal they emit
+responses = {}
+
+
+def request_async(signal, send, *args, **kwargs):
+    runtime = ContextManager().get_runtime()
+    if signal not in runtime.signals:
+        raise Muni_Error(f"Signal Error: {signal} not a signal.")
+
+    async def request():
+        import asyncio
+        # requests blocks, a thread of its own keeps the handlers running
+        # meanwhile. Not an executor, those cannot start while the program
+        # waits for its handlers at exit.
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+
+        def send_request():
+            try:
+                result = send(*args, **kwargs)
+            except Exception as error:
+                loop.call_soon_threadsafe(done.set_exception, error)
+                return
+            loop.call_soon_threadsafe(done.set_result, result)
+        threading.Thread(target=send_request, daemon=True).start()
+        response = await done
+        responses[signal] = json.loads(response.text)
+        runtime.emit_signal(signal)
+    runtime.scheduler.spawn(request())
+
+
+def get_async(url, signal, headers=None, params=None, data=None, timeout=10):
+    request_async(signal, requests.get, url, headers=headers, params=params, data=data, timeout=timeout)
+
+
+def post_async(url, signal, data=None, timeout=10):
+    request_async(signal, requests.post, url, json=data, timeout=timeout)
+
+
+def response(signal):
+    return responses.get(signal)
@@ -118,11 +118,26 @@ class String(AstNode):
     def __repr__(self):
         return self.__str__()
 
+class Constant(AstNode):
+    # A value computed ahead of time by the optimizer, copied on every evaluation
+    def __init__(self, value, lineno=None, col_offset=None):
+        super().__init__(lineno, col_offset)
+        if not isinstance(value, Muni_Type):
+            raise TypeError("Constant node requires a Muni type")
+        self.value = value
+
+    def __str__(self):
+        return f"Constant({self.value})"
+
+    def __repr__(self):
+        return self.__str__()
+
 
 
 class Assignment(AstNode):
-    def __init__(self, name, value, lineno=None, col_offset=None):
+    def __init__(self, name, value, lineno=None, col_offset=None, address=None):
         super().__init__(lineno, col_offset)
+        self.address = address
         self.name = name
         self.value = value
 
@@ -130,8 +145,9 @@ class Assignment(AstNode):
         return f"Assignment(name='{self.name}', value={self.value})"
 
 class ExpressionAssignment(AstNode):
-    def __init__(self, name, operator, value, lineno=None, col_offset=None):
+    def __init__(self, name, operator, value, lineno=None, col_offset=None, address=None):
         super().__init__(lineno, col_offset)
+        self.address = address
         self.name = name
         self.operator = operator
         self.value = value
@@ -140,8 +156,9 @@ class ExpressionAssignment(AstNode):
         return f"ExpressionAssignment(name='{self.name}', operator='{self.operator}', value={self.value})"
 
 class Declaration(AstNode):
-    def __init__(self, type_specifier, name, value=None, lineno=None, col_offset=None):
+    def __init__(self, type_specifier, name, value=None, lineno=None, col_offset=None, address=None):
         super().__init__(lineno, col_offset)
+        self.address = address
         self.type_specifier = type_specifier
         self.name = name
         self.value = value
@@ -187,8 +204,9 @@ class ElementAssignment(AstNode):
         return f"ElementAssignment(name='{self.name}', index={self.index}, value={self.value})"
 
 class Variable(AstNode):
-    def __init__(self, name, lineno=None, col_offset=None):
+    def __init__(self, name, lineno=None, col_offset=None, address=None):
         super().__init__(lineno, col_offset)
+        self.address = address
         self.name = name
 
     def __str__(self):
@@ -309,6 +327,21 @@ class ForInStatement(AstNode):
         return f"ForInStatement(type_specifier={self.type_specifier}, identifier={self.identifier}, iterable={self.iterable}, body={','.join([str(statement) for statement in self.body])})"
 
 
+class ParallelForInStatement(AstNode):
+    def __init__(self, type_specifier, identifier, iterable, body, reductions, ordered, lineno=None, col_offset=None):
+        super().__init__(lineno, col_offset)
+        self.type_specifier = type_specifier
+        self.identifier = identifier
+        self.iterable = iterable
+        self.body = body
+        # (name, operator) pairs, merged back into the variables after the loop
+        self.reductions = reductions
+        self.ordered = ordered
+
+    def __str__(self):
+        return f"ParallelForInStatement(type_specifier={self.type_specifier}, identifier={self.identifier}, iterable={self.iterable}, reductions={self.reductions}, ordered={self.ordered}, body={','.join([str(statement) for statement in self.body])})"
+
+
 class ForStatement(AstNode):
     def __init__(self, begin_statement, condition, end_statement, body, lineno=None, col_offset=None):
         super().__init__(lineno, col_offset)
@@ -0,0 +1,276 @@
+import contextlib
+import gc
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from run import create_runtime, load_program
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_DIRECTORY = os.path.join(DIRECTORY, 'benchmarks')
+# The outputs expected of the benchmarks and their tolerances, the same on every machine
+BASELINE_PATH = os.path.join(BENCHMARK_DIRECTORY, 'baseline.json')
+# How much slower than its recorded timings a benchmark may run, unless the baseline gives its own
+DEFAULT_TOLERANCE = 0.25
+# What must be the same for timings to compare, those recorded elsewhere say nothing about this machine
+MACHINE_KEYS = ("host", "machine", "platform", "implementation", "python")
+
+
+def benchmark_paths(names=None):
+    """The .mun programs of benchmarks/, or the ones named, by name."""
+    paths = {os.path.basename(path)[:-4]: path for path in sorted(glob.glob(os.path.join(BENCHMARK_DIRECTORY, '*.mun')))}
+    if not names:
+        return paths
+    unknown = [name for name in names if name not in paths]
+    if unknown:
+        raise ValueError(f"Unknown benchmark {', '.join(unknown)}, expected one of {', '.join(paths)}")
+    return {name: paths[name] for name in names}
+
+
+def summarize(times):
+    return {
+        "runs": len(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "min": min(times),
+        "median": statistics.median(times),
+    }
+
+
+@contextlib.contextmanager
+def in_directory(path):
+    # Benchmarks import their modules relative to benchmarks/, like run.py would from there
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def run_once(name, ast, engine, vectorize):
+    """Run a parsed benchmark in a new runtime of this process and return what it printed."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        runtime = create_runtime(engine, vectorize)
+        for _ in runtime.execute(ast):
+            pass
+        # The handlers still running are part of the program, as when run.py exits
+        runtime.scheduler.shutdown()
+    if runtime.error is not None:
+        raise RuntimeError(f"Benchmark {name} failed: {runtime.error}")
+    return output.getvalue()
+
+
+def measure_warm(name, path, engine="tree", vectorize=False, repeat=5):
+    """Time repeated runs in this process, once the program is parsed and a first run is done."""
+    with in_directory(BENCHMARK_DIRECTORY):
+        ast = load_program(path)
+        output = run_once(name, ast, engine, vectorize)
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            started = time.perf_counter()
+            run_once(name, ast, engine, vectorize)
+            times.append(time.perf_counter() - started)
+        # A run of its own, tracing allocations slows it down
+        tracemalloc.start()
+        try:
+            run_once(name, ast, engine, vectorize)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return summarize(times), output, peak
+
+
+def measure_cold(name, path, engine="tree", vectorize=False, repeat=5):
+    """Time runs of run.py in new processes without the AST cache, from startup to exit."""
+    command = [sys.executable, os.path.join(DIRECTORY, 'run.py'), '--no-cache', '-e', engine, path]
+    if vectorize:
+        command.append('--vectorize')
+    # ru_maxrss is in kilobytes, but in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    times = []
+    peak = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=BENCHMARK_DIRECTORY, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        _, status, usage = os.wait4(process.pid, 0)
+        times.append(time.perf_counter() - started)
+        errors = process.stderr.read().decode()
+        process.stderr.close()
+        if os.waitstatus_to_exitcode(status) != 0:
+            raise RuntimeError(f"Benchmark {name} failed: {errors}")
+        peak = max(peak, usage.ru_maxrss * scale)
+    return summarize(times), peak
+
+
+def interpreter_version():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=DIRECTORY, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "machine": platform.machine(), "host": platform.node()}
+
+
+def run_benchmarks(names=None, engine="tree", vectorize=False, repeat=5, cold=True, progress=None):
+    """Run the benchmarks and return their timings and peak memory, in seconds and bytes.
+
+    Warm times are runs in this process, cold times whole run.py processes.
+    """
+    results = {
+        "interpreter": interpreter_version(),
+        "engine": engine,
+        "vectorize": vectorize,
+        "repeat": repeat,
+        "benchmarks": {},
+    }
+    for name, path in benchmark_paths(names).items():
+        if progress is not None:
+            progress(name)
+        warm, output, warm_peak = measure_warm(name, path, engine, vectorize, repeat)
+        result = {"output": output.strip(), "warm": warm, "warm_peak_memory": warm_peak}
+        if cold:
+            result["cold"], result["cold_peak_rss"] = measure_cold(name, path, engine, vectorize, repeat)
+        results["benchmarks"][name] = result
+    return results
+
+
+def format_time(summary):
+    return f"{summary['mean'] * 1000:9.1f} ± {summary['stdev'] * 1000:6.1f} ms"
+
+
+def print_results(results, file=sys.stdout):
+    print(f"Benchmarks, {results['engine']} engine, {results['repeat']} runs each:", file=file)
+    print(f"  {'benchmark':<14}{'warm':>21}{'cold':>21}{'peak traced':>14}{'peak rss':>12}", file=file)
+    for name, result in results["benchmarks"].items():
+        cold = result.get("cold")
+        cold_time = format_time(cold) if cold else "-"
+        cold_peak = f"{result['cold_peak_rss'] / 2**20:.1f} MB" if cold else "-"
+        print(f"  {name:<14}{format_time(result['warm']):>21}{cold_time:>21}"
+              f"{result['warm_peak_memory'] / 2**20:>11.2f} MB{cold_peak:>12}", file=file)
+
+
+def write_results(results, path):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+
+
+def load_results(path):
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def timings_path(baseline_path):
+    """Where the timings of this machine are recorded, next to the baseline and kept out of git."""
+    return os.path.splitext(baseline_path)[0] + '.timings.json'
+
+
+def mismatch(timings, results):
+    """Why recorded timings cannot be compared with results, or None when they can."""
+    if timings["engine"] != results["engine"]:
+        return f"with the {timings['engine']} engine, run it with -e {timings['engine']}"
+    for key in MACHINE_KEYS:
+        recorded, current = timings["interpreter"].get(key), results["interpreter"].get(key)
+        if recorded != current:
+            return f"with {key} {recorded}, this is {current}"
+    return None
+
+
+def record_timings(results, path):
+    """Write results as the timings of this machine, keeping those of other benchmarks recorded here before."""
+    timings = dict(results)
+    if os.path.exists(path):
+        old = load_results(path)
+        if mismatch(old, results) is None:
+            timings["benchmarks"] = {**old["benchmarks"], **results["benchmarks"]}
+    write_results(timings, path)
+
+
+def compare(results, baseline, timings=None):
+    """Compare results with the outputs of a baseline and the timings recorded on this machine.
+
+    A benchmark fails when it prints something else than its baseline, and
+    regresses when its median is slower than the recorded one by more than
+    its tolerance, warm or cold, and by more than twice the spread of the
+    runs. Medians are compared as a run that was lucky, or slowed down by
+    the rest of the machine, moves them the least. Without timings only
+    the outputs are checked. Returns rows of (benchmark, timing, recorded
+    seconds, seconds, tolerance, status).
+    """
+    rows = []
+    default = baseline.get("default_tolerance", DEFAULT_TOLERANCE)
+    recorded = timings["benchmarks"] if timings is not None else {}
+    for name, result in results["benchmarks"].items():
+        expected = baseline["benchmarks"].get(name)
+        if expected is None:
+            rows.append((name, "output", None, None, None, "new"))
+            continue
+        tolerance = expected.get("tolerance", default)
+        rows.append((name, "output", None, None, tolerance, "ok" if result["output"] == expected["output"] else "WRONG OUTPUT"))
+        for timing in ("warm", "cold"):
+            if timing not in result:
+                continue
+            if timing not in recorded.get(name, {}):
+                rows.append((name, timing, None, result[timing]["median"], tolerance, "not recorded"))
+                continue
+            before, after = recorded[name][timing]["median"], result[timing]["median"]
+            spread = 2 * max(recorded[name][timing]["stdev"], result[timing]["stdev"])
+            if after > before * (1 + tolerance) and after - before > spread:
+                status = "REGRESSION"
+            elif after < before / (1 + tolerance):
+                status = "faster"
+            else:
+                status = "ok"
+            rows.append((name, timing, before, after, tolerance, status))
+    return rows
+
+
+def check(results, baseline, timings, rerun):
+    """Compare results as compare does, running the benchmarks that look slower again.
+
+    A busy machine slows down whatever it runs, a regression has to show in
+    both runs. rerun(names) returns the results of running those benchmarks
+    again, the faster runs of the two are kept.
+    """
+    rows = compare(results, baseline, timings)
+    suspects = sorted({row[0] for row in rows if row[5] == "REGRESSION"})
+    if not suspects:
+        return rows
+    again = rerun(suspects)
+    for name in suspects:
+        result = results["benchmarks"][name]
+        for timing in ("warm", "cold"):
+            if timing in result and again["benchmarks"][name][timing]["median"] < result[timing]["median"]:
+                result[timing] = again["benchmarks"][name][timing]
+    return compare(results, baseline, timings)
+
+
+def failed(rows):
+    return any(row[5] in ("REGRESSION", "WRONG OUTPUT") for row in rows)
+
+
+def print_comparison(rows, path, file=sys.stdout):
+    print(f"Against {path}:", file=file)
+    print(f"  {'benchmark':<20}{'recorded':>12}{'now':>12}{'change':>16}{'tolerance':>11}  status", file=file)
+    for name, timing, before, after, tolerance, status in rows:
+        label = f"{name} {timing}"
+        if before is None or after is None:
+            print(f"  {label:<20}{'-':>12}{'-' if after is None else f'{after * 1000:.1f} ms':>12}{'-':>16}"
+                  f"{'-' if tolerance is None else f'{tolerance:.0%}':>11}  {status}", file=file)
+            continue
+        if after <= before:
+            change = f"{before / after:.2f}x faster"
+        else:
+            change = f"{after / before:.2f}x slower"
+        print(f"  {label:<20}{before * 1000:>9.1f} ms{after * 1000:>9.1f} ms{change:>16}{tolerance:>11.0%}  {status}", file=file)
+    regressions = sum(row[5] in ("REGRESSION", "WRONG OUTPUT") for row in rows)
+    print(f"{regressions} regression{'' if regressions == 1 else 's'}", file=file)
@@ -0,0 +1,557 @@
+import operator as py_operator
+from muni_types import *
+from muni_ast_nodes import *
+from muni_error import *
+
+
+# The VM tests opcodes in this order, one group after the other: the
+# instructions of loops and arithmetic, then those of calls and branches
+opnames = [
+    'LOAD_NAME',          # push the variable names[arg]
+    'COMPARE_JUMP_IF_FALSE',  # consts[arg] = [i, target, number], pop right unless the number is given, pop left,
+                              # continue at target unless comparison_operators[i](left, right) holds
+    'AUG_ASSIGN_CONST',   # apply consts[arg] = (name, operator, address, scalar_binary index, number)
+    'JUMP_BACK',          # continue at arg if the runtime is still running
+    'ASSIGN_BINARY',      # consts[arg] = (name, address, i, number), pop right unless the number is given, pop left,
+                          # assign scalar_binary[i](left, right) without building it first
+    'LOAD_CONST',         # push consts[arg]
+    'LOAD_SLOT',          # push the resolved variable consts[arg] = (name, address)
+    'BINARY_OP_CONST',    # replace top with binary_operators[i](top, number), consts[arg] = (i, number)
+    'ASSIGN',             # pop value, assign it to consts[arg] = (name, address)
+    'BINARY_OP',          # pop right and left, push binary_operators[arg](left, right)
+    'AUG_ASSIGN_SCALAR',  # pop value, apply consts[arg] = (name, operator, address, scalar_binary index)
+
+    'LOOKUP_FUNCTION',    # push the function named consts[arg]
+    'CALL',               # pop consts[arg][1] arguments and the function, push the result
+    'RETURN_VALUE',       # leave the code with the top of the stack
+    'POP_TOP',            # discard the top of the stack
+    'DECLARE_SCALAR',     # pop value, declare the int or float consts[arg] = (name, type_specifier, address, type)
+    'COMPARE_JUMP_IF_TRUE',   # like COMPARE_JUMP_IF_FALSE, continue at target if the comparison holds
+    'COMPARE_OP',         # pop right and left, push comparison_operators[arg](left, right)
+    'POP_JUMP_IF_FALSE',  # pop the top and continue at arg if it is falsy
+    'POP_JUMP_IF_TRUE',   # pop the top and continue at arg if it is truthy
+    'JUMP',               # continue at arg
+    'LOAD_COPY',          # push a copy of consts[arg]
+    'SUBSCR',             # pop index and object, push object[index]
+    'FOR_ITER',           # push the next item, or pop the iterator and continue at arg
+    'BIND_LOOP_VAR',      # pop value, bind consts[arg] = (name, type_specifier)
+    'DECLARE',            # pop value, declare consts[arg] = (name, type_specifier, address)
+    'AUG_ASSIGN',         # pop value, apply consts[arg] = (name, operator, address)
+
+    'EVAL_CONST',         # push runtime.evaluate(consts[arg])
+    'LOGICAL_OP',         # pop right and left, push apply_logical_operator(left, right, logical_operators[arg])
+    'NOT',                # replace top with its boolean negation
+    'NEGATE',             # replace top with its arithmetic negation
+    'CAST',               # replace top with perform_cast(consts[arg], top)
+    'RAISE_RETURN',       # pop a value and raise it as a ReturnException
+    'REPEAT',             # decrement the counter on top, or pop it and continue at arg
+    'GET_ITER',           # replace top with an iterator over it
+    'CASE_MATCH',         # pop a case value, push case == switch value (left below it)
+    'BUILD_LIST',         # pop arg items, push a Muni_List
+    'BUILD_DICT',         # pop arg key/value pairs, push a Muni_Dict
+    'STORE_SUBSCR',       # pop value, index and object, assign into the variable consts[arg]
+    'BUILD_RANGE',        # pop step, end and start, push a range, inclusive if arg
+    'THROW',              # pop a message and raise a Muni_Error
+    'LOAD_ARG',           # push the program argument arg
+    'LOAD_DOT',           # push the module attribute consts[arg]
+    'DEFINE_FUNCTION',    # define the function declaration consts[arg]
+    'DEFINE_MODULE',      # define the module declaration consts[arg]
+    'IMPORT',             # run the import statement consts[arg], push its result
+    'DEFINE_SIGNAL',      # declare the signal names[arg]
+    'EMIT',               # emit the signal names[arg]
+    'WHEN',               # register the handler consts[arg] = (signal, statements)
+    'WATCH',              # register the watcher consts[arg] = (variable, statements)
+    'PARALLEL_FOR',       # pop the iterable, run the parallel loop consts[arg] over it, push its result
+]
+
+for opcode, opname in enumerate(opnames):
+    globals()[opname] = opcode
+
+binary_operators = ['+', '-', '*', '/', '%']
+comparison_operators = ['>', '<', '==', '>=', '<=', '!=']
+logical_operators = ['&', '|', '^']
+
+# Applied to the python values of two ints or two floats, what the Muni_Int
+# and Muni_Float methods would give. Division and modulus keep their checks.
+scalar_binary = [py_operator.add, py_operator.sub, py_operator.mul, None, None]
+scalar_comparisons = [py_operator.gt, py_operator.lt, py_operator.eq, py_operator.ge, py_operator.le, py_operator.ne]
+
+scalar_types = (Muni_Int, Muni_Float)
+
+declared_types = {
+    'int': Muni_Int,
+    'float': Muni_Float,
+}
+
+# A fused compare and jump keeps its target in its constant, next to the comparison
+compare_jump_opcodes = {COMPARE_JUMP_IF_FALSE, COMPARE_JUMP_IF_TRUE}
+
+jump_opcodes = {JUMP, JUMP_BACK, POP_JUMP_IF_FALSE, POP_JUMP_IF_TRUE, REPEAT, FOR_ITER} | compare_jump_opcodes
+
+
+def jump_target(code, offset):
+    opcode, arg = code.ops[offset], code.ops[offset + 1]
+    if opcode in compare_jump_opcodes:
+        return code.consts[arg][1]
+    return arg
+
+
+class Code:
+    """A linear instruction stream with its constant and name tables.
+
+    Instructions are stored flat in `ops` as opcode/argument pairs, so the
+    instruction at offset n is ops[n], ops[n + 1]. `lines` holds the source
+    line of every instruction, indexed by offset // 2.
+    """
+
+    def __init__(self, name, is_function=False):
+        self.name = name
+        self.is_function = is_function
+        self.ops = []
+        self.lines = []
+        self.consts = []
+        self.names = []
+        self.const_indexes = {}
+        self.name_indexes = {}
+
+    def emit(self, opcode, arg=0, lineno=None):
+        self.ops.append(opcode)
+        self.ops.append(arg)
+        self.lines.append(lineno)
+        return len(self.ops) - 2
+
+    def drop_last(self):
+        del self.ops[-2:]
+        self.lines.pop()
+
+    def patch(self, offset, target):
+        if self.ops[offset] in compare_jump_opcodes:
+            self.consts[self.ops[offset + 1]][1] = target
+        else:
+            self.ops[offset + 1] = target
+
+    def here(self):
+        return len(self.ops)
+
+    def add_const(self, value):
+        # Constants are shared by identity, the table keeps them alive
+        if id(value) not in self.const_indexes:
+            self.const_indexes[id(value)] = len(self.consts)
+            self.consts.append(value)
+        return self.const_indexes[id(value)]
+
+    def add_name(self, name):
+        if name not in self.name_indexes:
+            self.name_indexes[name] = len(self.names)
+            self.names.append(name)
+        return self.name_indexes[name]
+
+    def line_at(self, offset):
+        return self.lines[offset // 2]
+
+
+class BytecodeCompiler:
+    """Compiles AST nodes into Code objects for the VM in muni_vm.
+
+    Every expression leaves exactly one value on the stack. Statements in
+    blocks are compiled for effect and leave the stack as they found it.
+    The line recorded for an instruction is the line the tree-walking
+    runtime would have last seen when executing the same operation.
+    A compiler instance builds a single Code object.
+    """
+
+    def compile_statement(self, node):
+        code = Code(f"<statement line {node.lineno}>")
+        self.code = code
+        self.lineno = node.lineno
+        self.expression(node)
+        self.emit(RETURN_VALUE)
+        return code
+
+    def compile_function(self, function):
+        code = Code(function.name, is_function=True)
+        self.code = code
+        self.lineno = function.lineno
+        self.block(function.body)
+        self.emit(LOAD_CONST, code.add_const(None))
+        self.emit(RETURN_VALUE)
+        return code
+
+    def emit(self, opcode, arg=0):
+        return self.code.emit(opcode, arg, self.lineno)
+
+    def const(self, value):
+        return self.code.add_const(value)
+
+    def enter(self, node):
+        if node.lineno is not None:
+            self.lineno = node.lineno
+
+    def block(self, statements):
+        if not isinstance(statements, (list, tuple)):
+            statements = [statements]
+        for statement in statements:
+            self.statement(statement)
+
+    def statement(self, node):
+        if isinstance(node, Declaration):
+            self.enter(node)
+            self.expression(node.value)
+            declared_type = declared_types.get(node.type_specifier)
+            if declared_type is None:
+                self.emit(DECLARE, self.const((node.name, node.type_specifier, node.address)))
+            else:
+                self.emit(DECLARE_SCALAR, self.const((node.name, node.type_specifier, node.address, declared_type)))
+        elif isinstance(node, Assignment):
+            self.enter(node)
+            value = node.value
+            if isinstance(value, BinaryOperation) and scalar_binary[binary_operators.index(value.operator)] is not None:
+                # x = a + b stores the sum of two numbers straight into x
+                self.enter(value)
+                self.expression(value.left)
+                number = self.operand(value.right)
+                self.emit(ASSIGN_BINARY, self.const((node.name, node.address, binary_operators.index(value.operator), number)))
+            else:
+                self.expression(value)
+                self.emit(ASSIGN, self.const((node.name, node.address)))
+        elif isinstance(node, ExpressionAssignment):
+            self.enter(node)
+            index = binary_operators.index(node.operator[:-1])
+            if scalar_binary[index] is None:
+                self.expression(node.value)
+                self.emit(AUG_ASSIGN, self.const((node.name, node.operator, node.address)))
+            elif type(node.value) is Number:
+                # x += 1 needs no instruction to load the 1
+                self.enter(node.value)
+                self.emit(AUG_ASSIGN_CONST, self.const((node.name, node.operator, node.address, index, node.value.value)))
+            else:
+                self.expression(node.value)
+                self.emit(AUG_ASSIGN_SCALAR, self.const((node.name, node.operator, node.address, index)))
+        else:
+            self.expression(node)
+            # The value of a statement is dropped, a constant one is not even loaded
+            if self.code.ops[-2] == LOAD_CONST:
+                self.code.drop_last()
+            else:
+                self.emit(POP_TOP)
+
+    def expression(self, node):
+        if not isinstance(node, AstNode):
+            self.value(node)
+            return
+        self.enter(node)
+        method = getattr(self, 'compile_' + type(node).__name__, None)
+        if method is None:
+            raise Muni_Error(f"Unknown node type: {type(node)}")
+        method(node)
+
+    def value(self, value):
+        # Plain values follow Runtime.evaluate: Muni values are constants,
+        # None and python numbers are converted once, anything else stays dynamic.
+        if isinstance(value, Muni_Type):
+            self.emit(LOAD_CONST, self.const(value))
+        elif value is None:
+            self.emit(LOAD_CONST, self.const(Muni_Void()))
+        elif isinstance(value, int):
+            self.emit(LOAD_CONST, self.const(Muni_Int(value)))
+        elif isinstance(value, float):
+            self.emit(LOAD_CONST, self.const(Muni_Float(value)))
+        else:
+            self.emit(EVAL_CONST, self.const(value))
+
+    def compile_Number(self, node):
+        self.emit(LOAD_CONST, self.const(node.value))
+
+    compile_Boolean = compile_Number
+    compile_String = compile_Number
+
+    def compile_Constant(self, node):
+        self.emit(LOAD_COPY, self.const(node.value))
+
+    def compile_Variable(self, node):
+        if node.address is None:
+            self.emit(LOAD_NAME, self.code.add_name(node.name))
+        else:
+            self.emit(LOAD_SLOT, self.const((node.name, node.address)))
+
+    def compile_DotAccess(self, node):
+        self.emit(LOAD_DOT, self.const(node))
+
+    def compile_Declaration(self, node):
+        self.statement(node)
+        self.emit(LOAD_CONST, self.const(None))
+
+    compile_Assignment = compile_Declaration
+    compile_ExpressionAssignment = compile_Declaration
+
+    def operand(self, node):
+        # A number literal as right operand is kept in the instruction that
+        # uses it, anything else is pushed and None returned
+        if type(node) is Number:
+            self.enter(node)
+            return node.value
+        self.expression(node)
+        return None
+
+    def compile_BinaryOperation(self, node):
+        self.expression(node.left)
+        index = binary_operators.index(node.operator)
+        number = self.operand(node.right)
+        if number is None:
+            self.emit(BINARY_OP, index)
+        else:
+            self.emit(BINARY_OP_CONST, self.const((index, number)))
+
+    def compile_ComparisonOperation(self, node):
+        self.expression(node.left)
+        self.expression(node.right)
+        self.emit(COMPARE_OP, comparison_operators.index(node.operator))
+
+    def compile_LogicalOperation(self, node):
+        self.expression(node.left)
+        self.expression(node.right)
+        self.emit(LOGICAL_OP, logical_operators.index(node.operator))
+
+    def compile_NotOperation(self, node):
+        self.expression(node.operand)
+        self.emit(NOT)
+
+    def compile_UnaryOperation(self, node):
+        self.expression(node.operand)
+        self.emit(NEGATE)
+
+    def compile_Cast(self, node):
+        self.expression(node.expression)
+        self.emit(CAST, self.const(node.to_type))
+
+    def compile_FunctionCall(self, node):
+        if isinstance(node.name, DotAccess):
+            name = f"{node.name.container}.{node.name.attribute}"
+        else:
+            name = node.name
+        call = self.const((node.name, len(node.arguments)))
+        self.emit(LOOKUP_FUNCTION, self.const(name))
+        for argument in node.arguments:
+            self.expression(argument)
+        self.emit(CALL, call)
+
+    def compile_Return(self, node):
+        self.expression(node.value)
+        self.emit(RETURN_VALUE if self.code.is_function else RAISE_RETURN)
+
+    def compile_FunctionDeclaration(self, node):
+        self.emit(DEFINE_FUNCTION, self.const(node))
+
+    def compile_ModuleDeclaration(self, node):
+        self.emit(DEFINE_MODULE, self.const(node))
+
+    def compile_ImportStatement(self, node):
+        self.emit(IMPORT, self.const(node))
+
+    def jump_unless(self, condition, expected=True):
+        # Emits the jump taken when the condition is not `expected`, a
+        # comparison is fused with its jump
+        if isinstance(condition, ComparisonOperation):
+            self.enter(condition)
+            self.expression(condition.left)
+            number = self.operand(condition.right)
+            opcode = COMPARE_JUMP_IF_FALSE if expected else COMPARE_JUMP_IF_TRUE
+            return self.emit(opcode, self.const([comparison_operators.index(condition.operator), None, number]))
+        self.expression(condition)
+        return self.emit(POP_JUMP_IF_FALSE if expected else POP_JUMP_IF_TRUE)
+
+    def compile_IfStatement(self, node):
+        jump_false = self.jump_unless(node.condition)
+        self.block(node.true_block)
+        self.code.patch(jump_false, self.code.here())
+        self.emit(LOAD_CONST, self.const(Muni_Void()))
+
+    def compile_IfElseStatement(self, node):
+        jump_false = self.jump_unless(node.condition)
+        self.block(node.true_block)
+        jump_end = self.emit(JUMP)
+        self.code.patch(jump_false, self.code.here())
+        self.block(node.false_block)
+        self.code.patch(jump_end, self.code.here())
+        self.emit(LOAD_CONST, self.const(Muni_Void()))
+
+    def repeat(self, node):
+        nb_iterations = int(node.nb_iterations)
+        if nb_iterations <= 0:
+            return
+        self.emit(LOAD_CONST, self.const(nb_iterations))
+        start = self.code.here()
+        repeat = self.emit(REPEAT)
+        self.block(node.body)
+        self.emit(JUMP_BACK, start)
+        self.code.patch(repeat, self.code.here())
+
+    def compile_WhileStatement(self, node):
+        self.repeat(node)
+        start = self.code.here()
+        jump_false = self.jump_unless(node.condition)
+        self.block(node.body)
+        self.emit(JUMP_BACK, start)
+        self.code.patch(jump_false, self.code.here())
+        self.emit(LOAD_CONST, self.const(Muni_Void()))
+
+    def compile_UntilStatement(self, node):
+        self.repeat(node)
+        start = self.code.here()
+        jump_true = self.jump_unless(node.condition, expected=False)
+        self.block(node.body)
+        self.emit(JUMP_BACK, start)
+        self.code.patch(jump_true, self.code.here())
+        self.emit(LOAD_CONST, self.const(Muni_Void()))
+
+    def compile_ForInStatement(self, node):
+        self.expression(node.iterable)
+        self.emit(GET_ITER)
+        start = self.code.here()
+        for_iter = self.emit(FOR_ITER)
+        self.emit(BIND_LOOP_VAR, self.const((node.identifier, node.type_specifier)))
+        self.block(node.body)
+        self.emit(JUMP_BACK, start)
+        self.code.patch(for_iter, self.code.here())
+        self.emit(LOAD_CONST, self.const(Muni_Void()))
+
+    def compile_ParallelForInStatement(self, node):
+        self.expression(node.iterable)
+        self.emit(PARALLEL_FOR, self.const(node))
+
+    def compile_ForStatement(self, node):
+        self.statement(node.begin_statement)
+        start = self.code.here()
+        jump_false = self.jump_unless(node.condition)
+        self.block(node.body)
+        self.statement(node.end_statement)
+        self.emit(JUMP_BACK, start)
+        self.code.patch(jump_false, self.code.here())
+        self.emit(LOAD_CONST, self.const(Muni_Void()))
+
+    def compile_SwitchStatement(self, node):
+        self.expression(node.expression)
+        ends = []
+        default_case = None
+        for case in node.cases:
+            if not isinstance(case, CaseClause):
+                default_case = case
+                continue
+            self.expression(case.value)
+            self.emit(CASE_MATCH)
+            jump_next = self.emit(POP_JUMP_IF_FALSE)
+            self.emit(POP_TOP)
+            self.block(case.statements)
+            ends.append(self.emit(JUMP))
+            self.code.patch(jump_next, self.code.here())
+        self.emit(POP_TOP)
+        if default_case:
+            self.block(default_case.statements)
+        for end in ends:
+            self.code.patch(end, self.code.here())
+        self.emit(LOAD_CONST, self.const(Muni_Void()))
+
+    def compile_SignalDeclaration(self, node):
+        self.emit(DEFINE_SIGNAL, self.code.add_name(node.signal_name))
+
+    def compile_EmitStatement(self, node):
+        self.emit(EMIT, self.code.add_name(node.signal_name))
+
+    def compile_WhenStatement(self, node):
+        self.emit(WHEN, self.const((node.signal_name, node.statements)))
+
+    def compile_WatchStatement(self, node):
+        self.emit(WATCH, self.const((node.variable_name, node.statements)))
+
+    def compile_ListInitialization(self, node):
+        for element in node.elements:
+            self.expression(element)
+        self.emit(BUILD_LIST, len(node.elements))
+
+    def compile_DictInitialization(self, node):
+        for key, value in node.elements.items():
+            self.expression(key)
+            self.expression(value)
+        self.emit(BUILD_DICT, len(node.elements))
+
+    def compile_ElementAccess(self, node):
+        self.expression(node.expression)
+        self.expression(node.index)
+        self.emit(SUBSCR)
+
+    def compile_ElementAssignment(self, node):
+        self.expression(node.name)
+        self.expression(node.index)
+        self.expression(node.value)
+        self.emit(STORE_SUBSCR, self.const(node.name))
+
+    def compile_Range(self, node):
+        self.expression(node.start)
+        self.expression(node.end)
+        self.expression(node.step)
+        self.emit(BUILD_RANGE, int(node.inclusive))
+
+    def compile_ThrowStatement(self, node):
+        self.expression(node.expression)
+        self.emit(THROW)
+
+    def compile_ArgumentGet(self, node):
+        self.emit(LOAD_ARG, int(node.index))
+
+
+def format_argument(code, opcode, arg):
+    if opcode in (LOAD_NAME, DEFINE_SIGNAL, EMIT):
+        return f"({code.names[arg]})"
+    if opcode == BINARY_OP:
+        return f"({binary_operators[arg]})"
+    if opcode == COMPARE_OP:
+        return f"({comparison_operators[arg]})"
+    if opcode == LOGICAL_OP:
+        return f"({logical_operators[arg]})"
+    if opcode in compare_jump_opcodes:
+        index, target, number = code.consts[arg]
+        operand = "" if number is None else f" {number}"
+        return f"({comparison_operators[index]}{operand} to {target})"
+    if opcode in jump_opcodes:
+        return f"(to {arg})"
+    if opcode in (WHEN, WATCH):
+        return f"({code.consts[arg][0]})"
+    if opcode in (DEFINE_FUNCTION, DEFINE_MODULE):
+        return f"({code.consts[arg].name})"
+    if opcode == IMPORT:
+        return f"({code.consts[arg].module_path})"
+    if opcode == CALL:
+        return f"({code.consts[arg][1]} arguments)"
+    if opcode in (LOAD_SLOT, ASSIGN):
+        name, address = code.consts[arg]
+        return f"({name})" if address is None else f"({name} @ {address[0]}:{address[1]})"
+    if opcode == BINARY_OP_CONST:
+        index, number = code.consts[arg]
+        return f"({binary_operators[index]} {number})"
+    if opcode == ASSIGN_BINARY:
+        name, _, index, number = code.consts[arg]
+        operand = "right" if number is None else number
+        return f"({name} = left {binary_operators[index]} {operand})"
+    if opcode == AUG_ASSIGN_CONST:
+        name, operator, _, _, number = code.consts[arg]
+        return f"({name} {operator} {number})"
+    if opcode in (DECLARE_SCALAR, AUG_ASSIGN_SCALAR):
+        return f"({code.consts[arg][:3]})"
+    if opcode in (PARALLEL_FOR, LOAD_CONST, LOAD_COPY, EVAL_CONST, DECLARE, AUG_ASSIGN, CAST, LOOKUP_FUNCTION, BIND_LOOP_VAR, STORE_SUBSCR, LOAD_DOT):
+        return f"({code.consts[arg]})"
+    return ""
+
+
+def disassemble(code, file=None):
+    """Print a listing of a Code object, one instruction per line."""
+    print(f"Disassembly of {code.name}:", file=file)
+    targets = {jump_target(code, offset) for offset in range(0, len(code.ops), 2) if code.ops[offset] in jump_opcodes}
+    last_line = None
+    for offset in range(0, len(code.ops), 2):
+        opcode, arg = code.ops[offset], code.ops[offset + 1]
+        line = code.line_at(offset)
+        line_column = f"{str(line):>4}" if line != last_line else "    "
+        last_line = line
+        marker = ">>" if offset in targets else "  "
+        print(f"{line_column} {marker} {offset:>5} {opnames[opcode]:<21} {arg:>4} {format_argument(code, opcode, arg)}".rstrip(), file=file)
+    print(file=file)
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import pickle
+import sys
+
+CACHE_DIRECTORY = '__municache__'
+
+# The modules that decide what a parsed program looks like, a change in any
+# of them makes every cached tree stale
+SOURCE_MODULES = ['muni_lexer.py', 'muni_scanner.py', 'muni_parser.py', 'muni_pratt.py', 'muni_ast_nodes.py', 'muni_resolver.py', 'muni_types.py', 'muni_cache.py']
+
+enabled = True
+last_hit = False
+_version = None
+
+
+def set_enabled(flag):
+    global enabled
+    enabled = flag
+
+
+def interpreter_version():
+    global _version
+    if _version is None:
+        digest = hashlib.sha256(sys.version.encode())
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for module in SOURCE_MODULES:
+            with open(os.path.join(directory, module), 'rb') as file:
+                digest.update(file.read())
+        _version = digest.hexdigest()
+    return _version
+
+
+def source_key(content, variant=''):
+    return hashlib.sha256((interpreter_version() + variant + content).encode()).hexdigest()
+
+
+def cache_path(source_path, variant=''):
+    # Each parser has its own file, they would otherwise replace each other's tree
+    directory, name = os.path.split(os.path.abspath(source_path))
+    if variant:
+        name = f"{name}.{variant}"
+    return os.path.join(directory, CACHE_DIRECTORY, name + '.pickle')
+
+
+def load(source_path, content, variant=''):
+    """Return the cached tree of a source file, or None if it is missing or stale."""
+    try:
+        with open(cache_path(source_path, variant), 'rb') as file:
+            key, ast = pickle.load(file)
+    except Exception:
+        return None
+    return ast if key == source_key(content, variant) else None
+
+
+def store(source_path, content, ast, variant=''):
+    # Like __pycache__, a cache that cannot be written is simply skipped
+    path = cache_path(source_path, variant)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary_path, 'wb') as file:
+            pickle.dump((source_key(content, variant), ast), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+    except Exception:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def cached_parse(source_path, content, parse, is_clean=lambda: True, variant=''):
+    """Parse a source file through the cache.
+
+    Trees are only stored when is_clean() says the parse reported no
+    syntax error, so a broken file keeps reporting its errors. The variant
+    names the parser, a tree cached by one is not reused by the other.
+    """
+    global last_hit
+    last_hit = False
+    if not enabled:
+        return parse(content)
+    ast = load(source_path, content, variant)
+    last_hit = ast is not None
+    if ast is None:
+        ast = parse(content)
+        if ast is not None and is_clean():
+            store(source_path, content, ast, variant)
+    return ast
+
+
+def clear_cache(directory='.'):
+    """Remove the cache directory of a folder, return whether there was one."""
+    import shutil
+    path = os.path.join(directory, CACHE_DIRECTORY)
+    if not os.path.isdir(path):
+        return False
+    shutil.rmtree(path)
+    return True
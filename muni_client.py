@@ -0,0 +1,55 @@
+"""Runs a Muni script on the server started by `run.py --serve`.
+
+    MUNI_SOCKET=/path/sock python muni_client.py script.mun arg1 arg2
+
+The client only imports what it needs to talk to the server, the parser
+and the runtime are already loaded there. Without MUNI_SOCKET, when no
+server listens on it, or when the first argument is an option, it runs
+run.py with the same arguments instead.
+"""
+import json
+import os
+import socket
+import sys
+
+RUNNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run.py')
+
+
+def connect(path):
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def run_on_server(connection, file, args):
+    with connection:
+        # The script runs on this process's stdin, stdout and stderr
+        socket.send_fds(connection, [b'\0'], [0, 1, 2])
+        request = {"file": os.path.abspath(file), "args": args, "cwd": os.getcwd()}
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        reply = connection.makefile('rb').readline()
+    if not reply:
+        print("muni: the server stopped before the script ended", file=sys.stderr)
+        return 1
+    return json.loads(reply)["status"]
+
+
+def main(argv):
+    path = os.environ.get('MUNI_SOCKET')
+    # Options are run.py's, the server runs scripts with its own
+    if path and argv and not argv[0].startswith('-'):
+        connection = connect(path)
+        if connection is not None:
+            try:
+                return run_on_server(connection, argv[0], argv[1:])
+            except KeyboardInterrupt:
+                return 130
+    os.execv(sys.executable, [sys.executable, RUNNER] + argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,824 @@
+import operator as py_operator
+from muni_types import *
+from muni_ast_nodes import *
+from muni_error import *
+from muni_runtime import Runtime, ReturnException, Function, Frame, UNBOUND
+
+
+binary_operators = {
+    '+': py_operator.add,
+    '-': py_operator.sub,
+    '*': py_operator.mul,
+    '%': py_operator.mod,
+}
+
+# Operators applied straight to the python values of two ints or two floats,
+# which gives what the Muni_Int and Muni_Float methods would give
+scalar_operators = {
+    '+': py_operator.add,
+    '-': py_operator.sub,
+    '*': py_operator.mul,
+}
+
+scalar_types = (Muni_Int, Muni_Float)
+
+declared_types = {
+    'int': Muni_Int,
+    'float': Muni_Float,
+}
+
+comparison_operators = {
+    '>': py_operator.gt,
+    '<': py_operator.lt,
+    '==': py_operator.eq,
+    '>=': py_operator.ge,
+    '<=': py_operator.le,
+    '!=': py_operator.ne,
+}
+
+
+class Compiler:
+    """Compiles AST nodes into nested Python closures.
+
+    Every node is turned into a zero-argument callable with its children
+    already compiled, so executing a program no longer goes through the
+    isinstance ladder in Runtime.evaluate. Each closure records its line
+    number exactly like Runtime.evaluate does and defers to the Runtime
+    helpers for anything that touches scopes, signals or casts.
+    """
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+        self.set_lineno = runtime.set_lineno
+        self.cache = {}
+        self.bodies = {}
+        self.dispatch = {
+            Number: self.compile_literal,
+            Boolean: self.compile_literal,
+            String: self.compile_literal,
+            Constant: self.compile_constant,
+            Variable: self.compile_variable,
+            DotAccess: self.compile_dot_access,
+            Declaration: self.compile_declaration,
+            Assignment: self.compile_assignment,
+            ExpressionAssignment: self.compile_expression_assignment,
+            BinaryOperation: self.compile_binary_operation,
+            LogicalOperation: self.compile_logical_operation,
+            ComparisonOperation: self.compile_comparison_operation,
+            NotOperation: self.compile_not_operation,
+            UnaryOperation: self.compile_unary_operation,
+            FunctionCall: self.compile_function_call,
+            Return: self.compile_return,
+            FunctionDeclaration: self.compile_function_declaration,
+            ModuleDeclaration: self.compile_module_declaration,
+            ImportStatement: self.compile_import,
+            Cast: self.compile_cast,
+            IfStatement: self.compile_if,
+            IfElseStatement: self.compile_if_else,
+            WhileStatement: self.compile_while,
+            UntilStatement: self.compile_until,
+            ParallelForInStatement: self.compile_parallel_for_in,
+            ForInStatement: self.compile_for_in,
+            ForStatement: self.compile_for,
+            SwitchStatement: self.compile_switch,
+            SignalDeclaration: self.compile_signal_declaration,
+            EmitStatement: self.compile_emit,
+            WhenStatement: self.compile_when,
+            WatchStatement: self.compile_watch,
+            ListInitialization: self.compile_list,
+            DictInitialization: self.compile_dict,
+            ElementAccess: self.compile_element_access,
+            ElementAssignment: self.compile_element_assignment,
+            Range: self.compile_range,
+            ThrowStatement: self.compile_throw,
+            ArgumentGet: self.compile_argument_get,
+        }
+
+    def compile(self, node):
+        if not isinstance(node, AstNode):
+            return self.compile_value(node)
+        entry = self.cache.get(id(node))
+        if entry is not None:
+            return entry[1]
+        method = self.dispatch.get(type(node))
+        if method is None:
+            raise Muni_Error(f"Unknown node type: {type(node)}")
+        closure = method(node)
+        if self.runtime.profiler is not None:
+            closure = self.runtime.profiler.wrap(node, closure)
+        # The node is kept alive next to its closure so its id cannot be reused
+        self.cache[id(node)] = (node, closure)
+        return closure
+
+    def release(self, node):
+        if isinstance(node, AstNode):
+            self.cache.pop(id(node), None)
+            for child in vars(node).values():
+                self.release(child)
+        elif isinstance(node, (list, tuple)):
+            for item in node:
+                self.release(item)
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                self.release(key)
+                self.release(value)
+
+    def compile_block(self, statements):
+        if not isinstance(statements, (list, tuple)):
+            statements = [statements]
+        closures = tuple(self.compile(statement) for statement in statements)
+
+        def block():
+            for closure in closures:
+                closure()
+        return block
+
+    def compile_body(self, function):
+        # Redefining a function builds a new Function around the same declaration
+        entry = self.bodies.get(id(function.declaration))
+        if entry is not None:
+            return entry[1]
+        body = tuple(self.compile(statement) for statement in function.body)
+        self.bodies[id(function.declaration)] = (function.declaration, body)
+        return body
+
+    def compile_value(self, value):
+        if isinstance(value, Muni_Type):
+            return lambda: value
+        # Python literals and None keep the runtime's conversion rules
+        evaluate = Runtime.evaluate
+        runtime = self.runtime
+        return lambda: evaluate(runtime, value)
+
+    def compile_literal(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        value = node.value
+
+        def literal():
+            set_lineno(lineno)
+            return value
+        return literal
+
+    def compile_constant(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        copy = node.value.copy
+
+        def constant():
+            set_lineno(lineno)
+            return copy()
+        return constant
+
+    def compile_variable(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        get_variable = self.runtime.get_variable
+        scopes = self.runtime.scopes
+        name = node.name
+        address = node.address
+
+        def variable():
+            set_lineno(lineno)
+            # Locals and parameters are in the innermost scope, the only one
+            # their address can point to
+            value = scopes[-1].get(name, UNBOUND)
+            if value is not UNBOUND:
+                return value
+            return get_variable(name, address)
+        return variable
+
+    def compile_dot_access(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        runtime = self.runtime
+
+        def dot_access():
+            set_lineno(lineno)
+            return runtime.evaluate(runtime.modules[node.container.name][node.attribute])
+        return dot_access
+
+    def compile_declaration(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        define_variable = self.runtime.define_variable
+        scopes = self.runtime.scopes
+        value = self.compile(node.value)
+        name = node.name
+        type_specifier = node.type_specifier
+        address = node.address
+        declared_type = declared_types.get(type_specifier)
+        if declared_type is None:
+            def declaration():
+                set_lineno(lineno)
+                define_variable(name, value(), type_specifier, address=address)
+            return declaration
+
+        def declaration():
+            set_lineno(lineno)
+            new = value()
+            # Declaring an existing variable of the same type only updates it
+            variable = scopes[-1].get(name)
+            if type(variable) is declared_type and type(new) is declared_type:
+                variable.value = new.value
+                return
+            define_variable(name, new, type_specifier, address=address)
+        return declaration
+
+    def compile_assignment(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        assign_variable = self.runtime.assign_variable
+        scopes = self.runtime.scopes
+        watched = self.runtime.watched
+        value = self.compile(node.value)
+        name = node.name
+        address = node.address
+
+        def assignment():
+            set_lineno(lineno)
+            new = value()
+            # An int or a float stored over one of its own type is updated in
+            # place, casts and watched variables go through the runtime
+            if not watched:
+                variable = scopes[-1].get(name)
+                kind = type(variable)
+                if kind is type(new) and kind in scalar_types:
+                    variable.value = new.value
+                    return
+            assign_variable(name, new, address)
+        return assignment
+
+    def compile_expression_assignment(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        update_variable = self.runtime.update_variable
+        scopes = self.runtime.scopes
+        watched = self.runtime.watched
+        value = self.compile(node.value)
+        name = node.name
+        operator = node.operator
+        address = node.address
+        apply = scalar_operators.get(operator[:-1])
+        if apply is None:
+            def expression_assignment():
+                set_lineno(lineno)
+                update_variable(name, operator, value(), address)
+            return expression_assignment
+
+        def expression_assignment():
+            set_lineno(lineno)
+            operand = value()
+            if not watched:
+                variable = scopes[-1].get(name)
+                kind = type(variable)
+                if kind is type(operand) and kind in scalar_types:
+                    variable.value = apply(variable.value, operand.value)
+                    return
+            update_variable(name, operator, operand, address)
+        return expression_assignment
+
+    def compile_binary_operation(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        operator = node.operator
+        apply = None if self.runtime.vectorize else binary_operators.get(operator)
+        if apply is None:
+            # Division keeps its zero check, unknown operators keep their error
+            apply_binary_operator = self.runtime.apply_binary_operator
+
+            def binary_operation():
+                set_lineno(lineno)
+                left_val = left()
+                return apply_binary_operator(left_val, right(), operator)
+            return binary_operation
+
+        scalar_apply = scalar_operators.get(operator)
+        if scalar_apply is None:
+            def binary_operation():
+                set_lineno(lineno)
+                left_val = left()
+                return apply(left_val, right())
+            return binary_operation
+
+        def binary_operation():
+            set_lineno(lineno)
+            left_val = left()
+            right_val = right()
+            kind = type(left_val)
+            if kind is type(right_val) and kind in scalar_types:
+                return kind(scalar_apply(left_val.value, right_val.value))
+            return apply(left_val, right_val)
+        return binary_operation
+
+    def compile_logical_operation(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        apply_logical_operator = self.runtime.apply_logical_operator
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        operator = node.operator
+
+        def logical_operation():
+            set_lineno(lineno)
+            left_val = left()
+            return apply_logical_operator(left_val, right(), operator)
+        return logical_operation
+
+    def compile_comparison_operation(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        operator = node.operator
+        apply = None if self.runtime.vectorize else comparison_operators.get(operator)
+        if apply is None:
+            apply_comparison_operator = self.runtime.apply_comparison_operator
+
+            def comparison_operation():
+                set_lineno(lineno)
+                left_val = left()
+                return apply_comparison_operator(left_val, right(), operator)
+            return comparison_operation
+
+        def comparison_operation():
+            set_lineno(lineno)
+            left_val = left()
+            right_val = right()
+            kind = type(left_val)
+            if kind is type(right_val) and kind in scalar_types:
+                return Muni_Boolean(apply(left_val.value, right_val.value))
+            return apply(left_val, right_val)
+        return comparison_operation
+
+    def compile_condition(self, node):
+        # Loops and ifs only need the truth of their condition, a comparison
+        # of two ints or two floats gives it without building a Muni_Boolean
+        if (type(node) is not ComparisonOperation or self.runtime.vectorize
+                or self.runtime.profiler is not None or node.operator not in comparison_operators):
+            return self.compile(node)
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        apply = comparison_operators[node.operator]
+
+        def condition():
+            set_lineno(lineno)
+            left_val = left()
+            right_val = right()
+            kind = type(left_val)
+            if kind is type(right_val) and kind in scalar_types:
+                return apply(left_val.value, right_val.value)
+            return apply(left_val, right_val)
+        return condition
+
+    def compile_not_operation(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        operand = self.compile(node.operand)
+
+        def not_operation():
+            set_lineno(lineno)
+            return Muni_Boolean(not operand())
+        return not_operation
+
+    def compile_unary_operation(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        operand = self.compile(node.operand)
+
+        def unary_operation():
+            set_lineno(lineno)
+            return -operand()
+        return unary_operation
+
+    def compile_function_call(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        runtime = self.runtime
+        arguments = tuple(self.compile(argument) for argument in node.arguments)
+        if isinstance(node.name, DotAccess):
+            name = f"{node.name.container}.{node.name.attribute}"
+        else:
+            name = node.name
+
+        def function_call():
+            set_lineno(lineno)
+            function = runtime.get_function(name)
+            if function is None:
+                raise Muni_Error(f"Function Error: {node.name} not a function.")
+            if callable(function):
+                if node.name in runtime.imported_functions:
+                    values = [to_standard_type(argument()) for argument in arguments]
+                else:
+                    values = [argument() for argument in arguments]
+                if runtime.is_running == False: return
+                return function(*values)
+            return runtime.call_compiled(function, arguments)
+        return function_call
+
+    def compile_return(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        value = self.compile(node.value)
+
+        def return_statement():
+            set_lineno(lineno)
+            raise ReturnException(value())
+        return return_statement
+
+    def compile_function_declaration(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        define_function = self.runtime.define_function
+        function = Function(node)
+        self.compile_body(function)
+
+        def function_declaration():
+            set_lineno(lineno)
+            define_function(function)
+            return Muni_Void()
+        return function_declaration
+
+    def compile_module_declaration(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        define_module = self.runtime.define_module
+        for statement in node.body:
+            self.compile(statement)
+
+        def module_declaration():
+            set_lineno(lineno)
+            define_module(node)
+            return Muni_Void()
+        return module_declaration
+
+    def compile_import(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        handle_import = self.runtime.handle_import
+
+        def import_statement():
+            set_lineno(lineno)
+            return handle_import(node)
+        return import_statement
+
+    def compile_cast(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        perform_cast = self.runtime.perform_cast
+        expression = self.compile(node.expression)
+        to_type = node.to_type
+
+        def cast():
+            set_lineno(lineno)
+            return perform_cast(to_type, expression())
+        return cast
+
+    def compile_if(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        condition = self.compile_condition(node.condition)
+        true_block = self.compile_block(node.true_block)
+
+        def if_statement():
+            set_lineno(lineno)
+            if condition():
+                true_block()
+            return Muni_Void()
+        return if_statement
+
+    def compile_if_else(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        condition = self.compile_condition(node.condition)
+        true_block = self.compile_block(node.true_block)
+        false_block = self.compile_block(node.false_block)
+
+        def if_else_statement():
+            set_lineno(lineno)
+            if condition():
+                true_block()
+            else:
+                false_block()
+            return Muni_Void()
+        return if_else_statement
+
+    def flush_after(self, step):
+        # With coalesced watches, each loop iteration ends running the
+        # watchers of what it changed. Loops pay nothing for it otherwise.
+        if not self.runtime.coalesce_watches:
+            return step
+        flush_watches = self.runtime.flush_watches
+
+        def flushed():
+            step()
+            flush_watches()
+        return flushed
+
+    def compile_while(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        runtime = self.runtime
+        condition = self.compile_condition(node.condition)
+        body = self.flush_after(self.compile_block(node.body))
+        nb_iterations = node.nb_iterations
+
+        def while_statement():
+            set_lineno(lineno)
+            for i in range(int(nb_iterations)):
+                body()
+            while runtime.is_running and condition():
+                body()
+            return Muni_Void()
+        return while_statement
+
+    def compile_until(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        runtime = self.runtime
+        condition = self.compile_condition(node.condition)
+        body = self.flush_after(self.compile_block(node.body))
+        nb_iterations = node.nb_iterations
+
+        def until_statement():
+            set_lineno(lineno)
+            for i in range(int(nb_iterations)):
+                body()
+            while runtime.is_running and not condition():
+                body()
+            return Muni_Void()
+        return until_statement
+
+    def compile_for_in(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        runtime = self.runtime
+        bind_loop_variable = runtime.bind_loop_variable
+        iterable = self.compile(node.iterable)
+        body = self.flush_after(self.compile_block(node.body))
+        identifier = node.identifier
+        type_specifier = node.type_specifier
+
+        def for_in_statement():
+            set_lineno(lineno)
+            for value in iterable():
+                if not runtime.is_running:
+                    break
+                bind_loop_variable(identifier, value, type_specifier)
+                body()
+            return Muni_Void()
+        return for_in_statement
+
+    def compile_parallel_for_in(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        run_parallel_for = self.runtime.run_parallel_for
+        iterable = self.compile(node.iterable)
+
+        def parallel_for_in_statement():
+            set_lineno(lineno)
+            return run_parallel_for(node, iterable())
+        return parallel_for_in_statement
+
+    def compile_for(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        runtime = self.runtime
+        begin_statement = self.compile(node.begin_statement)
+        condition = self.compile_condition(node.condition)
+        end_statement = self.flush_after(self.compile(node.end_statement))
+        body = self.compile_block(node.body)
+
+        def for_statement():
+            set_lineno(lineno)
+            begin_statement()
+            while runtime.is_running and condition():
+                body()
+                end_statement()
+            return Muni_Void()
+        return for_statement
+
+    def compile_switch(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        expression = self.compile(node.expression)
+        cases = []
+        default_case = None
+        for case in node.cases:
+            if not isinstance(case, CaseClause):
+                default_case = self.compile_block(case.statements)
+                continue
+            cases.append((self.compile(case.value), self.compile_block(case.statements)))
+
+        def switch_statement():
+            set_lineno(lineno)
+            switch_value = expression()
+            for value, statements in cases:
+                if value() == switch_value:
+                    statements()
+                    return Muni_Void()
+            if default_case:
+                default_case()
+            return Muni_Void()
+        return switch_statement
+
+    def compile_signal_declaration(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        define_signal = self.runtime.define_signal
+        signal_name = node.signal_name
+
+        def signal_declaration():
+            set_lineno(lineno)
+            define_signal(signal_name)
+            return Muni_Void()
+        return signal_declaration
+
+    def compile_emit(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        emit_signal = self.runtime.emit_signal
+        signal_name = node.signal_name
+
+        def emit_statement():
+            set_lineno(lineno)
+            emit_signal(signal_name)
+            return Muni_Void()
+        return emit_statement
+
+    def compile_when(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        assign_signal = self.runtime.assign_signal
+        for statement in node.statements:
+            self.compile(statement)
+
+        def when_statement():
+            set_lineno(lineno)
+            assign_signal(node.signal_name, node.statements)
+            return Muni_Void()
+        return when_statement
+
+    def compile_watch(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        assign_watching = self.runtime.assign_watching
+        for statement in node.statements:
+            self.compile(statement)
+
+        def watch_statement():
+            set_lineno(lineno)
+            assign_watching(node.variable_name, node.statements)
+            return Muni_Void()
+        return watch_statement
+
+    def compile_list(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        elements = tuple(self.compile(element) for element in node.elements)
+
+        def list_initialization():
+            set_lineno(lineno)
+            return Muni_List([copy_value(element()) for element in elements])
+        return list_initialization
+
+    def compile_dict(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        elements = tuple((self.compile(key), self.compile(value)) for key, value in node.elements.items())
+
+        def dict_initialization():
+            set_lineno(lineno)
+            return Muni_Dict({copy_value(key()): copy_value(value()) for key, value in elements})
+        return dict_initialization
+
+    def compile_element_access(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        expression = self.compile(node.expression)
+        index = self.compile(node.index)
+
+        def element_access():
+            set_lineno(lineno)
+            obj = expression()
+            return obj.get_item(index())
+        return element_access
+
+    def compile_element_assignment(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        assign_element = self.runtime.assign_element
+        target = self.compile(node.name)
+        index = self.compile(node.index)
+        value = self.compile(node.value)
+
+        def element_assignment():
+            set_lineno(lineno)
+            obj = target()
+            key = index()
+            assign_element(node.name, obj, key, value())
+            return Muni_Void()
+        return element_assignment
+
+    def compile_range(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        make_range = self.runtime.make_range
+        start = self.compile(node.start)
+        end = self.compile(node.end)
+        step = self.compile(node.step)
+        inclusive = node.inclusive
+
+        def range_expression():
+            set_lineno(lineno)
+            start_val = start()
+            end_val = end()
+            return make_range(start_val, end_val, step(), inclusive)
+        return range_expression
+
+    def compile_throw(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        expression = self.compile(node.expression)
+
+        def throw_statement():
+            set_lineno(lineno)
+            raise Muni_Error(expression())
+        return throw_statement
+
+    def compile_argument_get(self, node):
+        set_lineno = self.set_lineno
+        lineno = node.lineno
+        get_argument = self.runtime.get_argument
+        index = int(node.index)
+
+        def argument_get():
+            set_lineno(lineno)
+            return get_argument(index)
+        return argument_get
+
+
+class ClosureRuntime(Runtime):
+    """Runtime that executes programs through closures built by the Compiler."""
+
+    def __init__(self, module_registry=None):
+        super().__init__(module_registry)
+        self.compiler = Compiler(self)
+
+    def set_vectorize(self, vectorize):
+        super().set_vectorize(vectorize)
+        # Closures bake in their operators, drop the ones compiled for the other mode
+        self.compiler = Compiler(self)
+
+    def set_profiler(self, profiler):
+        # The closures compiled from now on are measured
+        self.profiler = profiler
+        self.compiler = Compiler(self)
+
+    def execute(self, ast):
+        statements = ast.statements if isinstance(ast, StatementList) else [ast]
+        for statement in statements:
+            self.compiler.compile(statement)
+        for statement in statements:
+            self.context.set_runtime(self)
+            result = self.evaluate(statement)
+            self.flush_watches()
+            yield result
+
+    def release(self, statement):
+        self.compiler.release(statement)
+
+    def evaluate(self, node, debug=False):
+        if not isinstance(node, AstNode):
+            return super().evaluate(node, debug)
+        if debug: print(node)
+        if not self.is_running:
+            return
+        try:
+            return self.compiler.compile(node)()
+        except Muni_Error as error:
+            print(error)
+            self.error = error
+            self.is_running = False
+
+    def call_compiled(self, function, arguments):
+        values = [arg() for arg in arguments]
+        stable_function = self.functions[function.name]
+        body = self.compiler.compile_body(function)
+        self.push_scope(Frame(function))
+
+        try:
+            self.bind_parameters(function, values)
+            result = None
+            for stmt in body:
+                stmt()
+        except ReturnException as e:
+            result = e.value
+        finally:
+            self.pop_scope()
+            self.functions[function.name] = stable_function
+        return self.function_result(result)
@@ -1,21 +1,28 @@
+import contextvars
+
+# The runtime executing in this thread or asyncio task. Each thread starts
+# without one, runtimes set it when they run statements or handlers.
+current_runtime = contextvars.ContextVar("current_runtime", default=None)
+
+
 class ContextManager:
-    _instance = None
+    """The line number and runtime of the code executing in this thread.
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ContextManager, cls).__new__(cls)
-            cls._instance.context = {'lineno': None, 'runtime': None}
-        return cls._instance
+    The line number is kept by the current runtime itself, so runtimes
+    running in parallel threads do not overwrite each other's locations.
+    """
 
     def set_lineno(self, lineno):
-        self.context['lineno'] = lineno
+        runtime = current_runtime.get()
+        if runtime is not None:
+            runtime.lineno = lineno
 
     def get_lineno(self):
-        return self.context['lineno']
-    
+        runtime = current_runtime.get()
+        return None if runtime is None else runtime.lineno
+
     def set_runtime(self, runtime):
-        self.context['runtime'] = runtime
+        current_runtime.set(runtime)
 
     def get_runtime(self):
-        return self.context['runtime']
-    
+        return current_runtime.get()
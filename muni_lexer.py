@@ -112,32 +112,45 @@ t_DOT = '.'
 
 
 
+# Values of the literal tokens, shared with the scanner
+def boolean_value(text):
+    return Muni_Boolean(text == 'true')
+
+def imaginary_value(text):
+    # Extract the numerical part and create an imaginary number representation
+    num_part = text.rstrip('jJ')  # Remove the 'j'
+    if num_part == '' or num_part == '+':
+        num_part = '1'
+    elif num_part == '-':
+        num_part = '-1'
+    return Muni_Complex(0, float(num_part))
+
+def number_value(text):
+    if '.' in text or 'e' in text or 'E' in text:
+        return Muni_Float(float(text))
+    return Muni_Int(int(text))
+
+def string_value(text):
+    return Muni_String(text[1:-1])  # Remove the quotes
+
+
 # Boolean values
 def t_BOOLEAN(t):
     r'true|false'
-    t.value = Muni_Boolean(t.value == 'true')
+    t.value = boolean_value(t.value)
     return t
 
 
 def t_IMAGINARY_NUMBER(t):
     r'(?<=\d|\s)[+-]?\d*(\.\d+)?[jJ](?=\W|$)'
-    # Extract the numerical part and create an imaginary number representation
-    num_part = t.value.rstrip('jJ')  # Remove the 'j'
-    if num_part == '' or num_part == '+':
-        num_part = '1'
-    elif num_part == '-':
-        num_part = '-1'
-    t.value = Muni_Complex(0, float(num_part))
+    t.value = imaginary_value(t.value)
     return t
 
 
 # Literals
 def t_NUMBER(t):
     r'-?\d+(\.\d+)?([eE][-+]?\d+)?'
-    if '.' in t.value or 'e' in t.value or 'E' in t.value:
-        t.value = Muni_Float(float(t.value))
-    else:
-        t.value = Muni_Int(int(t.value))
+    t.value = number_value(t.value)
     return t
 
 
@@ -146,8 +159,7 @@ def t_NUMBER(t):
 
 def t_STRING_LITERAL(t):
     r'"[^"]*"'
-    t.value = t.value[1:-1]  # Remove the quotes
-    t.value = Muni_String(t.value)
+    t.value = string_value(t.value)
     return t
 
 def t_IMPORT_LITERAL(t):
@@ -183,6 +195,15 @@ def t_newline(t):
 # Errors
 def t_error(t):
     print(f"Illegal character '{t.value[0]}' at line {t.lineno}, column {t.lexpos}")
+    t.lexer.error_count += 1
     t.lexer.skip(1)
 
-lexer = lex.lex()
+def build_lexer():
+    """Build the PLY lexer for these rules.
+
+    Programs are scanned by muni_scanner, which produces the same tokens;
+    this lexer is kept as the reference it is checked and benchmarked against.
+    """
+    lexer = lex.lex()
+    lexer.error_count = 0
+    return lexer
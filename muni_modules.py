@@ -0,0 +1,71 @@
+import os
+import threading
+from muni_types import copy_value
+
+
+class ModuleRegistry:
+    """Modules loaded by import statements, by absolute path and modification time.
+
+    A file is loaded once and what it defines is reused by every later
+    import, until the file changes on disk. A registry can be shared by
+    several runtimes, like the ones stdlib.muni_run_program starts.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def key(self, path):
+        path = os.path.abspath(path)
+        return (path, os.stat(path).st_mtime_ns)
+
+    def get(self, key):
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key, module):
+        with self.lock:
+            # The entries of an older version of the file are stale
+            for stale in [entry for entry in self.entries if entry[0] == key[0]]:
+                del self.entries[stale]
+            self.entries[key] = module
+
+
+class ModuleExports:
+    """What running a .mun file added to the runtime that imported it.
+
+    Functions, modules, signals with their handlers, and the variables of
+    the scope the import ran in. Variables are copied in and out, so the
+    runtimes importing a file do not share its values.
+    """
+
+    def __init__(self, functions, modules, signals, variables):
+        self.functions = functions
+        self.modules = modules
+        self.signals = signals
+        self.variables = {name: copy_value(value) for name, value in variables.items()}
+
+    @classmethod
+    def collect(cls, runtime, run):
+        """Call run() and return what it added to or changed in the runtime."""
+        functions = dict(runtime.functions)
+        modules = dict(runtime.modules)
+        signals = dict(runtime.signals)
+        scope = runtime.current_scope()
+        variables = dict(scope)
+        run()
+        return cls(
+            functions={name: value for name, value in runtime.functions.items() if functions.get(name) is not value},
+            modules={name: value for name, value in runtime.modules.items() if modules.get(name) is not value},
+            signals={name: value for name, value in runtime.signals.items() if signals.get(name) is not value},
+            variables={name: value for name, value in scope.items() if variables.get(name) is not value},
+        )
+
+    def apply(self, runtime):
+        runtime.functions.update(self.functions)
+        runtime.modules.update(self.modules)
+        for name, handlers in self.signals.items():
+            runtime.signals[name] = None if handlers is None else list(handlers)
+        scope = runtime.current_scope()
+        for name, value in self.variables.items():
+            scope[name] = copy_value(value)
@@ -0,0 +1,204 @@
+import operator as py_operator
+from muni_types import *
+from muni_ast_nodes import *
+from muni_error import *
+from muni_runtime import Runtime
+
+
+binary_operators = {
+    '+': py_operator.add,
+    '-': py_operator.sub,
+    '*': py_operator.mul,
+    '/': py_operator.truediv,
+    '%': py_operator.mod,
+}
+
+comparison_operators = {
+    '>': py_operator.gt,
+    '<': py_operator.lt,
+    '==': py_operator.eq,
+    '>=': py_operator.ge,
+    '<=': py_operator.le,
+    '!=': py_operator.ne,
+}
+
+
+def is_constant(node):
+    return isinstance(node, (Number, Boolean, String, Constant))
+
+
+def is_scalar(node):
+    return isinstance(node, (Number, Boolean, String))
+
+
+def literal(value, lineno):
+    """Wrap a folded value in the node the parser would have built for it."""
+    if isinstance(value, (Muni_Int, Muni_Float, Muni_Complex)):
+        return Number(value, lineno=lineno)
+    if isinstance(value, Muni_Boolean):
+        return Boolean(value, lineno=lineno)
+    if isinstance(value, Muni_String):
+        return String(value, lineno=lineno)
+    if isinstance(value, Muni_Type):
+        return Constant(value, lineno=lineno)
+    return None
+
+
+def line_of(node):
+    # Operator nodes built from grammar rules carry line 0, their operands know the real line
+    if node.lineno:
+        return node.lineno
+    for child in vars(node).values():
+        if isinstance(child, AstNode) and line_of(child):
+            return line_of(child)
+    return node.lineno
+
+
+def count_nodes(node):
+    if isinstance(node, (list, tuple)):
+        return sum(count_nodes(item) for item in node)
+    if isinstance(node, dict):
+        return sum(count_nodes(key) + count_nodes(value) for key, value in node.items())
+    if isinstance(node, AstNode):
+        return 1 + sum(count_nodes(child) for child in vars(node).values())
+    return 0
+
+
+class Optimizer:
+    """Simplifies a parsed program before it runs.
+
+    - Binary, comparison, logical, not, negation and cast nodes whose
+      operands are constants are replaced by their value.
+    - if / if-else statements with a constant condition are replaced by the
+      branch that runs.
+    - List and dict literals made only of constants are built once and
+      stored in a Constant node, which hands out a copy on every evaluation.
+
+    Anything that would raise while folding, like a division by zero, is
+    left in place so the error is reported when and where it happens.
+    `removed` counts the nodes taken out of the tree.
+    """
+
+    def __init__(self):
+        self.removed = 0
+
+    def optimize(self, ast):
+        before = count_nodes(ast)
+        if isinstance(ast, StatementList):
+            ast.statements = [pruned for statement in ast.statements for pruned in self.top_level(statement)]
+        else:
+            statements = self.top_level(ast)
+            ast = statements[0] if len(statements) == 1 else StatementList(statements=statements, lineno=0)
+        self.removed = before - count_nodes(ast)
+        return ast
+
+    def top_level(self, statement):
+        # Top-level statements each produce a result, a pruned if is spliced
+        # in followed by a statement producing the Void it evaluated to
+        statement = self.visit(statement)
+        branch = self.taken_branch(statement)
+        if branch is None:
+            return [statement]
+        statements = branch if isinstance(branch, list) else [branch]
+        return statements + [Constant(Muni_Void(), lineno=line_of(statement))]
+
+    def visit(self, node):
+        if isinstance(node, list):
+            return self.block(node)
+        if isinstance(node, dict):
+            return {self.visit(key): self.visit(value) for key, value in node.items()}
+        if not isinstance(node, AstNode) or isinstance(node, Constant):
+            return node
+        for name, child in vars(node).items():
+            if isinstance(child, (list, dict, AstNode)):
+                setattr(node, name, self.visit(child))
+        method = getattr(self, 'fold_' + type(node).__name__, None)
+        if method is None:
+            return node
+        return method(node)
+
+    def block(self, statements):
+        result = []
+        for statement in statements:
+            statement = self.visit(statement)
+            branch = self.taken_branch(statement)
+            if branch is None:
+                result.append(statement)
+            elif isinstance(branch, list):
+                result.extend(branch)
+            else:
+                result.append(branch)
+        return result
+
+    def taken_branch(self, statement):
+        # The statements that replace an if with a constant condition, or None to keep it
+        if isinstance(statement, IfStatement) and is_scalar(statement.condition):
+            return statement.true_block if statement.condition.value else []
+        if isinstance(statement, IfElseStatement) and is_scalar(statement.condition):
+            return statement.true_block if statement.condition.value else statement.false_block
+        return None
+
+    def fold(self, node, compute):
+        try:
+            value = compute()
+        except Exception:
+            return node
+        return literal(value, line_of(node)) or node
+
+    def fold_BinaryOperation(self, node):
+        if not (is_scalar(node.left) and is_scalar(node.right)) or node.operator not in binary_operators:
+            return node
+        left, right = node.left.value, node.right.value
+        if node.operator == '/' and right == 0:
+            return node
+        return self.fold(node, lambda: binary_operators[node.operator](left, right))
+
+    def fold_ComparisonOperation(self, node):
+        if not (is_scalar(node.left) and is_scalar(node.right)) or node.operator not in comparison_operators:
+            return node
+        left, right = node.left.value, node.right.value
+        return self.fold(node, lambda: comparison_operators[node.operator](left, right))
+
+    def fold_LogicalOperation(self, node):
+        if not (is_scalar(node.left) and is_scalar(node.right)):
+            return node
+        left, right = node.left.value, node.right.value
+        if node.operator == '&':
+            return self.fold(node, lambda: left and right)
+        if node.operator == '|':
+            return self.fold(node, lambda: left or right)
+        if node.operator == '^':
+            return self.fold(node, lambda: left ^ right)
+        return node
+
+    def fold_NotOperation(self, node):
+        if not is_scalar(node.operand):
+            return node
+        return self.fold(node, lambda: Muni_Boolean(not node.operand.value))
+
+    def fold_UnaryOperation(self, node):
+        if not is_scalar(node.operand):
+            return node
+        return self.fold(node, lambda: -node.operand.value)
+
+    def fold_Cast(self, node):
+        if not is_scalar(node.expression):
+            return node
+        return self.fold(node, lambda: Runtime.perform_cast(node.to_type, node.expression.value))
+
+    def fold_ListInitialization(self, node):
+        if not all(is_constant(element) for element in node.elements):
+            return node
+        return self.fold(node, lambda: Muni_List([copy_value(element.value) for element in node.elements]))
+
+    def fold_DictInitialization(self, node):
+        if not all(is_constant(key) and is_constant(value) for key, value in node.elements.items()):
+            return node
+        return self.fold(node, lambda: Muni_Dict({copy_value(key.value): copy_value(value.value) for key, value in node.elements.items()}))
+
+
+def optimize(ast):
+    """Optimize a program in place, return it with the number of nodes removed."""
+    optimizer = Optimizer()
+    ast = optimizer.optimize(ast)
+    return ast, optimizer.removed
@@ -0,0 +1,230 @@
+import contextlib
+import io
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from muni_ast_nodes import *
+from muni_error import Muni_Error
+from muni_runtime import Function
+from muni_types import *
+import stdlib
+
+# What a reduction variable starts from in every iteration, by operator and
+# by the type of the variable
+identities = {
+    ('+', Muni_Int): lambda value: Muni_Int(0),
+    ('+', Muni_Float): lambda value: Muni_Float(0.0),
+    ('+', Muni_Complex): lambda value: Muni_Complex(0, 0),
+    ('+', Muni_String): lambda value: Muni_String(""),
+    ('+', Muni_List): lambda value: Muni_List([], value.type_specifier),
+    ('*', Muni_Int): lambda value: Muni_Int(1),
+    ('*', Muni_Float): lambda value: Muni_Float(1.0),
+    ('*', Muni_Complex): lambda value: Muni_Complex(1, 0),
+}
+
+
+def identity(operator, value):
+    make = identities.get((operator, type(value)))
+    if make is None:
+        raise Muni_Error(f"Reduction Error: cannot reduce a {type(value).__name__} with {operator}")
+    return make(value)
+
+
+def referenced_names(nodes):
+    """Every name a tree of nodes reads, writes or calls."""
+    names = set()
+    pending = [nodes]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (list, tuple)):
+            pending.extend(node)
+        elif isinstance(node, dict):
+            pending.extend(node.keys())
+            pending.extend(node.values())
+        elif isinstance(node, AstNode):
+            name = getattr(node, 'name', None)
+            if isinstance(name, str):
+                names.add(name)
+            pending.extend(vars(node).values())
+    return names
+
+
+def picklable(value):
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+class IterationRunner:
+    """Runs iterations of a parallel loop, in a pool process or in the program's.
+
+    Every iteration starts from the same snapshot of the variables the body
+    and the functions use: what an iteration writes to them is its own,
+    except for the reduction variables. Those start from the identity of
+    their operator and the values they end with are combined, in the order
+    of the iterations, into one partial result per chunk. What the body
+    prints is collected the same way.
+    """
+
+    def __init__(self, runtime, node):
+        functions = {}
+        imported = []
+        for name, function in runtime.functions.items():
+            # The stdlib is registered by every runtime
+            if getattr(stdlib, 'muni_' + name, None) is function:
+                continue
+            if not isinstance(function, Function):
+                # Python functions can only be shipped when they are importable
+                if not picklable(function):
+                    continue
+                if name in runtime.imported_functions:
+                    imported.append(name)
+            functions[name] = function
+        names = referenced_names([node.body] + [function.body for function in functions.values() if isinstance(function, Function)])
+        variables = {}
+        for scope in runtime.scopes:
+            for name, value in scope.items():
+                if name in names:
+                    variables[name] = value
+        self.runtime_class = type(runtime)
+        self.vectorize = runtime.vectorize
+        self.coalesce_watches = runtime.coalesce_watches
+        self.args = getattr(runtime, 'args', [])
+        self.functions = functions
+        self.imported = imported
+        self.modules = runtime.modules
+        self.variables = variables
+        self.identifier = node.identifier
+        self.type_specifier = node.type_specifier
+        self.program = StatementList(statements=node.body, lineno=node.lineno)
+        self.reductions = node.reductions
+        self.identities = {name: identity(operator, runtime.get_variable(name)) for name, operator in node.reductions}
+        self.runtime = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['runtime'] = None
+        return state
+
+    def start(self):
+        runtime = self.runtime_class()
+        runtime.set_vectorize(self.vectorize)
+        runtime.set_coalesce_watches(self.coalesce_watches)
+        runtime.set_args(self.args)
+        # Loops nested in the body run in this process
+        runtime.set_parallel_workers(1)
+        runtime.functions.update(self.functions)
+        runtime.imported_functions.extend(self.imported)
+        runtime.modules.update(self.modules)
+        # What the iterations start from, the shipped functions and the stdlib
+        self.defined = dict(runtime.functions)
+        self.runtime = runtime
+        return runtime
+
+    def reset(self, runtime):
+        scope = {name: copy_value(value) for name, value in self.variables.items()}
+        for name, value in self.identities.items():
+            scope[name] = value.copy()
+        runtime.scopes[:] = [scope]
+        runtime.functions.clear()
+        runtime.functions.update(self.defined)
+        runtime.signals.clear()
+        runtime.watched.clear()
+        runtime.pending_watches.clear()
+        runtime.is_running = True
+        runtime.error = None
+
+    def run(self, items):
+        """Run the iterations of a chunk, return what they printed, their partial results and their error."""
+        runtime = self.runtime or self.start()
+        runtime.context.set_runtime(runtime)
+        partials = {name: value.copy() for name, value in self.identities.items()}
+        output = io.StringIO()
+        error = None
+        with contextlib.redirect_stdout(output):
+            for item in items:
+                self.reset(runtime)
+                runtime.bind_loop_variable(self.identifier, item, self.type_specifier)
+                for _ in runtime.execute(self.program):
+                    pass
+                runtime.scheduler.wait()
+                if runtime.error is not None:
+                    error = (runtime.error.message, runtime.error.line)
+                    break
+                for name, operator in self.reductions:
+                    partials[name] = runtime.apply_binary_operator(partials[name], runtime.get_variable(name), operator)
+        return output.getvalue(), partials, error
+
+
+# The runner of the loop a pool process works for
+worker = None
+
+
+def start_worker(runner):
+    global worker
+    worker = runner
+
+
+def run_chunk(items):
+    return worker.run(items)
+
+
+def chunked(items, count):
+    size = max(1, -(-len(items) // count))
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def run_parallel_for(runtime, node, iterable):
+    """Run the iterations of a parallel for-in loop on a pool of processes.
+
+    Chunks of items go to the processes, each chunk sends back what it
+    printed and its partial reductions. They are merged as the chunks
+    finish, or in the order of the items for an ordered loop, and the
+    reduction variables are assigned once at the end. An error in an
+    iteration stops the loop and the program, like in a serial loop.
+    """
+    items = list(iterable)
+    runner = IterationRunner(runtime, node)
+    workers = runtime.parallel_workers or os.cpu_count() or 1
+    # A few chunks per process, so that one slow chunk does not hold up the others
+    chunks = chunked(items, workers * 4)
+    totals = {name: runtime.get_variable(name) for name, _ in node.reductions}
+
+    def merge(result):
+        output, partials, error = result
+        sys.stdout.write(output)
+        if error is not None:
+            message, line = error
+            runtime.error = Muni_Error(message, line)
+            runtime.is_running = False
+            return False
+        for name, operator in node.reductions:
+            totals[name] = runtime.apply_binary_operator(totals[name], partials[name], operator)
+        return True
+
+    if workers <= 1 or len(chunks) <= 1:
+        try:
+            for chunk in chunks:
+                if not merge(runner.run(chunk)):
+                    return Muni_Void()
+        finally:
+            # The runner's runtime made itself the current one
+            runtime.context.set_runtime(runtime)
+    else:
+        try:
+            with ProcessPoolExecutor(min(workers, len(chunks)), initializer=start_worker, initargs=(runner,)) as executor:
+                futures = [executor.submit(run_chunk, chunk) for chunk in chunks]
+                for future in (futures if node.ordered else as_completed(futures)):
+                    if not merge(future.result()):
+                        for pending in futures:
+                            pending.cancel()
+                        return Muni_Void()
+        except (pickle.PicklingError, BrokenProcessPool) as error:
+            raise Muni_Error(f"Parallel Error: {error}")
+    for name, _ in node.reductions:
+        runtime.assign_variable(name, totals[name])
+    return Muni_Void()
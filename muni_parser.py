@@ -1,5 +1,13 @@
 from ply import yacc
-from muni_lexer import tokens, keywords 
+import contextlib
+import gc
+import os
+import threading
+import time
+from muni_lexer import tokens, keywords
+from muni_scanner import Scanner
+from muni_resolver import resolve
+from muni_cache import cached_parse
 from muni_ast_nodes import *
 
 precedence = (
@@ -20,8 +28,9 @@ def p_statements(p):
     '''statements : statements statement
                   | statement'''
     if len(p) == 3:
-        # If there's more than one statement, append it to the list
-        p[0] = p[1] + [p[2]]
+        # Append in place, the list is only ever owned by this rule
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         # Single statement
         p[0] = [p[1]]
@@ -80,7 +89,8 @@ def p_list_elements(p):
     '''list_elements : list_elements COMMA expression
                      | expression'''
     if len(p) == 4:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -104,7 +114,8 @@ def p_dict_elements(p):
     '''dict_elements : dict_elements COMMA dict_element
                      | dict_element'''
     if len(p) == 4:
-        p[0] = {**p[1], **p[3]}
+        p[1].update(p[3])
+        p[0] = p[1]
     else:
         p[0] = p[1]
 
@@ -161,6 +172,47 @@ def p_for_loop(p):
     else:
         p[0] = ForStatement(begin_statement=p[3], condition=p[4], end_statement=p[5], body=p[8], lineno=p.lineno(1))
 
+def p_parallel_for_loop(p):
+    '''statement : IDENTIFIER FOR LPAREN type_specifier IDENTIFIER IN expression RPAREN reduction_clauses LBRACE statements RBRACE
+                 | IDENTIFIER IDENTIFIER FOR LPAREN type_specifier IDENTIFIER IN expression RPAREN reduction_clauses LBRACE statements RBRACE'''
+    expect_word(p, 1, 'parallel')
+    ordered = len(p) == 14
+    if ordered:
+        expect_word(p, 2, 'ordered')
+    offset = 1 if ordered else 0
+    p[0] = ParallelForInStatement(type_specifier=p[4 + offset], identifier=p[5 + offset], iterable=p[7 + offset],
+                                  body=p[11 + offset], reductions=p[9 + offset], ordered=ordered, lineno=p.lineno(1))
+
+def p_reduction_clauses(p):
+    '''reduction_clauses : reduction_clauses IDENTIFIER LPAREN reduction_operator COLON reduction_names RPAREN
+                         | '''
+    if len(p) == 1:
+        p[0] = []
+    else:
+        expect_word(p, 2, 'reduce')
+        p[1].extend((name, p[4]) for name in p[6])
+        p[0] = p[1]
+
+def p_reduction_operator(p):
+    '''reduction_operator : PLUS
+                          | MUL'''
+    p[0] = p[1]
+
+def p_reduction_names(p):
+    '''reduction_names : reduction_names COMMA IDENTIFIER
+                       | IDENTIFIER'''
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
+
+def expect_word(p, index, word):
+    # `parallel`, `ordered` and `reduce` are only words of a parallel loop, not keywords,
+    # so they are still free to name variables
+    if p[index] != word:
+        p_error(p.slice[index])
+
 def p_d_expression(p):
     '''expression : dot_expression'''
     p[0] = p[1]
@@ -177,7 +229,8 @@ def p_case_clauses(p):
     '''case_clauses : case_clauses case_clause
                     | case_clause'''
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -223,7 +276,8 @@ def p_parameter_list(p):
                       | type_specifier IDENTIFIER
                       | '''
     if len(p) == 5:
-        p[0] = p[1] + [(p[3], p[4])]
+        p[1].append((p[3], p[4]))
+        p[0] = p[1]
     elif len(p) == 3:
         p[0] = [(p[1], p[2])]
     else:
@@ -264,7 +318,8 @@ def p_argument_list(p):
                      | expression
                      | '''
     if len(p) == 4:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
     elif len(p) == 2:
         p[0] = [p[1]]
     else:
@@ -365,6 +420,8 @@ def p_expression_range(p):
 
 
 def p_error(p):
+    global error_count
+    error_count += 1
     if p:
         print(f"Syntax error at {p.lineno}, illegal character {p.value}")
     else:
@@ -376,13 +433,84 @@ def p_throw_statement(p):
     p[0] = ThrowStatement(expression=p[2], lineno=p.lineno(1))
 
 
-parser = yacc.yacc()
+# The LALR tables are shipped prebuilt in muni_parsetab.py and never written at
+# startup. If the grammar no longer matches them, yacc rebuilds them in memory:
+# run `python muni_parser.py` to regenerate the file after a grammar change.
+TABLE_MODULE = 'muni_parsetab'
+
+started = time.perf_counter()
+parser = yacc.yacc(tabmodule=TABLE_MODULE, write_tables=False, debug=False)
+table_time = time.perf_counter() - started
+
+
+lexer = Scanner()
+error_count = 0
+
+# 'lalr' is the PLY parser above, 'pratt' the hand-written one in muni_pratt,
+# which builds the same trees
+PARSERS = ('lalr', 'pratt')
+parser_name = 'lalr'
+
+def set_parser(name):
+    global parser_name
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser '{name}', expected one of {', '.join(PARSERS)}")
+    parser_name = name
+
+# Parses on other threads may overlap, the collector is back on when the last one ends
+_collection_lock = threading.Lock()
+_collection_pauses = 0
+_collection_resumes = False
+
+@contextlib.contextmanager
+def collection_paused():
+    """Hold off the cyclic collector, restoring its previous state when no parse still needs it off."""
+    global _collection_pauses, _collection_resumes
+    with _collection_lock:
+        if _collection_pauses == 0:
+            _collection_resumes = gc.isenabled()
+            gc.disable()
+        _collection_pauses += 1
+    try:
+        yield
+    finally:
+        with _collection_lock:
+            _collection_pauses -= 1
+            if _collection_pauses == 0 and _collection_resumes:
+                gc.enable()
+
+# The lexer and both parsers are shared, runtimes on other threads parse one at a time
+_parse_lock = threading.RLock()
+
+def parse(content):
+    global error_count
+    with _parse_lock:
+        # Every program starts on line 1, whatever was parsed before it
+        error_count = 0
+        lexer.error_count = 0
+        lexer.lineno = 1
+        # A parse allocates a token and a few nodes per word of source but never
+        # makes a reference cycle, so the cyclic collector, which would walk the
+        # whole growing tree over and over, is held off until it is done
+        with collection_paused():
+            if parser_name == 'pratt':
+                # Resolves the names as it goes
+                import muni_pratt
+                ast = muni_pratt.parser.parse(content, lexer=lexer)
+            else:
+                ast = parser.parse(content, lexer=lexer)
+                if ast is not None:
+                    resolve(ast)
+        return ast
+
+def parsed_cleanly():
+    return error_count == 0 and lexer.error_count == 0
 
 
 def parse_file(file_path):
     with open(file_path, 'r') as file:
         content = file.read()
-    return parser.parse(content) 
+    return cached_parse(file_path, content, parse, parsed_cleanly, variant=parser_name)
 
 
 
@@ -392,3 +520,7 @@ def find_column(input_text, token):
         last_cr = 0
     column = (token.lexpos - last_cr) + 1
     return column
+
+
+if __name__ == "__main__":
+    yacc.yacc(tabmodule=TABLE_MODULE, outputdir=os.path.dirname(os.path.abspath(__file__)), debug=False)
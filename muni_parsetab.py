@@ -0,0 +1,147 @@
+
+# muni_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'rightRARROWleftPLUSMINUSleftMULDIVleftAMPERSANDPIPErightEXCLAMATIONleftSEMIAMPERSAND AS BOOLEAN BREAK CASE COLON COMMA COMPLEX DEFAULT DICT DIV DIVEQ DOLLAR DOT ELSE EMIT EQ EQUALS EXCLAMATION FLOAT FOR GE GT HAT IDENTIFIER IF IMAGINARY_NUMBER IMPORT IMPORT_LITERAL IN INT LBRACE LBRACKET LE LIST LPAREN LT MINUS MINUSEQ MODEQ MODULE MODULUS MUL MULEQ NE NUMBER PIPE PLUS PLUSEQ RANGE_OP RANGE_OP_INCLUSIVE RARROW RBRACE RBRACKET RETURN RPAREN SEMI SIGNAL STRING STRING_LITERAL SWITCH THROW UNTIL UNTYPED VOID WATCH WHEN WHILEprogram : statementsstatements : statements statement\n                  | statementstatement : expression SEMI\n                 |\xa0declaration SEMI\n                 | assignment SEMI\n                 | function_declaration\n                 | module_declaration\n                 | return_statement SEMI\n                 | import_statement SEMI\n                 | emit_statement SEMI\n                 | signal_declaration SEMI\n                 | when_statement\n                 | watch_statement\n                 | throw_statement SEMItype_specifier : BOOLEAN\n                      | INT\n                      | FLOAT\n                      | COMPLEX\n                      | STRING\n                      | VOID\n                      | UNTYPED\n                      | LIST\n                      | LIST IMPORT_LITERAL\n                      | DICT\n                      | DICT LT type_specifier COMMA type_specifier GTexpression : LBRACKET list_elements RBRACKET\n                  | LBRACKET RBRACKETlist_elements : list_elements COMMA expression\n                     | expressionexpression : expression LBRACKET expression RBRACKETassignment : expression LBRACKET expression RBRACKET EQUALS expressionexpression : LBRACE dict_elements RBRACE\n                  | LBRACE RBRACEdict_elements : dict_elements COMMA dict_element\n                     | dict_elementdict_element : expression COLON expressionexpression : LPAREN expression RPARENexpression : expression RARROW type_specifier\n                  | expression RARROW IDENTIFIERstatement : IF LPAREN expression RPAREN LBRACE statements RBRACE\n                 | IF LPAREN expression RPAREN LBRACE statements RBRACE ELSE LBRACE statements RBRACE\n                 | IF LPAREN expression RPAREN LBRACE statements RBRACE ELSE statementstatement : WHILE LPAREN expression RPAREN LBRACE statements RBRACE\n                 | WHILE LPAREN expression RPAREN COLON NUMBER LBRACE statements RBRACEstatement : UNTIL LPAREN expression RPAREN LBRACE statements RBRACE\n                 | UNTIL LPAREN expression RPAREN COLON NUMBER LBRACE statements RBRACEstatement : FOR LPAREN statement statement statement RPAREN LBRACE statements RBRACE\n                 | FOR LPAREN type_specifier IDENTIFIER IN expression RPAREN LBRACE statements RBRACEstatement : IDENTIFIER FOR LPAREN type_specifier IDENTIFIER IN expression RPAREN reduction_clauses LBRACE statements RBRACE\n                 | IDENTIFIER IDENTIFIER FOR LPAREN type_specifier IDENTIFIER IN expression RPAREN reduction_clauses LBRACE statements RBRACEreduction_clauses : reduction_clauses IDENTIFIER LPAREN reduction_operator COLON reduction_names RPAREN\n                         | reduction_operator : PLUS\n                          | MULreduction_names : reduction_names COMMA IDENTIFIER\n                       | IDENTIFIERexpression : dot_expressionstatement : SWITCH LPAREN expression RPAREN LBRACE case_clauses RBRACEcase_clauses : case_clauses case_clause\n                    | case_clausecase_clause : CASE expression COLON statements BREAK SEMIcase_clause : DEFAULT COLON statements BREAK SEMIdeclaration : type_specifier IDENTIFIER EQUALS expression\n                   | type_specifier IDENTIFIERassignment : IDENTIFIER EQUALS expressionfunction_declaration : type_specifier IDENTIFIER LPAREN parameter_list RPAREN LBRACE statements RBRACEmodule_declaration : MODULE IDENTIFIER LBRACE statements RBRACEparameter_list : parameter_list COMMA type_specifier IDENTIFIER\n                      | type_specifier IDENTIFIER\n                      | return_statement : RETURN expression\n                        | RETURNexpression : dot_expression LPAREN argument_list RPAREN\n                  | IDENTIFIER LPAREN argument_list RPARENsignal_declaration : SIGNAL IDENTIFIERemit_statement : EMIT IDENTIFIERwatch_statement : WATCH LPAREN IDENTIFIER RPAREN LBRACE statements RBRACEwhen_statement : WHEN LPAREN IDENTIFIER RPAREN LBRACE statements RBRACEargument_list : argument_list COMMA expression\n                     | expression\n                     | import_statement : IMPORT IMPORT_LITERAL\n                        | IMPORT IMPORT_LITERAL AS IDENTIFIERdot_expression : IDENTIFIER DOT IDENTIFIERexpression : expression PLUS expression\n                  | expression MINUS expression\n                  | expression MUL expression\n                  | expression DIV expression\n                  | expression MODULUS expressionexpression : IDENTIFIER PLUSEQ expression\n                 | IDENTIFIER MINUSEQ expression\n                 | IDENTIFIER MULEQ expression\n                 | IDENTIFIER DIVEQ expression\n                 | IDENTIFIER MODEQ expressionexpression : expression AMPERSAND expression\n                  | expression PIPE expression\n                  | expression HAT expressionexpression : expression GT expression\n                  | expression LT expression\n                  | expression EQ expression\n                  | expression GE expression\n                  | expression LE expression\n                  | expression NE expressionexpression : EXCLAMATION expressionexpression : NUMBER\n                  | IMAGINARY_NUMBERexpression : BOOLEANexpression : STRING_LITERALexpression : IDENTIFIERexpression : MINUS expressionexpression : DOLLAR NUMBERrange_operator : RANGE_OP\n                      | RANGE_OP_INCLUSIVEexpression : expression range_operator expression\n                  | expression range_operator expression COLON expressionthrow_statement : THROW expression'
+    
+_lr_action_items = {'IF':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[16,16,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,16,16,16,16,16,16,16,16,-68,16,16,16,16,16,16,16,16,-41,-44,16,-46,16,16,16,-59,16,-79,-78,16,16,16,16,16,-67,16,16,16,-43,-45,-47,-48,16,16,16,-49,16,-42,16,16,16,-50,-51,]),'WHILE':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[19,19,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,19,19,19,19,19,19,19,19,-68,19,19,19,19,19,19,19,19,-41,-44,19,-46,19,19,19,-59,19,-79,-78,19,19,19,19,19,-67,19,19,19,-43,-45,-47,-48,19,19,19,-49,19,-42,19,19,19,-50,-51,]),'UNTIL':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[21,21,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,21,21,21,21,21,21,21,21,-68,21,21,21,21,21,21,21,21,-41,-44,21,-46,21,21,21,-59,21,-79,-78,21,21,21,21,21,-67,21,21,21,-43,-45,-47,-48,21,21,21,-49,21,-42,21,21,21,-50,-51,]),'FOR':([0,2,3,7,8,13,14,24,50,51,71,72,73,74,75,76,77,88,90,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[22,22,-3,-7,-8,-13,-14,91,-2,-4,-5,-6,-9,-10,-11,-12,-15,22,150,22,22,22,22,22,22,22,-68,22,22,22,22,22,22,22,22,-41,-44,22,-46,22,22,22,-59,22,-79,-78,22,22,22,22,22,-67,22,22,22,-43,-45,-47,-48,22,22,22,-49,22,-42,22,22,22,-50,-51,]),'IDENTIFIER':([0,2,3,7,8,13,14,17,18,23,24,26,28,29,31,34,35,37,38,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,86,87,88,92,93,94,95,96,97,98,99,100,104,113,114,116,121,139,141,142,145,146,147,148,163,165,166,171,178,181,184,186,190,195,197,199,201,204,208,212,213,214,217,218,220,224,225,227,230,232,233,234,235,236,237,238,239,240,242,244,246,249,250,251,252,253,254,255,256,257,259,260,261,262,263,264,265,266,267,268,269,270,273,274,275,277,280,281,283,285,289,290,291,294,295,],[24,24,-3,-7,-8,-13,-14,80,80,89,90,80,80,80,-16,108,80,111,112,80,-17,-18,-19,-20,-21,-22,-23,-25,-2,-4,80,120,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,-113,-114,-5,-6,-9,-10,-11,-12,-15,80,80,80,24,80,80,80,80,80,80,80,160,80,80,167,168,-24,-16,80,80,80,24,179,-16,80,80,24,191,80,24,205,209,80,24,80,24,24,24,80,226,-68,24,24,24,24,24,24,243,80,80,24,24,-26,-41,-44,24,-46,24,24,24,80,-59,24,-79,-78,24,24,24,24,24,-67,-53,24,24,24,-43,-45,-47,-48,24,-53,276,24,24,-49,276,24,-42,24,24,24,-50,-51,292,-52,296,]),'SWITCH':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[25,25,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,25,25,25,25,25,25,25,25,-68,25,25,25,25,25,25,25,25,-41,-44,25,-46,25,25,25,-59,25,-79,-78,25,25,25,25,25,-67,25,25,25,-43,-45,-47,-48,25,25,25,-49,25,-42,25,25,25,-50,-51,]),'LBRACKET':([0,2,3,4,7,8,13,14,17,18,20,24,26,27,28,29,30,31,32,35,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,83,85,86,87,88,92,93,94,95,96,97,98,100,102,103,104,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,148,153,154,155,156,157,158,159,160,161,162,163,165,170,171,173,175,178,180,185,186,188,189,190,195,196,197,198,199,201,204,210,212,213,214,216,217,218,220,223,224,227,230,232,233,234,235,236,237,238,239,240,242,244,245,246,248,249,250,251,252,253,254,255,256,257,258,260,261,262,263,264,265,266,267,270,272,273,274,277,280,281,283,285,289,290,],[26,26,-3,52,-7,-8,-13,-14,26,26,-106,-110,26,-58,26,26,-107,-108,-109,26,26,-17,-18,-19,-20,-21,-22,-23,-25,-2,-4,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,-113,-114,-5,-6,-9,-10,-11,-12,-15,26,139,-110,-108,-34,139,26,26,26,26,26,26,26,26,26,26,26,-28,139,26,-111,-105,-112,139,139,-24,139,-39,-40,-16,-86,-87,-88,-89,139,-96,-97,139,139,139,139,139,139,139,139,139,-38,26,-33,26,26,139,139,26,-108,26,139,139,139,139,139,139,139,-85,139,-27,26,26,-31,26,139,139,26,139,-75,26,139,-74,26,26,139,26,-31,26,26,26,139,-68,26,26,139,26,26,26,139,26,26,26,26,26,-26,-41,-44,26,-46,26,26,26,26,139,-59,139,26,-79,-78,26,26,26,26,26,-67,139,26,26,26,-43,-45,-47,-48,26,26,52,26,-49,26,-42,26,26,26,-50,-51,]),'LBRACE':([0,2,3,7,8,13,14,17,18,26,28,29,35,41,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,86,87,88,92,93,94,95,96,97,98,100,104,108,139,141,142,145,148,163,165,171,172,176,177,178,186,187,190,192,193,195,197,199,201,204,206,212,213,214,217,218,219,220,221,222,224,227,230,232,233,235,236,237,238,239,240,241,242,244,246,249,250,251,252,253,254,255,256,257,259,260,261,262,263,264,265,266,267,268,269,270,273,274,275,277,280,281,283,285,289,290,294,],[18,18,-3,-7,-8,-13,-14,18,18,18,18,18,18,18,-2,-4,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,-113,-114,-5,-6,-9,-10,-11,-12,-15,18,18,18,18,18,18,18,18,18,18,18,18,18,165,18,18,18,18,18,18,18,18,197,199,201,18,18,211,18,213,214,18,18,18,18,18,224,-68,18,18,18,18,237,18,239,240,18,18,18,18,18,-41,-44,18,-46,18,18,256,18,18,-59,18,-79,-78,262,18,18,18,18,-67,-53,18,18,18,-43,-45,-47,-48,18,-53,277,18,18,-49,281,18,-42,18,18,18,-50,-51,-52,]),'LPAREN':([0,2,3,7,8,13,14,16,17,18,19,21,22,24,25,26,27,28,29,35,39,40,41,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,80,86,87,88,89,91,92,93,94,95,96,97,98,100,104,139,141,142,145,148,150,160,163,165,171,178,179,186,190,195,197,199,201,204,212,213,214,217,218,220,224,227,230,232,233,235,236,237,238,239,240,242,244,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,276,277,280,281,283,285,289,290,],[17,17,-3,-7,-8,-13,-14,78,17,17,86,87,88,92,100,17,104,17,17,17,113,114,17,-2,-4,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,-113,-114,-5,-6,-9,-10,-11,-12,-15,17,92,17,17,17,149,151,17,17,17,17,17,17,17,17,17,17,17,17,17,17,183,-85,17,17,17,17,149,17,17,17,17,17,17,17,-68,17,17,17,17,17,17,17,17,17,17,-41,-44,17,-46,17,17,17,17,-59,17,-79,-78,17,17,17,17,17,-67,17,17,17,-43,-45,-47,-48,17,17,17,-49,282,17,-42,17,17,17,-50,-51,]),'EXCLAMATION':([0,2,3,7,8,13,14,17,18,26,28,29,35,41,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,86,87,88,92,93,94,95,96,97,98,100,104,139,141,142,145,148,163,165,171,178,186,190,195,197,199,201,204,212,213,214,217,218,220,224,227,230,232,233,235,236,237,238,239,240,242,244,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[29,29,-3,-7,-8,-13,-14,29,29,29,29,29,29,29,-2,-4,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,-113,-114,-5,-6,-9,-10,-11,-12,-15,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,-68,29,29,29,29,29,29,29,29,29,29,-41,-44,29,-46,29,29,29,29,-59,29,-79,-78,29,29,29,29,29,-67,29,29,29,-43,-45,-47,-48,29,29,29,-49,29,-42,29,29,29,-50,-51,]),'NUMBER':([0,2,3,7,8,13,14,17,18,26,28,29,33,35,41,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,86,87,88,92,93,94,95,96,97,98,100,104,139,141,142,145,148,163,165,171,178,186,190,195,197,199,200,201,202,204,212,213,214,217,218,220,224,227,230,232,233,235,236,237,238,239,240,242,244,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[20,20,-3,-7,-8,-13,-14,20,20,20,20,20,107,20,20,-2,-4,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,-113,-114,-5,-6,-9,-10,-11,-12,-15,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,219,20,221,20,-68,20,20,20,20,20,20,20,20,20,20,-41,-44,20,-46,20,20,20,20,-59,20,-79,-78,20,20,20,20,20,-67,20,20,20,-43,-45,-47,-48,20,20,20,-49,20,-42,20,20,20,-50,-51,]),'IMAGINARY_NUMBER':([0,2,3,7,8,13,14,17,18,26,28,29,35,41,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,86,87,88,92,93,94,95,96,97,98,100,104,139,141,142,145,148,163,165,171,178,186,190,195,197,199,201,204,212,213,214,217,218,220,224,227,230,232,233,235,236,237,238,239,240,242,244,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[30,30,-3,-7,-8,-13,-14,30,30,30,30,30,30,30,-2,-4,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,-113,-114,-5,-6,-9,-10,-11,-12,-15,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,-68,30,30,30,30,30,30,30,30,30,30,-41,-44,30,-46,30,30,30,30,-59,30,-79,-78,30,30,30,30,30,-67,30,30,30,-43,-45,-47,-48,30,30,30,-49,30,-42,30,30,30,-50,-51,]),'BOOLEAN':([0,2,3,7,8,13,14,17,18,26,28,29,35,41,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,86,87,88,92,93,94,95,96,97,98,100,104,117,139,141,142,145,148,149,151,163,165,171,178,183,186,190,194,195,197,199,201,204,207,212,213,214,217,218,220,224,227,230,232,233,235,236,237,238,239,240,242,244,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[31,31,-3,-7,-8,-13,-14,81,81,81,81,81,81,81,-2,-4,81,121,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,-113,-114,-5,-6,-9,-10,-11,-12,-15,81,81,81,147,81,81,81,81,81,81,81,81,81,121,81,81,81,31,81,121,121,81,31,81,31,121,81,31,121,81,31,31,31,81,121,-68,31,31,31,31,31,31,81,81,31,31,-41,-44,31,-46,31,31,31,81,-59,31,-79,-78,31,31,31,31,31,-67,31,31,31,-43,-45,-47,-48,31,31,31,-49,31,-42,31,31,31,-50,-51,]),'STRING_LITERAL':([0,2,3,7,8,13,14,17,18,26,28,29,35,41,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,86,87,88,92,93,94,95,96,97,98,100,104,139,141,142,145,148,163,165,171,178,186,190,195,197,199,201,204,212,213,214,217,218,220,224,227,230,232,233,235,236,237,238,239,240,242,244,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[32,32,-3,-7,-8,-13,-14,32,32,32,32,32,32,32,-2,-4,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,-113,-114,-5,-6,-9,-10,-11,-12,-15,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,-68,32,32,32,32,32,32,32,32,32,32,-41,-44,32,-46,32,32,32,32,-59,32,-79,-78,32,32,32,32,32,-67,32,32,32,-43,-45,-47,-48,32,32,32,-49,32,-42,32,32,32,-50,-51,]),'MINUS':([0,2,3,4,7,8,13,14,17,18,20,24,26,27,28,29,30,31,32,35,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,83,85,86,87,88,92,93,94,95,96,97,98,100,102,103,104,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,148,153,154,155,156,157,158,159,160,161,162,163,165,170,171,173,175,178,180,185,186,188,189,190,195,196,197,198,199,201,204,210,212,213,214,216,217,218,220,223,224,227,230,232,233,234,235,236,237,238,239,240,242,244,245,246,248,249,250,251,252,253,254,255,256,257,258,260,261,262,263,264,265,266,267,270,272,273,274,277,280,281,283,285,289,290,],[28,28,-3,55,-7,-8,-13,-14,28,28,-106,-110,28,-58,28,28,-107,-108,-109,28,28,-17,-18,-19,-20,-21,-22,-23,-25,-2,-4,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,-113,-114,-5,-6,-9,-10,-11,-12,-15,28,55,-110,-108,-34,55,28,28,28,28,28,28,28,28,28,28,28,-28,55,28,-111,-105,-112,55,55,-24,55,-39,-40,-16,-86,-87,-88,-89,55,-96,-97,55,55,55,55,55,55,55,55,55,-38,28,-33,28,28,55,55,28,-108,28,55,55,55,55,55,55,55,-85,55,-27,28,28,-31,28,55,55,28,55,-75,28,55,-74,28,28,55,28,-31,28,28,28,55,-68,28,28,55,28,28,28,55,28,28,28,28,28,-26,-41,-44,28,-46,28,28,28,28,55,-59,55,28,-79,-78,28,28,28,28,28,-67,55,28,28,28,-43,-45,-47,-48,28,28,55,28,-49,28,-42,28,28,28,-50,-51,]),'DOLLAR':([0,2,3,7,8,13,14,17,18,26,28,29,35,41,50,51,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,86,87,88,92,93,94,95,96,97,98,100,104,139,141,142,145,148,163,165,171,178,186,190,195,197,199,201,204,212,213,214,217,218,220,224,227,230,232,233,235,236,237,238,239,240,242,244,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[33,33,-3,-7,-8,-13,-14,33,33,33,33,33,33,33,-2,-4,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,-113,-114,-5,-6,-9,-10,-11,-12,-15,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,-68,33,33,33,33,33,33,33,33,33,33,-41,-44,33,-46,33,33,33,33,-59,33,-79,-78,33,33,33,33,33,-67,33,33,33,-43,-45,-47,-48,33,33,33,-49,33,-42,33,33,33,-50,-51,]),'MODULE':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[34,34,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,34,34,34,34,34,34,34,34,-68,34,34,34,34,34,34,34,34,-41,-44,34,-46,34,34,34,-59,34,-79,-78,34,34,34,34,34,-67,34,34,34,-43,-45,-47,-48,34,34,34,-49,34,-42,34,34,34,-50,-51,]),'RETURN':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[35,35,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,35,35,35,35,35,35,35,35,-68,35,35,35,35,35,35,35,35,-41,-44,35,-46,35,35,35,-59,35,-79,-78,35,35,35,35,35,-67,35,35,35,-43,-45,-47,-48,35,35,35,-49,35,-42,35,35,35,-50,-51,]),'IMPORT':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[36,36,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,36,36,36,36,36,36,36,36,-68,36,36,36,36,36,36,36,36,-41,-44,36,-46,36,36,36,-59,36,-79,-78,36,36,36,36,36,-67,36,36,36,-43,-45,-47,-48,36,36,36,-49,36,-42,36,36,36,-50,-51,]),'EMIT':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[37,37,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,37,37,37,37,37,37,37,37,-68,37,37,37,37,37,37,37,37,-41,-44,37,-46,37,37,37,-59,37,-79,-78,37,37,37,37,37,-67,37,37,37,-43,-45,-47,-48,37,37,37,-49,37,-42,37,37,37,-50,-51,]),'SIGNAL':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[38,38,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,38,38,38,38,38,38,38,38,-68,38,38,38,38,38,38,38,38,-41,-44,38,-46,38,38,38,-59,38,-79,-78,38,38,38,38,38,-67,38,38,38,-43,-45,-47,-48,38,38,38,-49,38,-42,38,38,38,-50,-51,]),'WHEN':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[39,39,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,39,39,39,39,39,39,39,39,-68,39,39,39,39,39,39,39,39,-41,-44,39,-46,39,39,39,-59,39,-79,-78,39,39,39,39,39,-67,39,39,39,-43,-45,-47,-48,39,39,39,-49,39,-42,39,39,39,-50,-51,]),'WATCH':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[40,40,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,40,40,40,40,40,40,40,40,-68,40,40,40,40,40,40,40,40,-41,-44,40,-46,40,40,40,-59,40,-79,-78,40,40,40,40,40,-67,40,40,40,-43,-45,-47,-48,40,40,40,-49,40,-42,40,40,40,-50,-51,]),'THROW':([0,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,88,145,165,178,190,197,199,201,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[41,41,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,41,41,41,41,41,41,41,41,-68,41,41,41,41,41,41,41,41,-41,-44,41,-46,41,41,41,-59,41,-79,-78,41,41,41,41,41,-67,41,41,41,-43,-45,-47,-48,41,41,41,-49,41,-42,41,41,41,-50,-51,]),'INT':([0,2,3,7,8,13,14,50,51,53,71,72,73,74,75,76,77,88,117,145,149,151,165,178,183,190,194,197,199,201,207,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[42,42,-3,-7,-8,-13,-14,-2,-4,42,-5,-6,-9,-10,-11,-12,-15,42,42,42,42,42,42,42,42,42,42,42,42,42,42,-68,42,42,42,42,42,42,42,42,-41,-44,42,-46,42,42,42,-59,42,-79,-78,42,42,42,42,42,-67,42,42,42,-43,-45,-47,-48,42,42,42,-49,42,-42,42,42,42,-50,-51,]),'FLOAT':([0,2,3,7,8,13,14,50,51,53,71,72,73,74,75,76,77,88,117,145,149,151,165,178,183,190,194,197,199,201,207,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[43,43,-3,-7,-8,-13,-14,-2,-4,43,-5,-6,-9,-10,-11,-12,-15,43,43,43,43,43,43,43,43,43,43,43,43,43,43,-68,43,43,43,43,43,43,43,43,-41,-44,43,-46,43,43,43,-59,43,-79,-78,43,43,43,43,43,-67,43,43,43,-43,-45,-47,-48,43,43,43,-49,43,-42,43,43,43,-50,-51,]),'COMPLEX':([0,2,3,7,8,13,14,50,51,53,71,72,73,74,75,76,77,88,117,145,149,151,165,178,183,190,194,197,199,201,207,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[44,44,-3,-7,-8,-13,-14,-2,-4,44,-5,-6,-9,-10,-11,-12,-15,44,44,44,44,44,44,44,44,44,44,44,44,44,44,-68,44,44,44,44,44,44,44,44,-41,-44,44,-46,44,44,44,-59,44,-79,-78,44,44,44,44,44,-67,44,44,44,-43,-45,-47,-48,44,44,44,-49,44,-42,44,44,44,-50,-51,]),'STRING':([0,2,3,7,8,13,14,50,51,53,71,72,73,74,75,76,77,88,117,145,149,151,165,178,183,190,194,197,199,201,207,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[45,45,-3,-7,-8,-13,-14,-2,-4,45,-5,-6,-9,-10,-11,-12,-15,45,45,45,45,45,45,45,45,45,45,45,45,45,45,-68,45,45,45,45,45,45,45,45,-41,-44,45,-46,45,45,45,-59,45,-79,-78,45,45,45,45,45,-67,45,45,45,-43,-45,-47,-48,45,45,45,-49,45,-42,45,45,45,-50,-51,]),'VOID':([0,2,3,7,8,13,14,50,51,53,71,72,73,74,75,76,77,88,117,145,149,151,165,178,183,190,194,197,199,201,207,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[46,46,-3,-7,-8,-13,-14,-2,-4,46,-5,-6,-9,-10,-11,-12,-15,46,46,46,46,46,46,46,46,46,46,46,46,46,46,-68,46,46,46,46,46,46,46,46,-41,-44,46,-46,46,46,46,-59,46,-79,-78,46,46,46,46,46,-67,46,46,46,-43,-45,-47,-48,46,46,46,-49,46,-42,46,46,46,-50,-51,]),'UNTYPED':([0,2,3,7,8,13,14,50,51,53,71,72,73,74,75,76,77,88,117,145,149,151,165,178,183,190,194,197,199,201,207,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[47,47,-3,-7,-8,-13,-14,-2,-4,47,-5,-6,-9,-10,-11,-12,-15,47,47,47,47,47,47,47,47,47,47,47,47,47,47,-68,47,47,47,47,47,47,47,47,-41,-44,47,-46,47,47,47,-59,47,-79,-78,47,47,47,47,47,-67,47,47,47,-43,-45,-47,-48,47,47,47,-49,47,-42,47,47,47,-50,-51,]),'LIST':([0,2,3,7,8,13,14,50,51,53,71,72,73,74,75,76,77,88,117,145,149,151,165,178,183,190,194,197,199,201,207,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[48,48,-3,-7,-8,-13,-14,-2,-4,48,-5,-6,-9,-10,-11,-12,-15,48,48,48,48,48,48,48,48,48,48,48,48,48,48,-68,48,48,48,48,48,48,48,48,-41,-44,48,-46,48,48,48,-59,48,-79,-78,48,48,48,48,48,-67,48,48,48,-43,-45,-47,-48,48,48,48,-49,48,-42,48,48,48,-50,-51,]),'DICT':([0,2,3,7,8,13,14,50,51,53,71,72,73,74,75,76,77,88,117,145,149,151,165,178,183,190,194,197,199,201,207,212,213,214,217,218,220,224,232,233,235,236,237,238,239,240,242,246,249,250,251,252,253,254,255,256,257,260,261,262,263,264,265,266,267,270,273,274,277,280,281,283,285,289,290,],[49,49,-3,-7,-8,-13,-14,-2,-4,49,-5,-6,-9,-10,-11,-12,-15,49,49,49,49,49,49,49,49,49,49,49,49,49,49,-68,49,49,49,49,49,49,49,49,-41,-44,49,-46,49,49,49,-59,49,-79,-78,49,49,49,49,49,-67,49,49,49,-43,-45,-47,-48,49,49,49,-49,49,-42,49,49,49,-50,-51,]),'$end':([1,2,3,7,8,13,14,50,51,71,72,73,74,75,76,77,212,235,236,238,246,250,251,257,263,264,265,266,274,280,289,290,],[0,-1,-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,-68,-41,-44,-46,-59,-79,-78,-67,-43,-45,-47,-48,-49,-42,-50,-51,]),'RBRACE':([3,7,8,13,14,18,20,27,30,32,42,43,44,45,46,47,48,49,50,51,71,72,73,74,75,76,77,80,81,82,83,84,102,105,106,107,116,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,138,140,154,155,156,157,158,160,162,174,175,185,189,190,196,198,212,217,218,220,228,229,232,233,234,235,236,238,242,246,247,250,251,253,254,255,257,262,263,264,265,266,267,273,274,279,280,283,284,285,289,290,],[-3,-7,-8,-13,-14,83,-106,-58,-107,-109,-17,-18,-19,-20,-21,-22,-23,-25,-2,-4,-5,-6,-9,-10,-11,-12,-15,-110,-108,140,-34,-36,-28,-111,-105,-112,-24,-39,-40,-16,-86,-87,-88,-89,-90,-96,-97,-98,-99,-100,-101,-102,-103,-104,-115,-38,-33,-91,-92,-93,-94,-95,-85,-27,-35,-37,-75,-74,212,-116,-31,-68,235,236,238,246,-61,250,251,-26,-41,-44,-46,257,-59,-60,-79,-78,264,265,266,-67,83,-43,-45,-47,-48,274,280,-49,-63,-42,289,-62,290,-50,-51,]),'BREAK':([3,7,8,13,14,50,51,71,72,73,74,75,76,77,212,235,236,238,246,250,251,257,261,263,264,265,266,270,274,280,289,290,],[-3,-7,-8,-13,-14,-2,-4,-5,-6,-9,-10,-11,-12,-15,-68,-41,-44,-46,-59,-79,-78,-67,271,-43,-45,-47,-48,278,-49,-42,-50,-51,]),'SEMI':([4,5,6,9,10,11,12,15,20,24,27,30,31,32,35,42,43,44,45,46,47,48,49,80,81,83,89,102,105,106,107,109,110,111,112,115,116,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,138,140,147,154,155,156,157,158,159,160,162,170,179,180,185,189,191,196,198,216,234,271,272,278,],[51,71,72,73,74,75,76,77,-106,-110,-58,-107,-108,-109,-73,-17,-18,-19,-20,-21,-22,-23,-25,-110,-108,-34,-65,-28,-111,-105,-112,-72,-83,-77,-76,-117,-24,-39,-40,-16,-86,-87,-88,-89,-90,-96,-97,-98,-99,-100,-101,-102,-103,-104,-115,-38,-33,-108,-91,-92,-93,-94,-95,-66,-85,-27,-31,-65,-64,-75,-74,-84,-116,-31,-32,-26,279,51,284,]),'RARROW':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[53,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,53,-110,-108,-34,53,-28,53,-111,-105,-112,53,53,-24,53,-39,-40,-16,-86,-87,-88,-89,53,-96,-97,53,53,53,53,53,53,53,53,53,-38,-33,53,53,-108,53,53,53,53,53,53,53,-85,53,-27,-31,53,53,53,-75,53,-74,53,-31,53,53,53,-26,53,53,53,53,]),'PLUS':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,282,],[54,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,54,-110,-108,-34,54,-28,54,-111,-105,-112,54,54,-24,54,-39,-40,-16,-86,-87,-88,-89,54,-96,-97,54,54,54,54,54,54,54,54,54,-38,-33,54,54,-108,54,54,54,54,54,54,54,-85,54,-27,-31,54,54,54,-75,54,-74,54,-31,54,54,54,-26,54,54,54,54,287,]),'MUL':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,282,],[56,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,56,-110,-108,-34,56,-28,56,56,-105,-112,56,56,-24,56,-39,-40,-16,56,56,-88,-89,56,-96,-97,56,56,56,56,56,56,56,56,56,-38,-33,56,56,-108,56,56,56,56,56,56,56,-85,56,-27,-31,56,56,56,-75,56,-74,56,-31,56,56,56,-26,56,56,56,56,288,]),'DIV':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[57,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,57,-110,-108,-34,57,-28,57,57,-105,-112,57,57,-24,57,-39,-40,-16,57,57,-88,-89,57,-96,-97,57,57,57,57,57,57,57,57,57,-38,-33,57,57,-108,57,57,57,57,57,57,57,-85,57,-27,-31,57,57,57,-75,57,-74,57,-31,57,57,57,-26,57,57,57,57,]),'MODULUS':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[58,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,58,-110,-108,-34,58,-28,58,-111,-105,-112,58,58,-24,58,-39,-40,-16,-86,-87,-88,-89,58,-96,-97,58,58,58,58,58,58,58,58,58,-38,-33,58,58,-108,58,58,58,58,58,58,58,-85,58,-27,-31,58,58,58,-75,58,-74,58,-31,58,58,58,-26,58,58,58,58,]),'AMPERSAND':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[59,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,59,-110,-108,-34,59,-28,59,59,-105,-112,59,59,-24,59,-39,-40,-16,59,59,59,59,59,-96,-97,59,59,59,59,59,59,59,59,59,-38,-33,59,59,-108,59,59,59,59,59,59,59,-85,59,-27,-31,59,59,59,-75,59,-74,59,-31,59,59,59,-26,59,59,59,59,]),'PIPE':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[60,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,60,-110,-108,-34,60,-28,60,60,-105,-112,60,60,-24,60,-39,-40,-16,60,60,60,60,60,-96,-97,60,60,60,60,60,60,60,60,60,-38,-33,60,60,-108,60,60,60,60,60,60,60,-85,60,-27,-31,60,60,60,-75,60,-74,60,-31,60,60,60,-26,60,60,60,60,]),'HAT':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[61,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,61,-110,-108,-34,61,-28,61,-111,-105,-112,61,61,-24,61,-39,-40,-16,-86,-87,-88,-89,61,-96,-97,61,61,61,61,61,61,61,61,61,-38,-33,61,61,-108,61,61,61,61,61,61,61,-85,61,-27,-31,61,61,61,-75,61,-74,61,-31,61,61,61,-26,61,61,61,61,]),'GT':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,215,216,223,234,245,248,258,272,],[62,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,62,-110,-108,-34,62,-28,62,-111,-105,-112,62,62,-24,62,-39,-40,-16,-86,-87,-88,-89,62,-96,-97,62,62,62,62,62,62,62,62,62,-38,-33,62,62,-108,62,62,62,62,62,62,62,-85,62,-27,-31,62,62,62,-75,62,-74,62,-31,62,234,62,62,-26,62,62,62,62,]),'LT':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[63,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,117,63,-110,-108,-34,63,-28,63,-111,-105,-112,63,63,-24,63,-39,-40,-16,-86,-87,-88,-89,63,-96,-97,63,63,63,63,63,63,63,63,63,-38,-33,63,63,-108,63,63,63,63,63,63,63,-85,63,-27,-31,63,63,63,-75,63,-74,63,-31,63,63,63,-26,63,63,63,63,]),'EQ':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[64,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,64,-110,-108,-34,64,-28,64,-111,-105,-112,64,64,-24,64,-39,-40,-16,-86,-87,-88,-89,64,-96,-97,64,64,64,64,64,64,64,64,64,-38,-33,64,64,-108,64,64,64,64,64,64,64,-85,64,-27,-31,64,64,64,-75,64,-74,64,-31,64,64,64,-26,64,64,64,64,]),'GE':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[65,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,65,-110,-108,-34,65,-28,65,-111,-105,-112,65,65,-24,65,-39,-40,-16,-86,-87,-88,-89,65,-96,-97,65,65,65,65,65,65,65,65,65,-38,-33,65,65,-108,65,65,65,65,65,65,65,-85,65,-27,-31,65,65,65,-75,65,-74,65,-31,65,65,65,-26,65,65,65,65,]),'LE':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[66,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,66,-110,-108,-34,66,-28,66,-111,-105,-112,66,66,-24,66,-39,-40,-16,-86,-87,-88,-89,66,-96,-97,66,66,66,66,66,66,66,66,66,-38,-33,66,66,-108,66,66,66,66,66,66,66,-85,66,-27,-31,66,66,66,-75,66,-74,66,-31,66,66,66,-26,66,66,66,66,]),'NE':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[67,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,67,-110,-108,-34,67,-28,67,-111,-105,-112,67,67,-24,67,-39,-40,-16,-86,-87,-88,-89,67,-96,-97,67,67,67,67,67,67,67,67,67,-38,-33,67,67,-108,67,67,67,67,67,67,67,-85,67,-27,-31,67,67,67,-75,67,-74,67,-31,67,67,67,-26,67,67,67,67,]),'RANGE_OP':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[69,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,69,-110,-108,-34,69,-28,69,-111,-105,-112,69,69,-24,69,-39,-40,-16,-86,-87,-88,-89,69,-96,-97,69,69,69,69,69,69,69,69,69,-38,-33,69,69,-108,69,69,69,69,69,69,69,-85,69,-27,-31,69,69,69,-75,69,-74,69,-31,69,69,69,-26,69,69,69,69,]),'RANGE_OP_INCLUSIVE':([4,20,24,27,30,31,32,42,43,44,45,46,47,48,49,79,80,81,83,85,102,103,105,106,107,109,115,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,147,153,154,155,156,157,158,159,160,161,162,170,173,175,180,185,188,189,196,198,210,216,223,234,245,248,258,272,],[70,-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,70,-110,-108,-34,70,-28,70,-111,-105,-112,70,70,-24,70,-39,-40,-16,-86,-87,-88,-89,70,-96,-97,70,70,70,70,70,70,70,70,70,-38,-33,70,70,-108,70,70,70,70,70,70,70,-85,70,-27,-31,70,70,70,-75,70,-74,70,-31,70,70,70,-26,70,70,70,70,]),'RPAREN':([7,8,13,14,20,27,30,32,42,43,44,45,46,47,48,49,51,71,72,73,74,75,76,77,79,80,81,83,92,102,104,105,106,107,116,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,138,140,143,144,149,152,153,154,155,156,157,158,160,161,162,164,167,168,182,185,189,196,198,203,205,210,212,223,234,235,236,238,243,245,246,250,251,257,258,263,264,265,266,274,280,289,290,292,293,296,],[-7,-8,-13,-14,-106,-58,-107,-109,-17,-18,-19,-20,-21,-22,-23,-25,-4,-5,-6,-9,-10,-11,-12,-15,138,-110,-108,-34,-82,-28,-82,-111,-105,-112,-24,-39,-40,-16,-86,-87,-88,-89,-90,-96,-97,-98,-99,-100,-101,-102,-103,-104,-115,172,-38,-33,176,177,-71,185,-81,-91,-92,-93,-94,-95,-85,187,-27,189,192,193,206,-75,-74,-116,-31,222,-70,-80,-68,241,-26,-41,-44,-46,-69,259,-59,-79,-78,-67,268,-43,-45,-47,-48,-49,-42,-50,-51,-57,294,-56,]),'COLON':([20,24,27,30,31,32,42,43,44,45,46,47,48,49,80,81,83,85,102,105,106,107,116,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,138,140,154,155,156,157,158,160,162,170,176,177,185,189,196,198,231,234,248,272,286,287,288,],[-106,-110,-58,-107,-108,-109,-17,-18,-19,-20,-21,-22,-23,-25,-110,-108,-34,142,-28,-111,-105,-112,-24,-39,-40,-16,-86,-87,-88,-89,-90,-96,-97,-98,-99,-100,-101,-102,-103,-104,171,-38,-33,-91,-92,-93,-94,-95,-85,-27,-31,200,202,-75,-74,-116,-31,249,-26,260,142,291,-54,-55,]),'RBRACKET':([20,26,27,30,32,42,43,44,45,46,47,48,49,80,81,83,101,102,103,105,106,107,116,118,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,138,140,154,155,156,157,158,160,162,173,185,188,189,196,198,234,],[-106,102,-58,-107,-109,-17,-18,-19,-20,-21,-22,-23,-25,-110,-108,-34,162,-28,-30,-111,-105,-112,-24,170,-39,-40,-16,-86,-87,-88,-89,-90,-96,-97,-98,-99,-100,-101,-102,-103,-104,-115,-38,-33,-91,-92,-93,-94,-95,-85,-27,198,-75,-29,-74,-116,-31,-26,]),'COMMA':([20,27,30,32,42,43,44,45,46,47,48,49,80,81,82,83,84,92,101,102,103,104,105,106,107,116,119,120,121,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,138,140,149,152,153,154,155,156,157,158,160,162,164,169,174,175,182,185,188,189,196,198,205,210,234,243,292,293,296,],[-106,-58,-107,-109,-17,-18,-19,-20,-21,-22,-23,-25,-110,-108,141,-34,-36,-82,163,-28,-30,-82,-111,-105,-112,-24,-39,-40,-16,-86,-87,-88,-89,-90,-96,-97,-98,-99,-100,-101,-102,-103,-104,-115,-38,-33,-71,186,-81,-91,-92,-93,-94,-95,-85,-27,186,194,-35,-37,207,-75,-29,-74,-116,-31,-70,-80,-26,-69,-57,295,-56,]),'PLUSEQ':([24,80,],[93,93,]),'MINUSEQ':([24,80,],[94,94,]),'MULEQ':([24,80,],[95,95,]),'DIVEQ':([24,80,],[96,96,]),'MODEQ':([24,80,],[97,97,]),'EQUALS':([24,89,170,179,],[98,148,195,148,]),'DOT':([24,80,],[99,99,]),'IMPORT_LITERAL':([36,48,],[110,116,]),'AS':([110,],[166,]),'IN':([179,209,226,],[204,227,244,]),'CASE':([211,228,229,247,279,284,],[230,230,-61,-60,-63,-62,]),'DEFAULT':([211,228,229,247,279,284,],[231,231,-61,-60,-63,-62,]),'ELSE':([235,],[252,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'statements':([0,165,197,199,201,213,214,224,237,239,240,249,256,260,262,277,281,],[2,190,217,218,220,232,233,242,253,254,255,261,267,270,273,283,285,]),'statement':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[3,50,145,178,3,203,50,3,3,3,3,3,50,50,50,3,50,50,3,3,3,50,3,263,50,50,50,3,3,50,3,50,50,50,3,3,50,50,]),'expression':([0,2,17,18,26,28,29,35,41,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,78,86,87,88,92,93,94,95,96,97,98,100,104,139,141,142,145,148,163,165,171,178,186,190,195,197,199,201,204,213,214,217,218,220,224,227,230,232,233,237,239,240,242,244,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[4,4,79,85,103,105,106,109,115,118,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,143,144,4,153,154,155,156,157,158,159,161,153,173,85,175,4,180,188,4,196,4,210,4,216,4,4,4,223,4,4,4,4,4,4,245,248,4,4,4,4,4,4,258,4,4,4,4,4,4,4,4,272,4,4,4,4,4,4,4,]),'declaration':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,]),'assignment':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,]),'function_declaration':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,]),'module_declaration':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,]),'return_statement':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,]),'import_statement':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'emit_statement':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,]),'signal_declaration':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,]),'when_statement':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,]),'watch_statement':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,]),'throw_statement':([0,2,88,145,165,178,190,197,199,201,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,]),'type_specifier':([0,2,53,88,117,145,149,151,165,178,183,190,194,197,199,201,207,213,214,217,218,220,224,232,233,237,239,240,242,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[23,23,119,146,169,23,181,184,23,23,208,23,215,23,23,23,225,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,]),'dot_expression':([0,2,17,18,26,28,29,35,41,52,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,78,86,87,88,92,93,94,95,96,97,98,100,104,139,141,142,145,148,163,165,171,178,186,190,195,197,199,201,204,213,214,217,218,220,224,227,230,232,233,237,239,240,242,244,249,252,253,254,255,256,260,261,262,267,270,273,277,281,283,285,],[27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,]),'range_operator':([4,79,85,103,105,106,109,115,118,122,123,124,125,126,127,128,129,130,131,132,133,134,135,136,137,143,144,153,154,155,156,157,158,159,161,173,175,180,188,196,210,216,223,245,248,258,272,],[68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,]),'dict_elements':([18,262,],[82,82,]),'dict_element':([18,141,262,],[84,174,84,]),'list_elements':([26,],[101,]),'argument_list':([92,104,],[152,164,]),'parameter_list':([149,],[182,]),'case_clauses':([211,],[228,]),'case_clause':([211,228,],[229,247,]),'reduction_clauses':([259,268,],[269,275,]),'reduction_operator':([282,],[286,]),'reduction_names':([291,],[293,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> statements','program',1,'p_program','muni_parser.py',24),
+  ('statements -> statements statement','statements',2,'p_statements','muni_parser.py',28),
+  ('statements -> statement','statements',1,'p_statements','muni_parser.py',29),
+  ('statement -> expression SEMI','statement',2,'p_statement','muni_parser.py',39),
+  ('statement -> declaration SEMI','statement',2,'p_statement','muni_parser.py',40),
+  ('statement -> assignment SEMI','statement',2,'p_statement','muni_parser.py',41),
+  ('statement -> function_declaration','statement',1,'p_statement','muni_parser.py',42),
+  ('statement -> module_declaration','statement',1,'p_statement','muni_parser.py',43),
+  ('statement -> return_statement SEMI','statement',2,'p_statement','muni_parser.py',44),
+  ('statement -> import_statement SEMI','statement',2,'p_statement','muni_parser.py',45),
+  ('statement -> emit_statement SEMI','statement',2,'p_statement','muni_parser.py',46),
+  ('statement -> signal_declaration SEMI','statement',2,'p_statement','muni_parser.py',47),
+  ('statement -> when_statement','statement',1,'p_statement','muni_parser.py',48),
+  ('statement -> watch_statement','statement',1,'p_statement','muni_parser.py',49),
+  ('statement -> throw_statement SEMI','statement',2,'p_statement','muni_parser.py',50),
+  ('type_specifier -> BOOLEAN','type_specifier',1,'p_type_specifier','muni_parser.py',55),
+  ('type_specifier -> INT','type_specifier',1,'p_type_specifier','muni_parser.py',56),
+  ('type_specifier -> FLOAT','type_specifier',1,'p_type_specifier','muni_parser.py',57),
+  ('type_specifier -> COMPLEX','type_specifier',1,'p_type_specifier','muni_parser.py',58),
+  ('type_specifier -> STRING','type_specifier',1,'p_type_specifier','muni_parser.py',59),
+  ('type_specifier -> VOID','type_specifier',1,'p_type_specifier','muni_parser.py',60),
+  ('type_specifier -> UNTYPED','type_specifier',1,'p_type_specifier','muni_parser.py',61),
+  ('type_specifier -> LIST','type_specifier',1,'p_type_specifier','muni_parser.py',62),
+  ('type_specifier -> LIST IMPORT_LITERAL','type_specifier',2,'p_type_specifier','muni_parser.py',63),
+  ('type_specifier -> DICT','type_specifier',1,'p_type_specifier','muni_parser.py',64),
+  ('type_specifier -> DICT LT type_specifier COMMA type_specifier GT','type_specifier',6,'p_type_specifier','muni_parser.py',65),
+  ('expression -> LBRACKET list_elements RBRACKET','expression',3,'p_list_initialization','muni_parser.py',81),
+  ('expression -> LBRACKET RBRACKET','expression',2,'p_list_initialization','muni_parser.py',82),
+  ('list_elements -> list_elements COMMA expression','list_elements',3,'p_list_elements','muni_parser.py',89),
+  ('list_elements -> expression','list_elements',1,'p_list_elements','muni_parser.py',90),
+  ('expression -> expression LBRACKET expression RBRACKET','expression',4,'p_element_access','muni_parser.py',98),
+  ('assignment -> expression LBRACKET expression RBRACKET EQUALS expression','assignment',6,'p_element_assignment','muni_parser.py',102),
+  ('expression -> LBRACE dict_elements RBRACE','expression',3,'p_dict_initialization','muni_parser.py',106),
+  ('expression -> LBRACE RBRACE','expression',2,'p_dict_initialization','muni_parser.py',107),
+  ('dict_elements -> dict_elements COMMA dict_element','dict_elements',3,'p_dict_elements','muni_parser.py',114),
+  ('dict_elements -> dict_element','dict_elements',1,'p_dict_elements','muni_parser.py',115),
+  ('dict_element -> expression COLON expression','dict_element',3,'p_dict_element','muni_parser.py',123),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_paren','muni_parser.py',128),
+  ('expression -> expression RARROW type_specifier','expression',3,'p_casting','muni_parser.py',132),
+  ('expression -> expression RARROW IDENTIFIER','expression',3,'p_casting','muni_parser.py',133),
+  ('statement -> IF LPAREN expression RPAREN LBRACE statements RBRACE','statement',7,'p_if_statement','muni_parser.py',139),
+  ('statement -> IF LPAREN expression RPAREN LBRACE statements RBRACE ELSE LBRACE statements RBRACE','statement',11,'p_if_statement','muni_parser.py',140),
+  ('statement -> IF LPAREN expression RPAREN LBRACE statements RBRACE ELSE statement','statement',9,'p_if_statement','muni_parser.py',141),
+  ('statement -> WHILE LPAREN expression RPAREN LBRACE statements RBRACE','statement',7,'p_while_statement','muni_parser.py',151),
+  ('statement -> WHILE LPAREN expression RPAREN COLON NUMBER LBRACE statements RBRACE','statement',9,'p_while_statement','muni_parser.py',152),
+  ('statement -> UNTIL LPAREN expression RPAREN LBRACE statements RBRACE','statement',7,'p_until_statement','muni_parser.py',159),
+  ('statement -> UNTIL LPAREN expression RPAREN COLON NUMBER LBRACE statements RBRACE','statement',9,'p_until_statement','muni_parser.py',160),
+  ('statement -> FOR LPAREN statement statement statement RPAREN LBRACE statements RBRACE','statement',9,'p_for_loop','muni_parser.py',168),
+  ('statement -> FOR LPAREN type_specifier IDENTIFIER IN expression RPAREN LBRACE statements RBRACE','statement',10,'p_for_loop','muni_parser.py',169),
+  ('statement -> IDENTIFIER FOR LPAREN type_specifier IDENTIFIER IN expression RPAREN reduction_clauses LBRACE statements RBRACE','statement',12,'p_parallel_for_loop','muni_parser.py',176),
+  ('statement -> IDENTIFIER IDENTIFIER FOR LPAREN type_specifier IDENTIFIER IN expression RPAREN reduction_clauses LBRACE statements RBRACE','statement',13,'p_parallel_for_loop','muni_parser.py',177),
+  ('reduction_clauses -> reduction_clauses IDENTIFIER LPAREN reduction_operator COLON reduction_names RPAREN','reduction_clauses',7,'p_reduction_clauses','muni_parser.py',187),
+  ('reduction_clauses -> <empty>','reduction_clauses',0,'p_reduction_clauses','muni_parser.py',188),
+  ('reduction_operator -> PLUS','reduction_operator',1,'p_reduction_operator','muni_parser.py',197),
+  ('reduction_operator -> MUL','reduction_operator',1,'p_reduction_operator','muni_parser.py',198),
+  ('reduction_names -> reduction_names COMMA IDENTIFIER','reduction_names',3,'p_reduction_names','muni_parser.py',202),
+  ('reduction_names -> IDENTIFIER','reduction_names',1,'p_reduction_names','muni_parser.py',203),
+  ('expression -> dot_expression','expression',1,'p_d_expression','muni_parser.py',217),
+  ('statement -> SWITCH LPAREN expression RPAREN LBRACE case_clauses RBRACE','statement',7,'p_switch_statement','muni_parser.py',222),
+  ('case_clauses -> case_clauses case_clause','case_clauses',2,'p_case_clauses','muni_parser.py',229),
+  ('case_clauses -> case_clause','case_clauses',1,'p_case_clauses','muni_parser.py',230),
+  ('case_clause -> CASE expression COLON statements BREAK SEMI','case_clause',6,'p_case_clause','muni_parser.py',238),
+  ('case_clause -> DEFAULT COLON statements BREAK SEMI','case_clause',5,'p_default_clause','muni_parser.py',242),
+  ('declaration -> type_specifier IDENTIFIER EQUALS expression','declaration',4,'p_declaration','muni_parser.py',247),
+  ('declaration -> type_specifier IDENTIFIER','declaration',2,'p_declaration','muni_parser.py',248),
+  ('assignment -> IDENTIFIER EQUALS expression','assignment',3,'p_assignment','muni_parser.py',261),
+  ('function_declaration -> type_specifier IDENTIFIER LPAREN parameter_list RPAREN LBRACE statements RBRACE','function_declaration',8,'p_function_declaration','muni_parser.py',266),
+  ('module_declaration -> MODULE IDENTIFIER LBRACE statements RBRACE','module_declaration',5,'p_module_declaration','muni_parser.py',270),
+  ('parameter_list -> parameter_list COMMA type_specifier IDENTIFIER','parameter_list',4,'p_parameter_list','muni_parser.py',275),
+  ('parameter_list -> type_specifier IDENTIFIER','parameter_list',2,'p_parameter_list','muni_parser.py',276),
+  ('parameter_list -> <empty>','parameter_list',0,'p_parameter_list','muni_parser.py',277),
+  ('return_statement -> RETURN expression','return_statement',2,'p_return_statement','muni_parser.py',287),
+  ('return_statement -> RETURN','return_statement',1,'p_return_statement','muni_parser.py',288),
+  ('expression -> dot_expression LPAREN argument_list RPAREN','expression',4,'p_expression_function_call','muni_parser.py',296),
+  ('expression -> IDENTIFIER LPAREN argument_list RPAREN','expression',4,'p_expression_function_call','muni_parser.py',297),
+  ('signal_declaration -> SIGNAL IDENTIFIER','signal_declaration',2,'p_signal_declaration','muni_parser.py',301),
+  ('emit_statement -> EMIT IDENTIFIER','emit_statement',2,'p_emit_statement','muni_parser.py',305),
+  ('watch_statement -> WATCH LPAREN IDENTIFIER RPAREN LBRACE statements RBRACE','watch_statement',7,'p_watch_statement','muni_parser.py',309),
+  ('when_statement -> WHEN LPAREN IDENTIFIER RPAREN LBRACE statements RBRACE','when_statement',7,'p_when_statement','muni_parser.py',313),
+  ('argument_list -> argument_list COMMA expression','argument_list',3,'p_argument_list','muni_parser.py',317),
+  ('argument_list -> expression','argument_list',1,'p_argument_list','muni_parser.py',318),
+  ('argument_list -> <empty>','argument_list',0,'p_argument_list','muni_parser.py',319),
+  ('import_statement -> IMPORT IMPORT_LITERAL','import_statement',2,'p_import_statement','muni_parser.py',330),
+  ('import_statement -> IMPORT IMPORT_LITERAL AS IDENTIFIER','import_statement',4,'p_import_statement','muni_parser.py',331),
+  ('dot_expression -> IDENTIFIER DOT IDENTIFIER','dot_expression',3,'p_expression_dot','muni_parser.py',339),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','muni_parser.py',344),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','muni_parser.py',345),
+  ('expression -> expression MUL expression','expression',3,'p_expression_binop','muni_parser.py',346),
+  ('expression -> expression DIV expression','expression',3,'p_expression_binop','muni_parser.py',347),
+  ('expression -> expression MODULUS expression','expression',3,'p_expression_binop','muni_parser.py',348),
+  ('expression -> IDENTIFIER PLUSEQ expression','expression',3,'p_expression_assignment','muni_parser.py',352),
+  ('expression -> IDENTIFIER MINUSEQ expression','expression',3,'p_expression_assignment','muni_parser.py',353),
+  ('expression -> IDENTIFIER MULEQ expression','expression',3,'p_expression_assignment','muni_parser.py',354),
+  ('expression -> IDENTIFIER DIVEQ expression','expression',3,'p_expression_assignment','muni_parser.py',355),
+  ('expression -> IDENTIFIER MODEQ expression','expression',3,'p_expression_assignment','muni_parser.py',356),
+  ('expression -> expression AMPERSAND expression','expression',3,'p_expression_logical','muni_parser.py',361),
+  ('expression -> expression PIPE expression','expression',3,'p_expression_logical','muni_parser.py',362),
+  ('expression -> expression HAT expression','expression',3,'p_expression_logical','muni_parser.py',363),
+  ('expression -> expression GT expression','expression',3,'p_expression_comparison','muni_parser.py',367),
+  ('expression -> expression LT expression','expression',3,'p_expression_comparison','muni_parser.py',368),
+  ('expression -> expression EQ expression','expression',3,'p_expression_comparison','muni_parser.py',369),
+  ('expression -> expression GE expression','expression',3,'p_expression_comparison','muni_parser.py',370),
+  ('expression -> expression LE expression','expression',3,'p_expression_comparison','muni_parser.py',371),
+  ('expression -> expression NE expression','expression',3,'p_expression_comparison','muni_parser.py',372),
+  ('expression -> EXCLAMATION expression','expression',2,'p_expression_not','muni_parser.py',376),
+  ('expression -> NUMBER','expression',1,'p_expression_number','muni_parser.py',380),
+  ('expression -> IMAGINARY_NUMBER','expression',1,'p_expression_number','muni_parser.py',381),
+  ('expression -> BOOLEAN','expression',1,'p_expression_boolean','muni_parser.py',385),
+  ('expression -> STRING_LITERAL','expression',1,'p_expression_string','muni_parser.py',389),
+  ('expression -> IDENTIFIER','expression',1,'p_expression_identifier','muni_parser.py',393),
+  ('expression -> MINUS expression','expression',2,'p_expression_negative','muni_parser.py',397),
+  ('expression -> DOLLAR NUMBER','expression',2,'p_expression_argument','muni_parser.py',401),
+  ('range_operator -> RANGE_OP','range_operator',1,'p_range_operator','muni_parser.py',406),
+  ('range_operator -> RANGE_OP_INCLUSIVE','range_operator',1,'p_range_operator','muni_parser.py',407),
+  ('expression -> expression range_operator expression','expression',3,'p_expression_range','muni_parser.py',411),
+  ('expression -> expression range_operator expression COLON expression','expression',5,'p_expression_range','muni_parser.py',412),
+  ('throw_statement -> THROW expression','throw_statement',2,'p_throw_statement','muni_parser.py',432),
+]
@@ -0,0 +1,526 @@
+from muni_ast_nodes import *
+from muni_parser import precedence, p_error
+
+
+# PLY settles a shift/reduce conflict by comparing the precedence of the
+# lookahead token with the one of the rule being reduced, the precedence of
+# its rightmost terminal. Tokens missing from the precedence table, like the
+# comparisons, MODULUS, HAT, LBRACKET and the range operators, count as
+# ('right', 0) and so always shift: they bind loosest to their left and take
+# everything on their right. The parser below makes the same decisions, an
+# operand keeps taking operators whose level is at least its minimum.
+NO_PRECEDENCE = ('right', 0)
+
+levels = {}
+for level, (associativity, *names) in enumerate(precedence, start=1):
+    for name in names:
+        levels[name] = (associativity, level)
+
+
+def operand_minimum(rule_token):
+    """The lowest operator level the right operand of a rule still takes."""
+    associativity, level = levels.get(rule_token, NO_PRECEDENCE)
+    return level + 1 if associativity == 'left' else level
+
+binary_nodes = {}
+for name in ('PLUS', 'MINUS', 'MUL', 'DIV', 'MODULUS'):
+    binary_nodes[name] = BinaryOperation
+for name in ('AMPERSAND', 'PIPE', 'HAT'):
+    binary_nodes[name] = LogicalOperation
+for name in ('GT', 'LT', 'EQ', 'GE', 'LE', 'NE'):
+    binary_nodes[name] = ComparisonOperation
+
+operator_levels = {name: levels.get(name, NO_PRECEDENCE)[1]
+                   for name in list(binary_nodes) + ['LBRACKET', 'RARROW', 'RANGE_OP', 'RANGE_OP_INCLUSIVE']}
+operand_minimums = {name: operand_minimum(name) for name in list(binary_nodes) + ['MINUS', 'EXCLAMATION']}
+
+augmented_assignments = {'PLUSEQ', 'MINUSEQ', 'MULEQ', 'DIVEQ', 'MODEQ'}
+type_starts = {'BOOLEAN', 'INT', 'FLOAT', 'COMPLEX', 'STRING', 'VOID', 'UNTYPED', 'LIST', 'DICT'}
+block_ends = {'RBRACE', 'BREAK', '$end'}
+
+
+class ParseError(Exception):
+    def __init__(self, position):
+        super().__init__(position)
+        self.position = position
+
+
+class EndToken:
+    type = '$end'
+    value = None
+    lineno = 0
+
+
+class Parser:
+    """Hand-written recursive descent parser for the grammar of muni_parser.
+
+    Statements are parsed by recursive descent and expressions by precedence
+    climbing, building the same trees as the LALR parser, line numbers
+    included: like PLY, a node whose rule starts with a nonterminal gets
+    line 0. Syntax errors go through the same error function; the parser
+    then skips to the next semicolon and goes on with the next statement.
+
+    It also does the work of muni_resolver while building the nodes: the
+    parameters of a function are known before its body is parsed, so the
+    names referring to them get their frame slot right away.
+    """
+
+    def __init__(self, error=p_error):
+        self.error = error
+        self.tokens = []
+        self.types = []
+        self.position = 0
+        self.layout = None
+
+    def parse(self, content, lexer):
+        lexer.input(content)
+        self.load(list(lexer))
+        try:
+            return self.program()
+        finally:
+            self.load([])
+
+    def load(self, tokens):
+        # Two end markers, statements look one token ahead
+        self.tokens = tokens + [EndToken(), EndToken()]
+        self.types = [token.type for token in self.tokens]
+        self.position = 0
+        self.layout = None
+
+    def program(self):
+        statements = []
+        if self.types[0] == '$end':
+            self.error(None)
+            return None
+        while self.types[self.position] != '$end':
+            try:
+                statements.append(self.statement())
+            except ParseError as error:
+                self.recover(error.position)
+        return StatementList(statements=statements, lineno=0) if statements else None
+
+    def recover(self, position):
+        token = self.tokens[position]
+        self.error(token if token.type != '$end' else None)
+        types = self.types
+        while types[position] != '$end':
+            position += 1
+            if types[position - 1] == 'SEMI':
+                break
+        self.position = position
+
+    def address(self, name):
+        layout = self.layout
+        return (0, layout[name]) if layout and name in layout else None
+
+    def unresolved_block(self):
+        # Handler and module bodies do not run in the frame they are written in
+        layout = self.layout
+        self.layout = None
+        try:
+            return self.block()
+        finally:
+            self.layout = layout
+
+    def fail(self):
+        raise ParseError(self.position)
+
+    def expect(self, kind):
+        token = self.tokens[self.position]
+        if token.type != kind:
+            self.fail()
+        self.position += 1
+        return token
+
+    def accept(self, kind):
+        if self.types[self.position] == kind:
+            self.position += 1
+            return True
+        return False
+
+    # Statements
+
+    def statements(self):
+        statements = [self.statement()]
+        types = self.types
+        while types[self.position] not in block_ends:
+            statements.append(self.statement())
+        return statements
+
+    def block(self):
+        self.expect('LBRACE')
+        statements = self.statements()
+        self.expect('RBRACE')
+        return statements
+
+    def statement(self):
+        token = self.tokens[self.position]
+        kind = token.type
+        handler = self.statement_handlers.get(kind)
+        if handler is not None:
+            self.position += 1
+            return handler(self, token)
+        following = self.types[self.position + 1]
+        if kind == 'IDENTIFIER' and token.value == 'parallel' and (
+                following == 'FOR' or following == 'IDENTIFIER' and self.types[self.position + 2] == 'FOR'):
+            self.position += 1
+            return self.parallel_statement(token)
+        if kind in type_starts and (kind != 'BOOLEAN' or following == 'IDENTIFIER'):
+            return self.declaration()
+        if kind == 'IDENTIFIER' and following == 'EQUALS':
+            self.position += 2
+            node = Assignment(name=token.value, value=self.expression(), lineno=token.lineno, address=self.address(token.value))
+        else:
+            node = self.expression()
+            if (type(node) is ElementAccess and self.types[self.position] == 'EQUALS'
+                    and self.types[self.position - 1] == 'RBRACKET'):
+                self.position += 1
+                node = ElementAssignment(name=node.expression, index=node.index, value=self.expression(), lineno=0)
+        self.expect('SEMI')
+        return node
+
+    def declaration(self):
+        type_specifier = self.type_specifier()
+        name = self.expect('IDENTIFIER').value
+        if self.accept('LPAREN'):
+            parameters = self.parameters()
+            self.expect('RPAREN')
+            layout = self.layout
+            self.layout = {parameter: slot for slot, (_, parameter) in enumerate(parameters)}
+            try:
+                body = self.block()
+            finally:
+                self.layout = layout
+            return FunctionDeclaration(name=name, return_type=type_specifier, parameters=parameters, body=body, lineno=0)
+        value = self.expression() if self.accept('EQUALS') else None
+        self.expect('SEMI')
+        return Declaration(type_specifier=type_specifier, name=name, value=value, lineno=0, address=self.address(name))
+
+    def parameters(self):
+        parameters = []
+        if self.types[self.position] == 'RPAREN':
+            return parameters
+        while True:
+            type_specifier = self.type_specifier()
+            parameters.append((type_specifier, self.expect('IDENTIFIER').value))
+            if not self.accept('COMMA'):
+                return parameters
+
+    def type_specifier(self):
+        token = self.tokens[self.position]
+        if token.type not in type_starts:
+            self.fail()
+        self.position += 1
+        if token.type == 'LIST':
+            if self.types[self.position] == 'IMPORT_LITERAL':
+                return ('list', self.expect('IMPORT_LITERAL').value)
+            return ('list', 'UNTYPED')
+        if token.type == 'DICT':
+            if self.accept('LT'):
+                key_type = self.type_specifier()
+                self.expect('COMMA')
+                value_type = self.type_specifier()
+                self.expect('GT')
+                return ('dict', key_type, value_type)
+            return ('dict', 'UNTYPED', 'UNTYPED')
+        return token.value
+
+    def condition(self):
+        self.expect('LPAREN')
+        condition = self.expression()
+        self.expect('RPAREN')
+        return condition
+
+    def if_statement(self, token):
+        condition = self.condition()
+        true_block = self.block()
+        if not self.accept('ELSE'):
+            return IfStatement(condition=condition, true_block=true_block, lineno=token.lineno)
+        if self.types[self.position] != 'LBRACE':
+            false_block = self.statement()
+        else:
+            # `else {` opens either a block or a dict literal statement
+            start = self.position
+            try:
+                false_block = self.block()
+            except ParseError as block_error:
+                self.position = start
+                try:
+                    false_block = self.statement()
+                except ParseError as statement_error:
+                    raise max(block_error, statement_error, key=lambda error: error.position)
+        return IfElseStatement(condition=condition, true_block=true_block, false_block=false_block, lineno=token.lineno)
+
+    def loop_iterations(self):
+        if self.accept('COLON'):
+            return self.expect('NUMBER').value
+        return None
+
+    def while_statement(self, token):
+        condition = self.condition()
+        nb_iterations = self.loop_iterations()
+        if nb_iterations is None:
+            return WhileStatement(condition=condition, body=self.block(), lineno=token.lineno)
+        return WhileStatement(condition=condition, body=self.block(), nb_iterations=nb_iterations, lineno=token.lineno)
+
+    def until_statement(self, token):
+        condition = self.condition()
+        nb_iterations = self.loop_iterations()
+        if nb_iterations is None:
+            return UntilStatement(condition=condition, body=self.block(), lineno=token.lineno)
+        return UntilStatement(condition=condition, body=self.block(), nb_iterations=nb_iterations, lineno=token.lineno)
+
+    def for_statement(self, token):
+        self.expect('LPAREN')
+        start = self.position
+        if self.types[start] in type_starts:
+            # Only `type name in` tells a for-in loop from a declaration
+            try:
+                type_specifier = self.type_specifier()
+                identifier = self.expect('IDENTIFIER').value
+                for_in = self.accept('IN')
+            except ParseError:
+                for_in = False
+            if for_in:
+                iterable = self.expression()
+                self.expect('RPAREN')
+                return ForInStatement(type_specifier=type_specifier, identifier=identifier, iterable=iterable,
+                                      body=self.block(), lineno=token.lineno)
+            self.position = start
+        begin_statement = self.statement()
+        condition = self.statement()
+        end_statement = self.statement()
+        self.expect('RPAREN')
+        return ForStatement(begin_statement=begin_statement, condition=condition, end_statement=end_statement,
+                            body=self.block(), lineno=token.lineno)
+
+    def parallel_statement(self, token):
+        ordered = self.types[self.position] == 'IDENTIFIER'
+        if ordered:
+            self.expect_word('ordered')
+        self.expect('FOR')
+        self.expect('LPAREN')
+        type_specifier = self.type_specifier()
+        identifier = self.expect('IDENTIFIER').value
+        self.expect('IN')
+        iterable = self.expression()
+        self.expect('RPAREN')
+        reductions = []
+        while self.types[self.position] == 'IDENTIFIER':
+            self.expect_word('reduce')
+            self.expect('LPAREN')
+            if self.types[self.position] not in ('PLUS', 'MUL'):
+                self.fail()
+            operator = self.tokens[self.position].value
+            self.position += 1
+            self.expect('COLON')
+            names = [self.expect('IDENTIFIER').value]
+            while self.accept('COMMA'):
+                names.append(self.expect('IDENTIFIER').value)
+            self.expect('RPAREN')
+            reductions.extend((name, operator) for name in names)
+        # The body runs in other processes, not in the frame of the function
+        return ParallelForInStatement(type_specifier=type_specifier, identifier=identifier, iterable=iterable,
+                                      body=self.unresolved_block(), reductions=reductions, ordered=ordered,
+                                      lineno=token.lineno)
+
+    def expect_word(self, word):
+        # Reported like the LALR parser does, once the statement is complete
+        token = self.expect('IDENTIFIER')
+        if token.value != word:
+            self.error(token)
+
+    def switch_statement(self, token):
+        expression = self.condition()
+        self.expect('LBRACE')
+        cases = [self.case_clause()]
+        while self.types[self.position] != 'RBRACE':
+            cases.append(self.case_clause())
+        self.position += 1
+        return SwitchStatement(expression=expression, cases=cases, default_case=None, lineno=token.lineno)
+
+    def case_clause(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        if token.type == 'CASE':
+            value = self.expression()
+            self.expect('COLON')
+            clause = CaseClause(value=value, statements=self.statements(), lineno=token.lineno)
+        elif token.type == 'DEFAULT':
+            self.expect('COLON')
+            clause = DefaultClause(statements=self.statements(), lineno=token.lineno)
+        else:
+            self.position -= 1
+            self.fail()
+        self.expect('BREAK')
+        self.expect('SEMI')
+        return clause
+
+    def module_declaration(self, token):
+        name = self.expect('IDENTIFIER').value
+        return ModuleDeclaration(name=name, body=self.unresolved_block(), lineno=token.lineno)
+
+    def return_statement(self, token):
+        if self.types[self.position] == 'SEMI':
+            node = Return(value=None, lineno=token.lineno)
+        else:
+            node = Return(value=self.expression(), lineno=token.lineno)
+        self.expect('SEMI')
+        return node
+
+    def import_statement(self, token):
+        module_path = self.expect('IMPORT_LITERAL').value
+        if self.accept('AS'):
+            node = ImportStatement(module_path=module_path, as_name=self.expect('IDENTIFIER').value, lineno=token.lineno)
+        else:
+            node = ImportStatement(module_path=module_path, lineno=token.lineno)
+        self.expect('SEMI')
+        return node
+
+    def emit_statement(self, token):
+        node = EmitStatement(signal_name=self.expect('IDENTIFIER').value, lineno=token.lineno)
+        self.expect('SEMI')
+        return node
+
+    def signal_declaration(self, token):
+        node = SignalDeclaration(signal_name=self.expect('IDENTIFIER').value, lineno=token.lineno)
+        self.expect('SEMI')
+        return node
+
+    def throw_statement(self, token):
+        node = ThrowStatement(expression=self.expression(), lineno=token.lineno)
+        self.expect('SEMI')
+        return node
+
+    def handler_name(self):
+        self.expect('LPAREN')
+        name = self.expect('IDENTIFIER').value
+        self.expect('RPAREN')
+        return name
+
+    def watch_statement(self, token):
+        variable_name = self.handler_name()
+        return WatchStatement(variable_name=variable_name, statements=self.unresolved_block(), lineno=token.lineno)
+
+    def when_statement(self, token):
+        signal_name = self.handler_name()
+        return WhenStatement(signal_name=signal_name, statements=self.unresolved_block(), lineno=token.lineno)
+
+    statement_handlers = {
+        'IF': if_statement,
+        'WHILE': while_statement,
+        'UNTIL': until_statement,
+        'FOR': for_statement,
+        'SWITCH': switch_statement,
+        'MODULE': module_declaration,
+        'RETURN': return_statement,
+        'IMPORT': import_statement,
+        'EMIT': emit_statement,
+        'SIGNAL': signal_declaration,
+        'THROW': throw_statement,
+        'WATCH': watch_statement,
+        'WHEN': when_statement,
+    }
+
+    # Expressions
+
+    def expression(self, minimum=0):
+        left = self.operand()
+        tokens = self.tokens
+        types = self.types
+        while True:
+            kind = types[self.position]
+            level = operator_levels.get(kind)
+            if level is None or level < minimum:
+                return left
+            token = tokens[self.position]
+            self.position += 1
+            node_type = binary_nodes.get(kind)
+            if node_type is not None:
+                left = node_type(left=left, operator=token.value, right=self.expression(operand_minimums[kind]), lineno=0)
+            elif kind == 'LBRACKET':
+                index = self.expression()
+                self.expect('RBRACKET')
+                left = ElementAccess(expression=left, index=index, lineno=0)
+            elif kind == 'RARROW':
+                if types[self.position] == 'IDENTIFIER':
+                    to_type = tokens[self.position].value
+                    self.position += 1
+                else:
+                    to_type = self.type_specifier()
+                left = Cast(to_type=to_type, expression=left, lineno=0)
+            else:
+                end = self.expression()
+                step = self.expression() if self.accept('COLON') else 1
+                left = Range(left, end, step, inclusive=token.value == "...", lineno=0)
+
+    def operand(self):
+        token = self.tokens[self.position]
+        kind = token.type
+        self.position += 1
+        if kind == 'IDENTIFIER':
+            following = self.types[self.position]
+            if following == 'LPAREN':
+                return FunctionCall(name=token.value, arguments=self.arguments(), lineno=token.lineno)
+            if following == 'DOT':
+                self.position += 1
+                node = DotAccess(container=token.value, attribute=self.expect('IDENTIFIER').value, lineno=token.lineno)
+                if self.types[self.position] == 'LPAREN':
+                    return FunctionCall(name=node, arguments=self.arguments(), lineno=0)
+                return node
+            if following in augmented_assignments:
+                operator = self.tokens[self.position].value
+                self.position += 1
+                return ExpressionAssignment(name=token.value, operator=operator, value=self.expression(),
+                                            lineno=token.lineno, address=self.address(token.value))
+            return Variable(name=token.value, lineno=token.lineno, address=self.address(token.value))
+        if kind == 'NUMBER' or kind == 'IMAGINARY_NUMBER':
+            return Number(value=token.value, lineno=token.lineno)
+        if kind == 'STRING_LITERAL':
+            return String(value=token.value, lineno=token.lineno)
+        if kind == 'BOOLEAN':
+            return Boolean(value=token.value, lineno=token.lineno)
+        if kind == 'LPAREN':
+            node = self.expression()
+            self.expect('RPAREN')
+            return node
+        if kind == 'LBRACKET':
+            elements = []
+            if not self.accept('RBRACKET'):
+                elements.append(self.expression())
+                while self.accept('COMMA'):
+                    elements.append(self.expression())
+                self.expect('RBRACKET')
+            return ListInitialization(elements=elements, lineno=token.lineno)
+        if kind == 'LBRACE':
+            elements = {}
+            if not self.accept('RBRACE'):
+                while True:
+                    key = self.expression()
+                    self.expect('COLON')
+                    elements[key] = self.expression()
+                    if not self.accept('COMMA'):
+                        break
+                self.expect('RBRACE')
+            return DictInitialization(elements=elements, lineno=token.lineno)
+        if kind == 'EXCLAMATION':
+            return NotOperation(operand=self.expression(operand_minimums['EXCLAMATION']), lineno=token.lineno)
+        if kind == 'MINUS':
+            return UnaryOperation(operand=self.expression(operand_minimums['MINUS']), lineno=token.lineno)
+        if kind == 'DOLLAR':
+            return ArgumentGet(index=self.expect('NUMBER').value, lineno=token.lineno)
+        self.position -= 1
+        self.fail()
+
+    def arguments(self):
+        self.expect('LPAREN')
+        arguments = []
+        if not self.accept('RPAREN'):
+            arguments.append(self.expression())
+            while self.accept('COMMA'):
+                arguments.append(self.expression())
+            self.expect('RPAREN')
+        return arguments
+
+
+parser = Parser()
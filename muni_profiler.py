@@ -0,0 +1,185 @@
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from muni_ast_nodes import DotAccess, FunctionCall
+
+
+class ProfileStats:
+    def __init__(self):
+        self.hits = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+
+    def merge(self, other):
+        self.hits += other.hits
+        self.inclusive += other.inclusive
+        self.exclusive += other.exclusive
+
+
+class ThreadProfile:
+    """What a profiler measured on one thread, the program's or a handler's."""
+
+    def __init__(self):
+        self.lines = defaultdict(ProfileStats)
+        self.nodes = defaultdict(ProfileStats)
+        self.functions = defaultdict(ProfileStats)
+        # Exclusive seconds by stack of Muni functions and line
+        self.stacks = defaultdict(float)
+        # [line, started, time in children, call, depth] per node being
+        # evaluated, call is the node when it calls a Muni function
+        self.frames = []
+        # The line last run at each depth of calls, a line is hit when the
+        # one before it at its depth was another
+        self.last_lines = [None]
+        self.calls = ['<program>']
+        # What is on the stack, a recursive call only adds its inclusive
+        # time once, when the outermost one ends
+        self.active = Counter()
+
+
+class Profiler:
+    """Times every node a runtime evaluates, by source line, node type and Muni function.
+
+    A node's inclusive time runs from the start to the end of its
+    evaluation, its exclusive time leaves out the nodes evaluated under it.
+    A line is hit when a node starts on it after nodes of another line,
+    like the lines of a loop on every iteration, and a function is hit
+    when it is called. Runtimes only go through the
+    profiler when one is set, see Runtime.set_profiler.
+    """
+
+    def __init__(self, runtime, clock=time.perf_counter):
+        self.runtime = runtime
+        self.clock = clock
+        self.local = threading.local()
+        self.threads = []
+        self.lock = threading.Lock()
+        self.started = clock()
+
+    def thread_profile(self):
+        profile = getattr(self.local, 'profile', None)
+        if profile is None:
+            profile = self.local.profile = ThreadProfile()
+            with self.lock:
+                self.threads.append(profile)
+        return profile
+
+    def called_function(self, node):
+        if type(node) is not FunctionCall:
+            return None
+        name = node.name
+        if isinstance(name, DotAccess):
+            name = f"{name.container}.{name.attribute}"
+        function = self.runtime.functions.get(name)
+        # Python functions are nodes of their caller
+        if function is None or callable(function):
+            return None
+        return name
+
+    def measure(self, node, run, *args):
+        """Call run(*args), the evaluation of node, and record how long it took."""
+        profile = self.thread_profile()
+        frames = profile.frames
+        active = profile.active
+        node_type = type(node).__name__
+        depth = 0
+        if frames:
+            parent = frames[-1]
+            depth = parent[4]
+            # The body of a called function runs a level deeper, its arguments in the caller
+            if parent[3] is not None and not any(node is argument for argument in parent[3].arguments):
+                depth += 1
+        # Expressions the parser gave no line to are part of the line they are on
+        line = getattr(node, 'lineno', None) or (frames[-1][0] if frames else None)
+        if line is not None:
+            if profile.last_lines[depth] != line:
+                profile.last_lines[depth] = line
+                profile.lines[line].hits += 1
+            active['line', line] += 1
+        function = self.called_function(node)
+        if function is not None:
+            profile.functions[function].hits += 1
+            profile.calls.append(function)
+            profile.last_lines.append(None)
+            active['function', function] += 1
+        profile.nodes[node_type].hits += 1
+        active['node', node_type] += 1
+        frame = [line, self.clock(), 0.0, node if function is not None else None, depth]
+        frames.append(frame)
+        try:
+            return run(*args)
+        finally:
+            elapsed = self.clock() - frame[1]
+            exclusive = elapsed - frame[2]
+            frames.pop()
+            if frames:
+                frames[-1][2] += elapsed
+            self.record(profile, profile.nodes[node_type], ('node', node_type), elapsed, exclusive)
+            if line is not None:
+                self.record(profile, profile.lines[line], ('line', line), elapsed, exclusive)
+            profile.stacks[tuple(profile.calls), line] += exclusive
+            caller = profile.calls[-1]
+            if function is not None:
+                profile.calls.pop()
+                profile.last_lines.pop()
+                self.record(profile, profile.functions[function], ('function', function), elapsed, exclusive)
+            elif caller in profile.functions:
+                profile.functions[caller].exclusive += exclusive
+
+    def record(self, profile, stats, key, elapsed, exclusive):
+        active = profile.active
+        active[key] -= 1
+        if not active[key]:
+            stats.inclusive += elapsed
+        stats.exclusive += exclusive
+
+    def wrap(self, node, closure):
+        """The closure of a node, measured."""
+        measure = self.measure
+
+        def profiled(*args):
+            return measure(node, closure, *args)
+        return profiled
+
+    def merged(self):
+        lines = defaultdict(ProfileStats)
+        nodes = defaultdict(ProfileStats)
+        functions = defaultdict(ProfileStats)
+        stacks = defaultdict(float)
+        with self.lock:
+            threads = list(self.threads)
+        for profile in threads:
+            for merged, measured in ((lines, profile.lines), (nodes, profile.nodes), (functions, profile.functions)):
+                for key, stats in measured.items():
+                    merged[key].merge(stats)
+            for key, seconds in profile.stacks.items():
+                stacks[key] += seconds
+        return lines, nodes, functions, stacks
+
+    def report(self, limit=20, file=sys.stderr):
+        """Print the lines, node types and functions that cost the most exclusive time."""
+        lines, nodes, functions, _ = self.merged()
+        print(f"Profile, {self.clock() - self.started:.3f} s in total:", file=file)
+        for title, table in (("Lines", {f"line {line}": stats for line, stats in lines.items()}),
+                             ("Node types", nodes),
+                             ("Functions", functions)):
+            print(f"  {title:<24}{'hits':>10}{'inclusive':>14}{'exclusive':>14}", file=file)
+            ranked = sorted(table.items(), key=lambda item: item[1].exclusive, reverse=True)
+            for name, stats in ranked[:limit]:
+                print(f"  {name:<24}{stats.hits:>10}{stats.inclusive * 1000:>11.3f} ms{stats.exclusive * 1000:>11.3f} ms", file=file)
+            if len(ranked) > limit:
+                print(f"  ... {len(ranked) - limit} more", file=file)
+
+    def write_collapsed(self, path):
+        """Write the stacks of Muni functions, ending with a line, in the collapsed format of flamegraph.pl and speedscope.
+
+        Each stack is followed by its exclusive time in microseconds.
+        """
+        _, _, _, stacks = self.merged()
+        with open(path, 'w') as file:
+            for (calls, line), seconds in sorted(stacks.items(), key=lambda item: (item[0][0], item[0][1] or 0)):
+                microseconds = round(seconds * 1e6)
+                if microseconds:
+                    frames = calls if line is None else calls + (f"line {line}",)
+                    file.write(f"{';'.join(frames)} {microseconds}\n")
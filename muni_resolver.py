@@ -0,0 +1,46 @@
+from muni_ast_nodes import *
+
+
+class Resolver:
+    """Annotates variable nodes with the frame slot they resolve to.
+
+    Muni scopes are dynamic: a declaration updates any visible variable of
+    the same name, and a function sees its caller's variables. The only
+    names whose location is known before running are the parameters of the
+    enclosing function, which are always bound in the call's own frame.
+    Those get an address of (depth, slot), with depth 0 being the innermost
+    frame. Everything else keeps address None and is looked up by name.
+
+    Handler bodies (when/watch), module bodies and parallel loops run outside
+    the frame of the function they are written in, so they are left
+    unresolved.
+    """
+
+    def resolve(self, node):
+        self.visit(node, None)
+        return node
+
+    def visit(self, node, layout):
+        if isinstance(node, (list, tuple)):
+            for item in node:
+                self.visit(item, layout)
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                self.visit(key, layout)
+                self.visit(value, layout)
+        elif isinstance(node, FunctionDeclaration):
+            names = [param_name for _, param_name in node.parameters]
+            self.visit(node.body, {name: slot for slot, name in enumerate(names)})
+        elif isinstance(node, (WhenStatement, WatchStatement, ModuleDeclaration, ParallelForInStatement)):
+            for child in vars(node).values():
+                self.visit(child, None)
+        elif isinstance(node, AstNode):
+            if isinstance(node, (Variable, Assignment, Declaration, ExpressionAssignment)):
+                if layout is not None and node.name in layout:
+                    node.address = (0, layout[node.name])
+            for child in vars(node).values():
+                self.visit(child, layout)
+
+
+def resolve(ast):
+    return Resolver().resolve(ast)
@@ -6,8 +6,10 @@ import importlib.util
 import os
 import sys
 import muni_parser 
-import threading
 from muni_context_manager import ContextManager
+from muni_vector import elementwise
+from muni_modules import ModuleRegistry, ModuleExports
+from muni_scheduler import HandlerScheduler
 
 
 class ReturnException(Exception):
@@ -15,24 +17,137 @@ class ReturnException(Exception):
         self.value = value
 
 
+class Function:
+    """A declared Muni function, shared by every call instead of being copied.
+
+    Parameters and body are frozen into tuples when the function is defined,
+    so a call only has to bind its arguments in a fresh scope.
+    """
+    __slots__ = ('name', 'return_type', 'parameters', 'parameter_names', 'layout', 'body', 'lineno', 'declaration')
+
+    def __init__(self, declaration):
+        self.name = declaration.name
+        self.return_type = declaration.return_type
+        self.parameters = tuple((param_type, param_name) for param_type, param_name in declaration.parameters)
+        self.parameter_names = tuple(param_name for _, param_name in self.parameters)
+        self.layout = {name: slot for slot, name in enumerate(self.parameter_names)}
+        self.body = tuple(declaration.body)
+        self.lineno = declaration.lineno
+        self.declaration = declaration
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"Function attribute '{name}' is read-only")
+        super().__setattr__(name, value)
+
+    def __str__(self):
+        params = ", ".join([f"{ptype} {pname}" for ptype, pname in self.parameters])
+        return f"Function(name={self.name}, return_type={self.return_type}, params=[{params}])"
+
+
+UNBOUND = object()
+
+
+class Frame(dict):
+    """The scope of a function call.
+
+    It is a regular scope dict, but the parameters of the function are also
+    mirrored in `slots`, so resolved variables (see muni_resolver) are read
+    by index instead of by walking every scope.
+    """
+    __slots__ = ('names', 'layout', 'slots')
+
+    def __init__(self, function):
+        super().__init__()
+        self.names = function.parameter_names
+        self.layout = function.layout
+        self.slots = [UNBOUND] * len(self.names)
+
+    def __setitem__(self, name, value):
+        super().__setitem__(name, value)
+        slot = self.layout.get(name)
+        if slot is not None:
+            self.slots[slot] = value
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        slot = self.layout.get(name)
+        if slot is not None:
+            self.slots[slot] = UNBOUND
+
+    def load(self, name, slot):
+        # A slot only answers for the function it was resolved against
+        names = self.names
+        if slot < len(names) and names[slot] == name:
+            return self.slots[slot]
+        return UNBOUND
+
+
 class Runtime:
-    def __init__(self):
+    def __init__(self, module_registry=None):
         self.context = ContextManager()
+        # The line being run, what errors raised while running it report
+        self.lineno = None
+        # The error that stopped the program
+        self.error = None
         self.context.set_runtime(self)
         self.scopes = [{}]
         self.functions = {}
         self.modules = {}
         self.imported_functions = []
         self.signals = {}
+        # Watchers by the id of the value they watch
         self.watched = {}
+        # Watch bodies waiting for the end of the iteration or statement
+        self.coalesce_watches = False
+        self.pending_watches = {}
+        # Processes running parallel loops, None for one per CPU
+        self.parallel_workers = None
+        self.profiler = None
         self.is_running = True
+        self.vectorize = False
         self.module = None
-        self.lineno = 0
+        self.module_registry = module_registry if module_registry is not None else ModuleRegistry()
+        # The registry keys of the files imported into this runtime
+        self.imported_files = set()
+        self.scheduler = HandlerScheduler()
         self.register_stdlib_functions()
 
+    def set_lineno(self, lineno):
+        self.lineno = lineno
+
     def set_args(self, args):
         self.args = args
 
+    def set_scheduler(self, scheduler):
+        # Signal and watch handlers run on this scheduler, see muni_scheduler
+        self.scheduler = scheduler
+
+    def set_coalesce_watches(self, coalesce):
+        # A watch body runs once for all the changes made during a loop
+        # iteration or a top-level statement, instead of once per change
+        self.coalesce_watches = coalesce
+
+    def set_profiler(self, profiler):
+        # Evaluations only go through the profiler of a profiled runtime,
+        # the recursive calls of evaluate find it on the instance
+        self.profiler = profiler
+        evaluate = Runtime.evaluate.__get__(self)
+        measure = profiler.measure
+        self.evaluate = lambda node, debug=False: measure(node, evaluate, node, debug)
+
+    def set_parallel_workers(self, workers):
+        self.parallel_workers = workers
+
+    def run_parallel_for(self, node, iterable):
+        # multiprocessing is only imported by the programs with parallel loops
+        import muni_parallel
+        return muni_parallel.run_parallel_for(self, node, iterable)
+
+    def set_vectorize(self, vectorize):
+        # In vectorized mode arithmetic and comparisons involving lists work item by item
+        self.vectorize = vectorize
+
     def get_args(self):
         return self.args
     
@@ -42,6 +157,8 @@ class Runtime:
         return Muni_String(self.args[index])
 
     def define_function(self, func):
+        if not isinstance(func, Function):
+            func = Function(func)
         if self.module is not None:
             self.functions[f"{self.module}.{func.name}"] = func
         self.functions[func.name] = func
@@ -55,8 +172,8 @@ class Runtime:
         self.module = None
         self.pop_scope()
 
-    def push_scope(self):
-        self.scopes.append({})
+    def push_scope(self, scope=None):
+        self.scopes.append({} if scope is None else scope)
 
     def pop_scope(self):
         self.scopes.pop()
@@ -70,12 +187,13 @@ class Runtime:
     def current_scope(self):
         return self.scopes[-1]
 
-    def define_variable(self, name, value, type_specifier="void", force_new_scope=False):
+    def define_variable(self, name, value, type_specifier="void", force_new_scope=False, address=None):
 
         if isinstance(value, Muni_Type):
             value = value.copy()
         
-        if force_new_scope or not self.is_variable(name):
+        scope = None if force_new_scope else self.find_scope(name, address)
+        if scope is None:
             
             if type_specifier != "?":
                 value = self.perform_cast(type_specifier, value)
@@ -85,17 +203,38 @@ class Runtime:
             if type_specifier != "?":
                 value = self.perform_cast(type_specifier, value)
             try:
-                self.scopes[self.get_scope(name)][name].value = value.value
+                scope[name].value = value.value
             except:
-                self.scopes[self.get_scope(name)][name] = value
+                scope[name] = value
         
 
-    def get_variable(self, name):
+    def load_slot(self, name, address):
+        depth, slot = address
+        if depth >= len(self.scopes):
+            return UNBOUND
+        frame = self.scopes[-1 - depth]
+        if type(frame) is Frame:
+            return frame.load(name, slot)
+        return UNBOUND
+
+    def get_variable(self, name, address=None):
+        if address is not None:
+            value = self.load_slot(name, address)
+            if value is not UNBOUND:
+                return value
         for scope in reversed(self.scopes):
             if name in scope:
                 return scope[name]
         raise Muni_Error(f"Variable '{name}' not found")
 
+    def find_scope(self, name, address=None):
+        if address is not None and self.load_slot(name, address) is not UNBOUND:
+            return self.scopes[-1 - address[0]]
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope
+        return None
+
     def get_scope(self, name):
         for i, scope in enumerate(reversed(self.scopes)):
             if name in scope:
@@ -135,40 +274,48 @@ class Runtime:
         if signal_name not in self.signals:
             raise Muni_Error(f"Signal Error: {signal_name} not a signal.")
         
-        for statements in self.signals[signal_name]:
-            thread = threading.Thread(target=self.evaluate_block, args=(statements,))
-            thread.start()
+        for statements in self.signals[signal_name] or ():
+            self.scheduler.submit(self.run_handler, statements)
 
 
     def assign_watching(self, var_name, body):
         if not self.is_variable(var_name):
             raise Muni_Error(f"Variable Error: {var_name} not a variable.")
         var_id = self.get_variable(var_name).id
-        if not self.is_watched(var_name):
-            self.watched[var_id] = []
+        self.watched.setdefault(var_id, []).append({"scope": self.get_scope(var_name), "body": body})
 
-        self.watched[var_id].append({"scope": self.get_scope(var_name), "body": body})
+    def is_watched(self, var_name, address=None):
+        if not self.watched:
+            return False
+        return getattr(self.get_variable(var_name, address), "id", None) in self.watched
 
-    def is_watched(self, var_name):
-        if not self.is_variable(var_name):
-            raise Muni_Error(f"Variable Error: {var_name} not a variable.")
-        return self.get_variable(var_name).id in self.watched
-    
-    def execute_watch(self, var_name):
-        if not self.is_variable(var_name):
-            raise Muni_Error(f"Variable Error: {var_name} not a variable.")
-        
-        if not self.is_watched(var_name):
+    def execute_watch(self, var_name, address=None):
+        # Only called once the program has watchers, the assignments do not
+        # look the variable up again otherwise
+        watchers = self.watched.get(getattr(self.get_variable(var_name, address), "id", None))
+        if watchers is None:
             return
-
-        var_id = self.get_variable(var_name).id
-        
-        for d_statements in self.watched[var_id]:
-            if d_statements["scope"] != self.get_scope(var_name):
+        scope = self.get_scope(var_name)
+        for watcher in watchers:
+            if watcher["scope"] != scope:
                 continue
-            statements = d_statements["body"]
-            thread = threading.Thread(target=self.evaluate_block, args=(statements,))
-            thread.start()
+            if self.coalesce_watches:
+                self.pending_watches[id(watcher["body"])] = watcher["body"]
+            else:
+                self.scheduler.submit(self.run_handler, watcher["body"])
+
+    def flush_watches(self):
+        if not self.pending_watches:
+            return
+        pending, self.pending_watches = self.pending_watches, {}
+        for body in pending.values():
+            self.scheduler.submit(self.run_handler, body)
+
+    def run_handler(self, statements):
+        # Handlers run on threads of their own
+        self.context.set_runtime(self)
+        self.evaluate_block(statements)
+        self.flush_watches()
 
 
     
@@ -177,48 +324,31 @@ class Runtime:
         if not self.is_running:
             return
         try:
-            self.context.set_lineno(node.lineno)
+            self.lineno = node.lineno
         except:
             pass
         try:
             if isinstance(node, (Number, Boolean, String)):
                 return node.value
+
+            elif isinstance(node, Constant):
+                return node.value.copy()
             
             elif isinstance(node, Variable):
-                return self.get_variable(node.name)
+                return self.get_variable(node.name, node.address)
 
             elif isinstance(node, DotAccess):
                 return self.evaluate(self.modules[node.container.name][node.attribute])
             
             elif isinstance(node, Declaration):
                 value = self.evaluate(node.value)
-                self.define_variable(node.name, value, node.type_specifier)
+                self.define_variable(node.name, value, node.type_specifier, address=node.address)
 
             elif isinstance(node, Assignment):
-                value = self.evaluate(node.value)
-                var_type = type(self.get_variable(node.name))
-                if var_type != "UNTYPED":
-                    self.check_type(var_type, value)
-                try:
-                    self.define_variable(node.name, value, str(value.symbol()))
-                except Exception as e:
-                    self.define_variable(node.name, value, str(type(value).symbol()))
-                
-                if(self.is_watched(node.name)):
-                    self.execute_watch(node.name)
+                self.assign_variable(node.name, self.evaluate(node.value), node.address)
 
             elif isinstance(node, ExpressionAssignment): # a += 1, a -= 1, a /=1 ...
-                value = self.evaluate(node.value)
-                variable = self.get_variable(node.name)
-                try:
-                    symbol = type(variable).symbol()
-                except Exception as e:
-                    symbol = variable.symbol()
-                self.define_variable(node.name, self.apply_binary_operator(variable, value, node.operator[:-1]), str(symbol))
-                if(self.is_watched(node.name)):
-                    self.execute_watch(node.name)
-
-                
+                self.update_variable(node.name, node.operator, self.evaluate(node.value), node.address)
 
 
             # Handle BinaryOperation nodes
@@ -288,7 +418,7 @@ class Runtime:
             elif isinstance(node, IfStatement):
                 condition_value = self.evaluate(node.condition)
                 if condition_value:
-                    return self.evaluate_block(node.true_block)
+                    self.evaluate_block(node.true_block)
                 return Muni_Void()
 
             elif isinstance(node, IfElseStatement):
@@ -302,31 +432,45 @@ class Runtime:
             elif isinstance(node, WhileStatement):
                 for i in range(int(node.nb_iterations)):
                     self.evaluate_block(node.body)
+                    self.flush_watches()
+                    if not self.is_running:
+                        return
                 while self.evaluate(node.condition):
                     self.evaluate_block(node.body)
+                    self.flush_watches()
                 return Muni_Void()
             
             elif isinstance(node, UntilStatement):
                 for i in range(int(node.nb_iterations)):
                     self.evaluate_block(node.body)
+                    self.flush_watches()
+                    if not self.is_running:
+                        return
                 while not self.evaluate(node.condition):
                     self.evaluate_block(node.body)
+                    self.flush_watches()
                 return Muni_Void()
             
             elif isinstance(node, ForInStatement):
                 iterable = self.evaluate(node.iterable)
                 for value in iterable:
-                    self.check_type(node.type_specifier, value)
-                    self.remove_variable(node.identifier)
-                    self.define_variable(node.identifier, value, node.type_specifier)
+                    self.bind_loop_variable(node.identifier, value, node.type_specifier)
                     self.evaluate_block(node.body)
+                    self.flush_watches()
+                    # An error ends the program, there is no condition to turn false
+                    if not self.is_running:
+                        return
                 return Muni_Void()
             
+            elif isinstance(node, ParallelForInStatement):
+                return self.run_parallel_for(node, self.evaluate(node.iterable))
+
             elif isinstance(node, ForStatement):
                 self.evaluate(node.begin_statement)
                 while self.evaluate(node.condition):
                     self.evaluate_block(node.body)
                     self.evaluate(node.end_statement)
+                    self.flush_watches()
                 return Muni_Void()
             
             elif isinstance(node, SwitchStatement):
@@ -364,11 +508,11 @@ class Runtime:
                 return Muni_Void()
 
             elif isinstance(node, ListInitialization):
-                values = [self.evaluate(val) for val in node.elements]
+                values = [copy_value(self.evaluate(val)) for val in node.elements]
                 return Muni_List(values)
             
             elif isinstance(node, DictInitialization):
-                elements = {self.evaluate(key): self.evaluate(value) for key, value in node.elements.items()}
+                elements = {copy_value(self.evaluate(key)): copy_value(self.evaluate(value)) for key, value in node.elements.items()}
                 return Muni_Dict(elements)
 
             elif isinstance(node, ElementAccess):
@@ -380,17 +524,14 @@ class Runtime:
                 obj = self.evaluate(node.name)
                 index = self.evaluate(node.index)
                 value = self.evaluate(node.value)
-                obj.set_item(index, value)
-                self.define_variable(node.name.name, obj, "?") #TODO check type for dicts
-                if(self.is_watched(node.name)):
-                    self.execute_watch(node.name)
+                self.assign_element(node.name, obj, index, value)
                 return Muni_Void()
 
             elif isinstance(node, Range):
                 start = self.evaluate(node.start)
                 end = self.evaluate(node.end)
                 step = self.evaluate(node.step)
-                return Muni_List([Muni_Int(x) for x in list(range(int(start), int(end) + node.inclusive * (-1)**(int(step)<=0), int(step)))], "INT")
+                return self.make_range(start, end, step, node.inclusive)
 
             elif isinstance(node, ThrowStatement):
                 raise Muni_Error(self.evaluate(node.expression))
@@ -421,9 +562,51 @@ class Runtime:
                 raise Muni_Error(f"Unknown node type: {type(node)}")
         except Muni_Error as error:
             print(error)
+            self.error = error
             self.is_running = False 
 
+    def assign_variable(self, name, value, address=None):
+        var_type = type(self.get_variable(name, address))
+        if var_type != "UNTYPED":
+            self.check_type(var_type, value)
+        try:
+            self.define_variable(name, value, str(value.symbol()), address=address)
+        except Exception as e:
+            self.define_variable(name, value, str(type(value).symbol()), address=address)
+
+        if self.watched:
+            self.execute_watch(name, address)
+
+    def update_variable(self, name, operator, value, address=None):
+        variable = self.get_variable(name, address)
+        try:
+            symbol = type(variable).symbol()
+        except Exception as e:
+            symbol = variable.symbol()
+        self.define_variable(name, self.apply_binary_operator(variable, value, operator[:-1]), str(symbol), address=address)
+        if self.watched:
+            self.execute_watch(name, address)
+
+    def assign_element(self, target, obj, index, value):
+        obj.set_item(index, value)
+        # target is the expression holding obj, a[0] of a[0][1] = 2 changes a
+        # in place but only a variable is watched
+        if isinstance(target, Variable):
+            self.define_variable(target.name, obj, "?", address=target.address) #TODO check type for dicts
+            if self.watched:
+                self.execute_watch(target.name, target.address)
+
+    def bind_loop_variable(self, name, value, type_specifier):
+        self.check_type(type_specifier, value)
+        self.remove_variable(name)
+        self.define_variable(name, value, type_specifier)
+
+    def make_range(self, start, end, step, inclusive):
+        return Muni_Range(int(start), int(end) + inclusive * (-1)**(int(step)<=0), int(step))
+
     def apply_binary_operator(self, left, right, operator):
+        if self.vectorize and (isinstance(left, Muni_List) or isinstance(right, Muni_List)):
+            return elementwise(left, right, operator)
         
         if operator == '+':
             return left + right
@@ -452,6 +635,8 @@ class Runtime:
             raise Muni_Error(f"Unknown logical operator: {operator}")
     
     def apply_comparison_operator(self, left, right, operator):
+        if self.vectorize and (isinstance(left, Muni_List) or isinstance(right, Muni_List)):
+            return elementwise(left, right, operator)
         if operator == '>':
             return left > right
         elif operator == '<':
@@ -485,27 +670,36 @@ class Runtime:
         return self.functions.get(name, None)
 
     def call_function(self, function, arguments):
+        # Arguments are evaluated in the caller's scope, before the call frame exists
+        values = [self.evaluate(arg) for arg in arguments]
 
-        # Push a new scope
-        stable_function = deepcopy(self.functions[function.name])
-        self.push_scope()
-
-        # Assign arguments to parameters in the new scope
-        for (param_type, param_name), arg in zip(function.parameters, arguments):
-            arg = self.evaluate(arg)
-            self.define_variable(param_name, self.evaluate(arg), param_type, force_new_scope=True)
-
-        # Execute each statement in the function body
-        try: 
+        # Declarations in the body may shadow the function, restore it afterwards
+        stable_function = self.functions[function.name]
+        self.push_scope(Frame(function))
+        try:
+            self.bind_parameters(function, values)
             result = None
             for stmt in function.body:
                 self.evaluate(stmt)
         except ReturnException as e:
             result = e.value
         finally:
-            # Pop the scope
             self.pop_scope()
             self.functions[function.name] = stable_function
+        return self.function_result(result)
+
+    def bind_parameters(self, function, values):
+        scope = self.current_scope()
+        for (param_type, param_name), value in zip(function.parameters, values):
+            # An int passed to an int parameter needs no cast, only its own copy
+            if param_type == 'int' and type(value) is Muni_Int:
+                scope[param_name] = value.copy()
+            else:
+                self.define_variable(param_name, value, param_type, force_new_scope=True)
+
+    def function_result(self, result):
+        if isinstance(result, Muni_Type):
+            return result
         return self.evaluate(result)
     
     def register_stdlib_functions(self):
@@ -522,7 +716,7 @@ class Runtime:
             if module_path.startswith('./'):
                 if not os.path.exists(module_path):
                     raise Muni_Error(f"File {module_path} not found")
-                imported_file = self.import_from_absolute_path(module_path)
+                imported_file = self.load_python_file(module_path)
                 self.update_functions_with_alias(imported_file.__dict__, alias)
             else:
                 module_path = module_path[:-3]
@@ -532,19 +726,42 @@ class Runtime:
         elif module_path.endswith('.mun') and module_path.startswith('./'):
             if not os.path.exists(module_path):
                 raise Muni_Error(f"File {module_path} not found")
-
-
-            imported_ast = muni_parser.parse_file(module_path)
-            for statement in imported_ast.statements:
-                self.evaluate(statement)
+            self.import_muni_file(module_path)
         elif module_path.endswith('.lib'):
             library_name = module_path[:-4]
             library_path = os.path.join(os.path.dirname(__file__), "libraries", f"lib_{library_name}.py")
             if not os.path.exists(library_path):
                 raise Muni_Error(f"Library {library_name} not found")
-            imported_module = self.import_from_absolute_path(library_path)
+            imported_module = self.load_python_file(library_path)
             self.update_functions_with_alias(imported_module.__dict__, alias)
-            
+
+    def import_muni_file(self, module_path):
+        # A file runs once per registry, the other importers get what it defined
+        key = self.module_registry.key(module_path)
+        if key in self.imported_files:
+            return
+        self.imported_files.add(key)
+        exports = self.module_registry.get(key)
+        if exports is not None:
+            exports.apply(self)
+            return
+
+        def run():
+            imported_ast = muni_parser.parse_file(module_path)
+            for statement in imported_ast.statements:
+                self.evaluate(statement)
+        exports = ModuleExports.collect(self, run)
+        if self.is_running:
+            self.module_registry.put(key, exports)
+
+    def load_python_file(self, path):
+        key = self.module_registry.key(path)
+        module = self.module_registry.get(key)
+        if module is None:
+            module = self.import_from_absolute_path(path)
+            self.module_registry.put(key, module)
+        return module
+
     def import_from_absolute_path(self, path_to_file):
     # Extract module name and directory path
         module_name = os.path.basename(path_to_file).replace('.py', '')
@@ -573,7 +790,8 @@ class Runtime:
                 self.functions[func_name] = imported_functions[func_name]
                 self.imported_functions.append(func_name)
              
-    def perform_cast(self, to_type, value):
+    @staticmethod
+    def perform_cast(to_type, value):
         
         
         if to_type == 'int':
@@ -665,7 +883,7 @@ class Runtime:
             if '<' in to_type:
                 to_type = ('list', to_type[to_type.index('<') + 1:to_type.index('>')])
             if isinstance(value, Muni_List):
-                return Muni_List(value.value, to_type[1])
+                return value.retyped(to_type[1])
             elif isinstance(value, type(None)):
                 return Muni_List([])
             elif isinstance(value, Muni_Void):
@@ -688,7 +906,7 @@ class Runtime:
                 raise Muni_Error(f"Cannot cast {type(value)} to {to_type}")
         elif 'dict' in to_type:
             if isinstance(value, Muni_Dict):
-                return Muni_Dict(value.value, to_type[1], to_type[2])
+                return value.retyped(to_type[1], to_type[2])
             elif isinstance(value, type(None)):
                 return Muni_Dict({})
             elif isinstance(value, Muni_Void):
@@ -729,4 +947,20 @@ class Runtime:
         for statement in statements:
             self.evaluate(statement)
     
-    
\ No newline at end of file
+    
+    def execute(self, ast):
+        if isinstance(ast, StatementList):
+            for stmt in ast.statements:
+                self.context.set_runtime(self)
+                result = self.evaluate(stmt)
+                self.flush_watches()
+                yield result
+        else:
+            self.context.set_runtime(self)
+            result = self.evaluate(ast)
+            self.flush_watches()
+            yield result
+
+    def release(self, statement):
+        """Forget what is kept for a top-level statement that will not run again."""
+        pass
@@ -0,0 +1,230 @@
+import re
+import sys
+from muni_lexer import *
+
+
+# Each rule keeps the exact regex of its muni_lexer counterpart, the scanner
+# only decides from the current character which of them can apply, in the
+# order PLY's master pattern tries them
+def rule_pattern(rule):
+    return re.compile(rule.__doc__, re.VERBOSE)
+
+imaginary_pattern = rule_pattern(t_IMAGINARY_NUMBER)
+number_pattern = rule_pattern(t_NUMBER)
+string_pattern = rule_pattern(t_STRING_LITERAL)
+import_pattern = rule_pattern(t_IMPORT_LITERAL)
+identifier_pattern = rule_pattern(t_IDENTIFIER)
+comment_pattern = rule_pattern(t_comment_singleline)
+block_comment_pattern = rule_pattern(t_comment_multiline)
+
+# Operators by their text, from the string rules. PLY tries longer regexes
+# first, which for these always picks the longest operator. t_DOT is the
+# regex '.', it takes any character no other rule matches.
+operators = {
+    re.sub(r'\\(.)', r'\1', regex): name[2:]
+    for name, regex in list(globals().items())
+    if name.startswith('t_') and isinstance(regex, str) and name not in ('t_ignore', 't_DOT')
+}
+operators_3 = {text: kind for text, kind in operators.items() if len(text) == 3}
+operators_2 = {text: kind for text, kind in operators.items() if len(text) == 2}
+operators_1 = {text: kind for text, kind in operators.items() if len(text) == 1}
+
+# What the scanner has to consider for a token starting with a character
+SPACE, NEWLINE, NAME, BOOLEAN_START, J, DIGIT, MINUS_SIGN, PLUS_OR_DOT, QUOTE, LESS, HASH, SLASH, OTHER = range(13)
+
+character_kinds = {' ': SPACE, '\t': SPACE, '\n': NEWLINE, '"': QUOTE, '<': LESS, '#': HASH, '/': SLASH,
+                   '-': MINUS_SIGN, '+': PLUS_OR_DOT, '.': PLUS_OR_DOT, 't': BOOLEAN_START, 'f': BOOLEAN_START, 'j': J, 'J': J}
+for c in 'abcdeghiklmnopqrsuvwxyzABCDEFGHIKLMNOPQRSTUVWXYZ_':
+    character_kinds[c] = NAME
+for c in '0123456789':
+    character_kinds[c] = DIGIT
+
+
+class IncompleteInput(Exception):
+    """The text ends inside a string or block comment that more input may close."""
+
+
+class Token:
+    """A token with the attributes of PLY's LexToken."""
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __str__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class LiteralToken:
+    """A literal token whose Muni value is only built when the parser reads it."""
+    __slots__ = ('type', 'text', 'box', 'boxed', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, text, box, lineno, lexpos):
+        self.type = type
+        self.text = text
+        self.box = box
+        self.boxed = None
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    @property
+    def value(self):
+        if self.boxed is None:
+            self.boxed = self.box(self.text)
+        return self.boxed
+
+    @value.setter
+    def value(self, value):
+        self.boxed = value
+
+    __str__ = Token.__str__
+    __repr__ = Token.__repr__
+
+
+class Scanner:
+    """Single pass scanner producing the same tokens as the PLY lexer in muni_lexer.
+
+    It has the part of PLY's lexer interface the parser and `run.py -l`
+    use: input(), token(), iteration, lineno and error_count. Identifier
+    names are interned and number, string and boolean values are boxed
+    lazily, see LiteralToken.
+
+    scan() can also start in the middle of a text, the characters before
+    `start` only serve as context for the imaginary number lookbehind, and
+    read a text that is not the whole source: unless `final`, a string or
+    block comment left open at its end raises IncompleteInput.
+    """
+
+    def __init__(self):
+        self.lineno = 1
+        self.error_count = 0
+        self.tokens = iter(())
+
+    def input(self, text):
+        self.tokens = self.scan(text)
+
+    def token(self):
+        return next(self.tokens, None)
+
+    def __iter__(self):
+        return self.tokens
+
+    def scan(self, text, start=0, final=True):
+        lineno = self.lineno
+        intern = sys.intern
+        keyword_types = keywords
+        pos = start
+        end = len(text)
+        while pos < end:
+            c = text[pos]
+            kind = character_kinds.get(c, OTHER)
+            if kind == SPACE:
+                pos += 1
+                continue
+
+            if kind == NAME or kind == BOOLEAN_START or kind == J:
+                if kind == BOOLEAN_START:
+                    if c == 't' and text.startswith('true', pos):
+                        yield LiteralToken('BOOLEAN', 'true', boolean_value, lineno, pos)
+                        pos += 4
+                        continue
+                    if c == 'f' and text.startswith('false', pos):
+                        yield LiteralToken('BOOLEAN', 'false', boolean_value, lineno, pos)
+                        pos += 5
+                        continue
+                elif kind == J:
+                    match = imaginary_pattern.match(text, pos)
+                    if match:
+                        stop = match.end()
+                        yield LiteralToken('IMAGINARY_NUMBER', text[pos:stop], imaginary_value, lineno, pos)
+                        pos = stop
+                        continue
+                stop = identifier_pattern.match(text, pos).end()
+                name = intern(text[pos:stop])
+                yield Token(keyword_types.get(name, 'IDENTIFIER'), name, lineno, pos)
+                pos = stop
+                continue
+
+            if kind == NEWLINE:
+                stop = pos + 1
+                while stop < end and text[stop] == '\n':
+                    stop += 1
+                lineno += stop - pos
+                self.lineno = lineno
+                pos = stop
+                continue
+
+            if kind == OTHER and c.isdecimal():
+                kind = DIGIT
+            if kind == DIGIT:
+                # An imaginary number starting with a digit has its j right
+                # after the digits and decimals a NUMBER would take
+                match = number_pattern.match(text, pos)
+                stop = match.end()
+                if match.group(2) is None and text[stop:stop + 1] in ('j', 'J'):
+                    imaginary = imaginary_pattern.match(text, pos)
+                    if imaginary:
+                        stop = imaginary.end()
+                        yield LiteralToken('IMAGINARY_NUMBER', text[pos:stop], imaginary_value, lineno, pos)
+                        pos = stop
+                        continue
+                yield LiteralToken('NUMBER', text[pos:stop], number_value, lineno, pos)
+                pos = stop
+                continue
+            elif kind == MINUS_SIGN or kind == PLUS_OR_DOT:
+                match = imaginary_pattern.match(text, pos)
+                if match:
+                    stop = match.end()
+                    yield LiteralToken('IMAGINARY_NUMBER', text[pos:stop], imaginary_value, lineno, pos)
+                    pos = stop
+                    continue
+                if kind == MINUS_SIGN and pos + 1 < end and text[pos + 1].isdecimal():
+                    stop = number_pattern.match(text, pos).end()
+                    yield LiteralToken('NUMBER', text[pos:stop], number_value, lineno, pos)
+                    pos = stop
+                    continue
+            elif kind == QUOTE:
+                match = string_pattern.match(text, pos)
+                if match:
+                    stop = match.end()
+                    yield LiteralToken('STRING_LITERAL', text[pos:stop], string_value, lineno, pos)
+                    pos = stop
+                    continue
+                if not final:
+                    raise IncompleteInput()
+            elif kind == LESS:
+                match = import_pattern.match(text, pos)
+                if match:
+                    stop = match.end()
+                    yield Token('IMPORT_LITERAL', text[pos + 1:stop - 1], lineno, pos)
+                    pos = stop
+                    continue
+            elif kind == HASH:
+                pos = comment_pattern.match(text, pos).end()
+                continue
+            elif kind == SLASH:
+                match = block_comment_pattern.match(text, pos)
+                if match:
+                    lineno += match.group().count('\n')
+                    self.lineno = lineno
+                    pos = match.end()
+                    continue
+                if not final and text.startswith('/*', pos):
+                    raise IncompleteInput()
+
+            operator = text[pos:pos + 3]
+            kind = operators_3.get(operator)
+            if kind is None:
+                operator = operator[:2]
+                kind = operators_2.get(operator)
+                if kind is None:
+                    operator = c
+                    kind = operators_1.get(c, 'DOT')
+            yield Token(kind, operator, lineno, pos)
+            pos += len(operator)
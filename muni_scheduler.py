@@ -0,0 +1,306 @@
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+
+SCHEDULERS = ("threads", "asyncio")
+
+
+class HandlerStats:
+    """Counters of a HandlerScheduler, safe to read while handlers run."""
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.ran_inline = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+        self.max_run = 0.0
+
+    def record(self, queued, started, finished, failed):
+        if failed:
+            self.failed += 1
+        else:
+            self.completed += 1
+        self.total_wait += started - queued
+        self.max_wait = max(self.max_wait, started - queued)
+        self.total_run += finished - started
+        self.max_run = max(self.max_run, finished - started)
+
+    def report(self, queue_depth, file=sys.stderr):
+        finished = self.completed + self.failed
+        mean_wait = self.total_wait / finished if finished else 0.0
+        mean_run = self.total_run / finished if finished else 0.0
+        print("Signal and watch handlers:", file=file)
+        print(f"  submitted {self.submitted}, completed {self.completed}, failed {self.failed}, "
+              f"run inline {self.ran_inline}", file=file)
+        print(f"  queue depth {queue_depth} now, {self.max_queue_depth} at most", file=file)
+        print(f"  queued for {mean_wait * 1000:.3f} ms on average, {self.max_wait * 1000:.3f} ms at most", file=file)
+        print(f"  ran for {mean_run * 1000:.3f} ms on average, {self.max_run * 1000:.3f} ms at most", file=file)
+
+
+class HandlerScheduler:
+    """Runs signal and watch handlers on a bounded pool of worker threads.
+
+    Handlers wait in a queue of at most queue_size entries for one of the
+    workers, which are only started by the first submit. When the queue is
+    full, submit blocks the emitting program until a worker frees a place.
+    A handler submitted from a worker thread runs inline instead, a worker
+    waiting on its own queue could otherwise wait forever.
+
+    Like the threads handlers used to run on, pending handlers keep the
+    program from exiting unless wait_on_exit is off, then they are dropped.
+    """
+
+    def __init__(self, workers=None, queue_size=1024, wait_on_exit=True):
+        if workers is None:
+            # The default of concurrent.futures.ThreadPoolExecutor
+            workers = min(32, (os.cpu_count() or 1) + 4)
+        if workers < 1 or queue_size < 1:
+            raise ValueError("A handler scheduler needs at least one worker and one queue slot")
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads = []
+        self.worker_idents = set()
+        self.stats = HandlerStats()
+        self.lock = threading.Lock()
+        self.closed = False
+        self.wait_on_exit = wait_on_exit
+
+    def submit(self, handler, *args):
+        if self.closed:
+            return
+        with self.lock:
+            self.stats.submitted += 1
+            if not self.threads:
+                self.start()
+        task = (handler, args, time.perf_counter())
+        if threading.get_ident() in self.worker_idents:
+            try:
+                self.queue.put_nowait(task)
+            except queue.Full:
+                with self.lock:
+                    self.stats.ran_inline += 1
+                self.run(*task)
+                return
+        else:
+            self.queue.put(task)
+        depth = self.queue.qsize()
+        if depth > self.stats.max_queue_depth:
+            with self.lock:
+                self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+
+    def start(self):
+        atexit.register(self.exit)
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self.work, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+            self.worker_idents.add(thread.ident)
+
+    def work(self):
+        while True:
+            task = self.queue.get()
+            if task is None:
+                self.queue.task_done()
+                return
+            handler, args, queued = task
+            self.run(handler, args, queued)
+            self.queue.task_done()
+
+    def run(self, handler, args, queued):
+        started = time.perf_counter()
+        try:
+            handler(*args)
+            failed = False
+        except Exception:
+            traceback.print_exc()
+            failed = True
+        finished = time.perf_counter()
+        with self.lock:
+            self.stats.record(queued, started, finished, failed)
+
+    def spawn(self, coroutine):
+        # Each worker waits on a loop of its own
+        import asyncio
+        self.submit(asyncio.run, coroutine)
+
+    def pending(self):
+        return self.queue.unfinished_tasks
+
+    def wait(self):
+        """Block until every submitted handler, and those they submit, has run."""
+        self.queue.join()
+
+    def shutdown(self, wait=True):
+        """Stop the workers, after the pending handlers if wait, else dropping them."""
+        if self.closed:
+            return
+        if wait:
+            self.wait()
+        self.closed = True
+        if not wait:
+            # Pending handlers are dropped, the daemon workers do not keep the process alive
+            return
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def exit(self):
+        self.shutdown(self.wait_on_exit)
+
+    def report(self, file=sys.stderr):
+        self.stats.report(self.queue.qsize(), file)
+
+
+class EventLoopScheduler:
+    """Runs signal and watch handlers as asyncio tasks on a single event loop.
+
+    The loop runs on a thread of its own, started by the first submit.
+    Handlers run one at a time in the order they were submitted, on a
+    second thread, so they never race each other and interleave the same
+    way on every run. A slow handler holds up the handlers submitted after
+    it, but not the loop: coroutines passed to spawn, like the requests of
+    lib_requests, keep waiting on it without holding up the handlers.
+    At most queue_size handlers wait for the loop, submit blocks the
+    program when there are more. Submits from the handlers and the loop
+    never block.
+    """
+
+    def __init__(self, queue_size=1024, wait_on_exit=True):
+        if queue_size < 1:
+            raise ValueError("A handler scheduler needs at least one queue slot")
+        self.slots = threading.BoundedSemaphore(queue_size)
+        self.loop = None
+        self.thread = None
+        # The handler thread runs the calls the tasks put here, in order
+        self.calls = queue.Queue()
+        self.handler_thread = None
+        self.stats = HandlerStats()
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        # Submitted and not finished, and not started yet
+        self.unfinished = 0
+        self.queued = 0
+        self.closed = False
+        self.wait_on_exit = wait_on_exit
+
+    def submit(self, handler, *args):
+        if self.closed:
+            return
+        ident = threading.get_ident()
+        on_loop = self.thread is not None and ident == self.thread.ident
+        # A handler waiting for a slot only its own thread could free would wait forever
+        own = on_loop or (self.handler_thread is not None and ident == self.handler_thread.ident)
+        if not own:
+            self.slots.acquire()
+        with self.lock:
+            self.stats.submitted += 1
+            if self.thread is None:
+                self.start()
+            self.unfinished += 1
+            self.queued += 1
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.queued)
+        task = (handler, args, time.perf_counter(), not own)
+        if on_loop:
+            self.schedule(*task)
+        else:
+            self.loop.call_soon_threadsafe(self.schedule, *task)
+
+    def start(self):
+        # asyncio is only imported by the programs that use it
+        import asyncio
+        atexit.register(self.exit)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.handler_thread = threading.Thread(target=self.work, daemon=True)
+        self.handler_thread.start()
+
+    def work(self):
+        while True:
+            call = self.calls.get()
+            if call is None:
+                return
+            handler, args, done = call
+            started = time.perf_counter()
+            try:
+                outcome = (started, handler(*args), None)
+            except Exception as error:
+                outcome = (started, None, error)
+            self.loop.call_soon_threadsafe(done.set_result, outcome)
+
+    def schedule(self, handler, args, queued, slot):
+        self.loop.create_task(self.run(handler, args, queued, slot))
+
+    async def run(self, handler, args, queued, slot):
+        if slot:
+            self.slots.release()
+        with self.lock:
+            self.queued -= 1
+        done = self.loop.create_future()
+        self.calls.put((handler, args, done))
+        started, result, error = await done
+        try:
+            if error is not None:
+                raise error
+            if hasattr(result, '__await__'):
+                await result
+            failed = False
+        except Exception:
+            traceback.print_exc()
+            failed = True
+        finished = time.perf_counter()
+        with self.lock:
+            self.stats.record(queued, started, finished, failed)
+            self.unfinished -= 1
+            if not self.unfinished:
+                self.idle.notify_all()
+
+    def spawn(self, coroutine):
+        self.submit(lambda: coroutine)
+
+    def pending(self):
+        return self.unfinished
+
+    def wait(self):
+        """Block until every submitted handler, and those they submit, has run."""
+        with self.idle:
+            while self.unfinished:
+                self.idle.wait()
+
+    def shutdown(self, wait=True):
+        """Stop the loop, after the pending handlers if wait, else dropping them."""
+        if self.closed:
+            return
+        if wait:
+            self.wait()
+        self.closed = True
+        if not wait or self.thread is None:
+            return
+        self.calls.put(None)
+        self.handler_thread.join()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def exit(self):
+        self.shutdown(self.wait_on_exit)
+
+    def report(self, file=sys.stderr):
+        self.stats.report(self.queued, file)
+
+
+def create_scheduler(name="threads", workers=None, queue_size=1024, wait_on_exit=True):
+    if name == "asyncio":
+        return EventLoopScheduler(queue_size, wait_on_exit)
+    if name == "threads":
+        return HandlerScheduler(workers, queue_size, wait_on_exit)
+    raise ValueError(f"Unknown handler scheduler '{name}', expected one of {', '.join(SCHEDULERS)}")
@@ -0,0 +1,155 @@
+import gc
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import traceback
+import muni_parser
+
+
+class ScriptServer:
+    """Runs the Muni scripts muni_client sends over a Unix socket.
+
+    The server process pays for the imports and the parser tables once,
+    then forks a pool of children that each create a fresh runtime and
+    wait for a connection. A child runs one script and exits, the server
+    forks another in its place, so no two scripts ever share a runtime,
+    a module registry, a working directory or the parser.
+
+    A request is one byte carrying the client's stdin, stdout and stderr,
+    then a line of JSON with the script's path, its $n arguments and the
+    client's working directory. The child runs the script on the client's
+    own descriptors, so output is streamed as it is printed, and answers
+    with a line of JSON holding the exit status.
+    """
+
+    def __init__(self, path, make_runtime, load_program, pool_size=None, handler_stats=False):
+        self.path = path
+        self.make_runtime = make_runtime
+        self.load_program = load_program
+        self.pool_size = pool_size or os.cpu_count() or 1
+        self.handler_stats = handler_stats
+        self.listener = None
+        self.children = set()
+
+    def serve_forever(self):
+        self.listen()
+        self.warm_up()
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            while True:
+                while len(self.children) < self.pool_size:
+                    self.spawn()
+                pid, _ = os.wait()
+                self.children.discard(pid)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def listen(self):
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                # Left behind by a server that is gone
+                os.unlink(self.path)
+            else:
+                raise OSError(f"A server is already listening on {self.path}")
+            finally:
+                probe.close()
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.path)
+        self.listener.listen(128)
+
+    def warm_up(self):
+        # Imports the engine and what the first parse and runtime pull in
+        self.make_runtime()
+        muni_parser.parse("int warm = 0;")
+        # The collector would otherwise touch, and so copy into every child,
+        # the pages of everything loaded so far
+        gc.freeze()
+
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            return
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        status = 1
+        try:
+            status = self.serve_one()
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            # Never back into the server's loop or its exit handlers
+            os._exit(status)
+
+    def serve_one(self):
+        runtime = self.make_runtime()
+        connection, _ = self.listener.accept()
+        self.listener.close()
+        with connection:
+            _, fds, _, _ = socket.recv_fds(connection, 1, 3)
+            if len(fds) != 3:
+                # Not a client, like the probe of a server starting on the same path
+                for fd in fds:
+                    os.close(fd)
+                return 0
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            sys.stdout.reconfigure(line_buffering=os.isatty(1))
+            request = json.loads(connection.makefile('rb').readline())
+            threading.Thread(target=self.watch_client, args=(connection,), daemon=True).start()
+            status = self.run_script(runtime, request)
+            connection.sendall(json.dumps({"status": status}).encode() + b"\n")
+        return status
+
+    def watch_client(self, connection):
+        # A client that is gone, interrupted say, no longer waits for its script
+        if not connection.recv(1):
+            os._exit(1)
+
+    def run_script(self, runtime, request):
+        try:
+            os.chdir(request["cwd"])
+            runtime.set_args(request["args"])
+            ast = self.load_program(request["file"])
+            for _ in runtime.execute(ast):
+                pass
+            scheduler = runtime.scheduler
+            if self.handler_stats:
+                if scheduler.wait_on_exit:
+                    scheduler.wait()
+                scheduler.report()
+            # What the exit handler of a run.py process does
+            scheduler.exit()
+            return 0
+        except SystemExit as exit:
+            return exit.code if isinstance(exit.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+    def close(self):
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.children.clear()
+        if self.listener is not None:
+            self.listener.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
@@ -0,0 +1,111 @@
+import mmap
+import os
+from muni_scanner import Scanner, IncompleteInput
+from muni_pratt import Parser, ParseError
+from muni_parser import collection_paused
+
+WINDOW_SIZE = 1 << 18
+
+
+class SourceWindows:
+    """A memory-mapped source file read in windows that end on a line break."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        # An empty file cannot be mapped
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self.offset = 0
+
+    def at_end(self):
+        return self.offset >= self.size
+
+    def read(self, size):
+        """Decode the next `size` bytes or so, up to the end of their last line."""
+        stop = min(self.offset + size, self.size)
+        if stop < self.size:
+            newline = self.map.find(b'\n', stop - 1)
+            stop = self.size if newline < 0 else newline + 1
+        window = self.map[self.offset:stop]
+        self.offset = stop
+        return window.decode('utf-8')
+
+    def close(self):
+        if self.size:
+            self.map.close()
+        self.file.close()
+
+
+def stream_statements(path, window_size=WINDOW_SIZE):
+    """Yield the top-level statements of a source file as soon as each is parsed.
+
+    Only the window being read and the statement being parsed are held in
+    memory, not the whole file. The tokens of a statement that does not end
+    in the text read so far are kept and it is parsed again once the next
+    window is scanned. Windows grow with the pending statement, so a huge
+    statement is parsed about twice but scanned once. Statements are parsed
+    by muni_pratt, whatever parser is selected, as the LALR parser only
+    parses whole programs. muni_pratt also resolves their names; syntax
+    errors are reported and skipped as in a whole file parse.
+    """
+    windows = SourceWindows(path)
+    scanner = Scanner()
+    parser = Parser()
+    # text[start:] is read but not scanned yet, text[:start] is one character
+    # of context for the scanner. pending holds the tokens not parsed yet and
+    # pending_size roughly how much source they come from.
+    text, start = '', 0
+    pending, pending_size = [], 0
+    parsed_any = False
+    try:
+        while True:
+            window = windows.read(max(window_size, pending_size))
+            text += window
+            pending_size += len(window)
+            final = windows.at_end()
+            # Like muni_parser.parse, no cyclic collection while scanning and
+            # parsing, only while the statements run
+            lineno = scanner.lineno
+            try:
+                with collection_paused():
+                    scanned = list(scanner.scan(text, start, final))
+            except IncompleteInput:
+                # Scanned again with the next window
+                scanner.lineno = lineno
+                continue
+            pending += scanned
+            text, start = text[-1:], len(text[-1:])
+
+            parser.load(pending)
+            count = len(pending)
+            while parser.position < count:
+                begin = parser.position
+                try:
+                    with collection_paused():
+                        statement = parser.statement()
+                except ParseError as error:
+                    if error.position >= count and not final:
+                        parser.position = begin
+                        break
+                    parser.recover(error.position)
+                    continue
+                # What follows may still extend it, like the else of an if
+                if parser.position == count and not final:
+                    parser.position = begin
+                    break
+                parsed_any = True
+                yield statement
+            if final:
+                if not parsed_any:
+                    parser.error(None)
+                return
+            if parser.position == 0:
+                pending_size *= 2
+            elif parser.position < count:
+                pending_size = pending_size * (count - parser.position) // count
+                pending = pending[parser.position:]
+            else:
+                pending, pending_size = [], 0
+            parser.load([])
+    finally:
+        windows.close()
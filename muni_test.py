@@ -1,23 +1,375 @@
-from run import run
+from run import run, create_runtime
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import copy
+import io
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import muni_parser
+from muni_ast_nodes import AstNode
+from muni_types import Muni_Type
 
 class TestCase:
-    def __init__(self, description, input_code, expected_output=None, expected_error=None):
+    def __init__(self, description, input_code, expected_output=None, expected_error=None, engine="tree", vectorize=False, optimize=False, parser="lalr", stream=False, files=None, scheduler=None, coalesce_watches=False):
         self.description = description
         self.input_code = input_code
         self.expected_output = expected_output
         self.expected_error = expected_error
+        self.engine = engine
+        self.vectorize = vectorize
+        self.optimize = optimize
+        self.parser = parser
+        self.stream = stream
+        # Source files the test imports, written next to it while it runs
+        self.files = files or {}
+        # Runs the signal and watch handlers instead of a default pool
+        self.scheduler = scheduler
+        self.coalesce_watches = coalesce_watches
+
+class ParserConformanceCase:
+    """Parses source files with every parser and checks they build the same trees."""
+    def __init__(self, description, paths):
+        self.description = description
+        self.paths = paths
+
+    def check(self):
+        for path in self.paths:
+            with open(path, 'r') as file:
+                content = file.read()
+            trees = {}
+            for name in muni_parser.PARSERS:
+                muni_parser.set_parser(name)
+                try:
+                    trees[name] = tree_shape(muni_parser.parse(content))
+                finally:
+                    muni_parser.set_parser('lalr')
+            if len(set(map(repr, trees.values()))) != 1:
+                return f"the parsers disagree on {path}"
+            if trees['lalr'] is None or not muni_parser.parsed_cleanly():
+                return f"{path} does not parse"
+        return None
+
+class ConcurrentErrorCase:
+    """Runs programs on many threads at once and checks the line of each one's error."""
+    def __init__(self, description, programs, engine="tree", threads=8, rounds=4):
+        # programs maps source code to the line its error is reported at
+        self.description = description
+        self.programs = programs
+        self.engine = engine
+        self.threads = threads
+        self.rounds = rounds
+
+    def check(self):
+        asts = {code: muni_parser.parse(code) for code in self.programs}
+
+        def error_line(code):
+            runtime = create_runtime(self.engine)
+            for _ in runtime.execute(asts[code]):
+                pass
+            return runtime.error.line if runtime.error is not None else None
+
+        codes = list(self.programs) * self.rounds
+        # The errors are printed by every thread, only their lines are checked
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(self.threads) as executor:
+                lines = list(executor.map(error_line, codes))
+        for code, line in zip(codes, lines):
+            if line != self.programs[code]:
+                return f"expected an error at line {self.programs[code]}, got {line}"
+        return None
+
+class ConcurrentParseCase:
+    """Parses a program on many threads at once and checks every tree and the collector's state."""
+    def __init__(self, description, input_code, threads=8, rounds=8):
+        self.description = description
+        self.input_code = input_code
+        self.threads = threads
+        self.rounds = rounds
+
+    def check(self):
+        import gc
+        expected = tree_shape(muni_parser.parse(self.input_code))
+        with ThreadPoolExecutor(self.threads) as executor:
+            trees = list(executor.map(lambda _: tree_shape(muni_parser.parse(self.input_code)), range(self.threads * self.rounds)))
+        if any(tree != expected for tree in trees):
+            return "a parse on another thread built a different tree"
+        if not gc.isenabled():
+            return "the cyclic collector was left off"
+        return None
+
+class SlowHandlerCase:
+    """Spawns a waiting coroutine, then a slow handler, and checks the coroutine is not held up by it."""
+    def __init__(self, description, scheduler, delay=1.0):
+        self.description = description
+        self.scheduler = scheduler
+        self.delay = delay
+
+    def check(self):
+        import asyncio
+        finished = {}
+
+        async def waiting():
+            await asyncio.sleep(self.delay / 10)
+            finished["coroutine"] = time.perf_counter()
+
+        def slow():
+            time.sleep(self.delay)
+            finished["handler"] = time.perf_counter()
+
+        self.scheduler.spawn(waiting())
+        self.scheduler.submit(slow)
+        self.scheduler.shutdown()
+        if len(finished) != 2:
+            return f"expected the coroutine and the handler to finish, got {sorted(finished)}"
+        if finished["coroutine"] > finished["handler"]:
+            return "the coroutine waited for the slow handler"
+        return None
+
+class DisassemblyCase:
+    """Disassembles a program as --dis does and checks the listing names the given instructions."""
+    def __init__(self, description, input_code, instructions):
+        self.description = description
+        self.input_code = input_code
+        self.instructions = instructions
+
+    def check(self):
+        from muni_vm import disassemble_program
+        listing = io.StringIO()
+        disassemble_program(muni_parser.parse(self.input_code), listing)
+        missing = [instruction for instruction in self.instructions if instruction not in listing.getvalue()]
+        if missing:
+            return f"expected {', '.join(missing)} in {listing.getvalue()!r}"
+        return None
+
+class ProfileCase:
+    """Profiles a program and checks how many times its lines and functions were hit."""
+    def __init__(self, description, input_code, lines, functions, engine="tree"):
+        self.description = description
+        self.input_code = input_code
+        self.lines = lines
+        self.functions = functions
+        self.engine = engine
+
+    def check(self):
+        from muni_profiler import Profiler
+        runtime = create_runtime(self.engine)
+        runtime.set_profiler(Profiler(runtime))
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in runtime.execute(muni_parser.parse(self.input_code)):
+                pass
+        lines, _, functions, _ = runtime.profiler.merged()
+        hits = ({line: stats.hits for line, stats in lines.items()}, {name: stats.hits for name, stats in functions.items()})
+        if hits != (self.lines, self.functions):
+            return f"expected hits {(self.lines, self.functions)}, got {hits}"
+        return None
+
+class ServerCase:
+    """Starts `run.py --serve`, runs scripts through muni_client and checks what each printed."""
+    def __init__(self, description, scripts, options=()):
+        # scripts maps (source code, arguments) to the output expected
+        self.description = description
+        self.scripts = scripts
+        self.options = list(options)
+
+    def check(self):
+        directory = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as temporary:
+            path = os.path.join(temporary, 'muni.sock')
+            server = subprocess.Popen([sys.executable, os.path.join(directory, 'run.py'), '--serve', path, '--serve-pool', '2'] + self.options,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                deadline = time.monotonic() + 30
+                while not os.path.exists(path):
+                    if time.monotonic() > deadline or server.poll() is not None:
+                        return "the server did not start"
+                    time.sleep(0.05)
+                for index, ((code, args), expected) in enumerate(self.scripts.items()):
+                    script = os.path.join(temporary, f'script{index}.mun')
+                    with open(script, 'w') as file:
+                        file.write(code)
+                    result = subprocess.run([sys.executable, os.path.join(directory, 'muni_client.py'), script] + list(args),
+                                            env=dict(os.environ, MUNI_SOCKET=path), cwd=temporary, capture_output=True, text=True, timeout=30)
+                    if result.stdout != expected:
+                        return f"expected {expected!r}, got {result.stdout!r} {result.stderr!r}"
+            finally:
+                server.terminate()
+                server.wait()
+        return None
+
+class CacheCase:
+    """Parses a file through the AST cache step by step and checks which parses were cache hits.
+
+    Each step is a dict with the source to write, or None to keep the file,
+    "hit", and the "output" of the last statement. "parser" picks the parser,
+    "cache": False parses as --no-cache does and "corrupt": True overwrites
+    the cached tree with garbage first.
+    """
+    def __init__(self, description, steps):
+        self.description = description
+        self.steps = steps
+
+    def check(self):
+        import muni_cache
+        from run import load_program
+        with tempfile.TemporaryDirectory() as temporary:
+            path = os.path.join(temporary, 'cached.mun')
+            for number, step in enumerate(self.steps, 1):
+                parser = step.get("parser", "lalr")
+                if step["code"] is not None:
+                    with open(path, 'w') as file:
+                        file.write(step["code"])
+                if step.get("corrupt"):
+                    with open(muni_cache.cache_path(path, parser), 'wb') as file:
+                        file.write(b"not a pickle")
+                muni_parser.set_parser(parser)
+                muni_cache.set_enabled(step.get("cache", True))
+                try:
+                    ast = load_program(path)
+                finally:
+                    muni_parser.set_parser('lalr')
+                    muni_cache.set_enabled(True)
+                runtime = create_runtime()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    output = [str(result) for result in runtime.execute(ast)]
+                if (muni_cache.last_hit, output[-1]) != (step["hit"], step["output"]):
+                    return f"step {number}: expected hit {step['hit']} and {step['output']}, got {muni_cache.last_hit} and {output[-1]}"
+        return None
+
+class BenchGateCase:
+    """Runs the regression gate of muni_bench on made-up results and checks the status of every row.
+
+    statuses maps (benchmark, timing) to the status expected, rerun is what
+    running the benchmarks again returns and reruns the benchmarks the gate
+    is expected to run again.
+    """
+    def __init__(self, description, results, baseline, timings, statuses, rerun=None, reruns=(), fails=False):
+        self.description = description
+        self.results = results
+        self.baseline = baseline
+        self.timings = timings
+        self.statuses = statuses
+        self.rerun = rerun
+        self.reruns = list(reruns)
+        self.fails = fails
+
+    def check(self):
+        import muni_bench
+        asked = []
+
+        def again(names):
+            asked.extend(names)
+            return copy.deepcopy(self.rerun)
+
+        rows = muni_bench.check(copy.deepcopy(self.results), self.baseline, self.timings, again)
+        statuses = {(row[0], row[1]): row[5] for row in rows}
+        if statuses != self.statuses:
+            return f"expected {self.statuses}, got {statuses}"
+        if asked != self.reruns:
+            return f"expected {self.reruns} to run again, got {asked}"
+        if muni_bench.failed(rows) != self.fails:
+            return f"expected the gate to {'fail' if self.fails else 'pass'}"
+        return None
+
+class BenchExitCase:
+    """Runs `run.py --bench-check` on one benchmark against a baseline, and timings when given, and checks the exit status."""
+    def __init__(self, description, benchmark, baseline, timings=None, status=0):
+        self.description = description
+        self.benchmark = benchmark
+        self.baseline = baseline
+        self.timings = timings
+        self.status = status
+
+    def check(self):
+        import muni_bench
+        directory = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as temporary:
+            path = os.path.join(temporary, 'baseline.json')
+            muni_bench.write_results(self.baseline, path)
+            if self.timings is not None:
+                muni_bench.write_results(self.timings, muni_bench.timings_path(path))
+            result = subprocess.run([sys.executable, os.path.join(directory, 'run.py'), '--bench', self.benchmark, '--bench-warm-only',
+                                     '--bench-repeat', '1', '--bench-check', path], capture_output=True, text=True, timeout=120)
+        if result.returncode != self.status:
+            return f"expected exit status {self.status}, got {result.returncode}: {result.stdout[-300:]!r} {result.stderr[-300:]!r}"
+        return None
+
+def tree_shape(node):
+    """A comparable picture of a tree: node types, fields, line numbers and values."""
+    if isinstance(node, AstNode):
+        return (type(node).__name__, tuple((name, tree_shape(value)) for name, value in sorted(vars(node).items())))
+    if isinstance(node, (list, tuple)):
+        return (type(node).__name__, tuple(tree_shape(item) for item in node))
+    if isinstance(node, dict):
+        return ('dict', tuple((tree_shape(key), tree_shape(value)) for key, value in node.items()))
+    if isinstance(node, Muni_Type):
+        return (type(node).__name__, str(node))
+    return node
+
+class TestTimeout(Exception):
+    pass
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """Raise TestTimeout in the code run under it once it has run for seconds.
+
+    A program waiting for handlers that never come spins forever, the
+    alarm interrupts it. It only works on the main thread of a platform
+    with SIGALRM, elsewhere tests run without a limit.
+    """
+    if not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise TestTimeout(f"did not finish within {seconds} seconds")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    # Fires again every second, in case a bare except swallowed it
+    signal.setitimer(signal.ITIMER_REAL, seconds, 1)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
 
 class TestRunner:
-    def __init__(self):
+    def __init__(self, timeout=60):
         self.test_cases = []
+        # Seconds each test may run before it fails
+        self.timeout = timeout
 
     def add_test_case(self, test_case):
         self.test_cases.append(test_case)
 
     def run(self):
         for test in self.test_cases:
+            # Cases that do more than run code check themselves
+            if hasattr(test, 'check'):
+                try:
+                    with time_limit(self.timeout):
+                        failure = test.check()
+                except TestTimeout as error:
+                    failure = str(error)
+                print(f"FAIL {test.description}: {failure}" if failure else f"PASS {test.description}")
+                continue
+            for path, content in test.files.items():
+                with open(path, 'w') as file:
+                    file.write(content)
             try:
-                output = execute_code(test.input_code)
+                muni_parser.set_parser(test.parser)
+                try:
+                    with time_limit(self.timeout):
+                        if test.stream:
+                            output = execute_streamed(test.input_code, test.engine, test.vectorize)
+                        else:
+                            output = execute_code(test.input_code, test.engine, test.vectorize, test.optimize, test.scheduler, test.coalesce_watches)
+                finally:
+                    muni_parser.set_parser('lalr')
                 if test.expected_error:
                     print(f"FAIL {test.description}: Expected error, but got output.")
                 elif output[-1] != test.expected_output:
@@ -29,7 +381,25 @@ class TestRunner:
                     print(f"PASS {test.description} (error expected)")
                 else:
                     print(f"FAIL {test.description}: {e}")
+            finally:
+                for path in test.files:
+                    os.remove(path)
+
+def execute_code(code, engine="tree", vectorize=False, optimize=False, scheduler=None, coalesce_watches=False):
+    return list(run(code, engine, vectorize, optimize, scheduler, coalesce_watches))
 
-def execute_code(code):
-    return list(run(code))
 
+def execute_streamed(code, engine="tree", vectorize=False, window_size=8):
+    # A tiny window makes statements, strings and comments straddle windows
+    from muni_stream import stream_statements
+    with tempfile.NamedTemporaryFile('w', suffix='.mun', delete=False) as file:
+        file.write(code)
+    try:
+        runtime = create_runtime(engine, vectorize)
+        output = []
+        for statement in stream_statements(file.name, window_size):
+            output.extend(str(result) for result in runtime.execute(statement))
+            runtime.release(statement)
+        return output
+    finally:
+        os.remove(file.name)
@@ -2,6 +2,7 @@ from math import sqrt
 from muni_error import *
 from muni_context_manager import *
 from copy import deepcopy
+from array import array
 
 
 def to_standard_type(element):
@@ -9,13 +10,22 @@ def to_standard_type(element):
         return element.to_standard_type()
     return element
 
+def copy_value(element):
+    if isinstance(element, Muni_Type):
+        return element.copy()
+    return element
+
 class Muni_Type:
     def __init__(self, value):
         self.value = value
         self.id = id(self)
 
     def copy(self):
-        return deepcopy(self)
+        # Scalars hold immutable python values, a shallow copy is a full copy.
+        # The copy keeps the id of the original so watchers still match it.
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        return new
 
     def to_standard_type(self):
         if isinstance(self, Muni_Dict):
@@ -438,52 +448,216 @@ class Muni_Untyped(Muni_Type):
     def symbol():  # type: ignore
         return '?'
 
+class NumberArray:
+    """Compact storage for a list of Muni_Int or Muni_Float.
+
+    The numbers are kept unboxed in an array('q') or array('d'), and boxed
+    only when they are read. It supports the parts of the list protocol that
+    Muni_List uses, so a list can hold either one as its storage. Storing a
+    value the array cannot hold raises OverflowError or TypeError, and the
+    list falls back to a python list.
+    """
+    __slots__ = ('box', 'data')
+
+    def __init__(self, box, data):
+        self.box = box
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return map(self.box, self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return NumberArray(self.box, self.data[index])
+        return self.box(self.data[index])
+
+    def unbox(self, item):
+        if type(item) is not self.box:
+            raise TypeError(f"cannot store {type(item).__name__} in a {self.box.__name__} array")
+        return item.value
+
+    def __setitem__(self, index, item):
+        self.data[index] = self.unbox(item)
+
+    def __add__(self, other):
+        if isinstance(other, NumberArray) and other.box is self.box:
+            return NumberArray(self.box, self.data + other.data)
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def append(self, item):
+        self.data.append(self.unbox(item))
+
+    def insert(self, index, item):
+        self.data.insert(index, self.unbox(item))
+
+    def pop(self, index=-1):
+        return self.box(self.data.pop(index))
+
+    def remove(self, item):
+        # Same error as list.remove for values the array cannot contain
+        if type(item) is not self.box:
+            raise ValueError("list.remove(x): x not in list")
+        self.data.remove(item.value)
+
+    def copy(self):
+        return NumberArray(self.box, array(self.data.typecode, self.data))
+
+
+array_typecodes = {"INT": 'q', "int": 'q', "FLOAT": 'd', "float": 'd'}
+
+
+def pack_numbers(items, type_specifier):
+    """Return array-backed storage for items of a numeric list type, or items unchanged."""
+    typecode = array_typecodes.get(type_specifier)
+    if typecode is None or isinstance(items, NumberArray):
+        return items
+    box = Muni_Int if typecode == 'q' else Muni_Float
+    try:
+        values = [item.value for item in items if type(item) is box]
+        if len(values) != len(items) or (typecode == 'q' and any(type(value) is bool for value in values)):
+            return items
+        return NumberArray(box, array(typecode, values))
+    except (OverflowError, TypeError):
+        return items
+
+
 class Muni_List(Muni_Type):
+    """A list with value semantics.
+
+    Copies share their storage until one side mutates it, so assigning a list
+    or passing it to a function is O(1). `_shared` is set whenever the storage
+    may be referenced by another object, and mutators call `_own` first.
+    Nested lists and dicts are shared along with the storage, `_own` copies
+    them too, so reading one out of a shared list owns the storage first:
+    `a[0][1] = 2` changes the element in place.
+    """
+
     def __init__(self, items=None, type_specifier='UNTYPED'):
-        if not isinstance(items, list):
+        if not isinstance(items, (list, NumberArray)):
             raise Muni_Error(f"Muni_List requires a list value, got {type(items)}")
         super().__init__(items if items is not None else [])
+        self._shared = False
         self.type_specifier = type_specifier
-        if type_specifier != "UNTYPED":
-            for item in items:
-                try:
-                    self.check_type(item)
-                except:
-                    self.cast_items()
+        self._check_items()
+
+    @property
+    def value(self):
+        # The raw list escapes, so it can no longer be mutated in place
+        self._shared = True
+        return self._items
+
+    @value.setter
+    def value(self, items):
+        self._items = items
+        self._shared = True
+
+    def copy(self):
+        self._shared = True
+        return super().copy()
+
+    def retyped(self, type_specifier):
+        """Return a list sharing this one's storage, with items cast to type_specifier."""
+        new = self.copy()
+        new.id = id(new)
+        new.type_specifier = type_specifier
+        new._check_items()
+        return new
+
+    def _check_items(self):
+        if self.type_specifier == "UNTYPED":
+            return
+        items = self._items
+        if isinstance(items, NumberArray) and items.box is types.get(self.type_specifier):
+            return
+        for item in items:
+            try:
+                self.check_type(item)
+            except:
+                self.cast_items()
+        packed = pack_numbers(self._items, self.type_specifier)
+        if packed is not self._items:
+            self._items = packed
+            self._shared = False
+
+    def _own(self):
+        if self._shared:
+            if isinstance(self._items, NumberArray):
+                self._items = self._items.copy()
+            else:
+                self._items = [item.copy() if isinstance(item, (Muni_List, Muni_Dict)) else item for item in self._items]
+            self._shared = False
+
+    def _unpack(self):
+        # Called when the array storage cannot hold a value, keeps boxed items from now on
+        self._items = list(self._items)
+        self._shared = False
     
     def __add__(self, other):
         if isinstance(other, Muni_List):
-            return Muni_List(self.value + other.value, self.type_specifier)
+            return Muni_List(self._items + other._items, self.type_specifier)
         elif isinstance(other, Muni_Dict):
-            new_list = deepcopy(self)
+            new_list = self.copy()
             new_list.append(other)
             return new_list
     
         try:
-            return Muni_List(self.value + [other.copy()], self.type_specifier)
+            return Muni_List(self._items + [other.copy()], self.type_specifier)
         except Exception as e:
             raise Muni_Error("Unsupported operand type(s) for +: 'Muni_List' and '{}'".format(type(other).__name__))
 
+    def __mul__(self, other):
+        if isinstance(other, (Muni_Int, Muni_Float)):
+            from muni_vector import elementwise
+            return elementwise(self, other, '*')
+        raise Muni_Error("Unsupported operand type(s) for *: 'Muni_List' and '{}'".format(type(other).__name__))
+
+    def __truediv__(self, other):
+        if isinstance(other, (Muni_Int, Muni_Float)):
+            from muni_vector import elementwise
+            return elementwise(self, other, '/')
+        raise Muni_Error("Unsupported operand type(s) for /: 'Muni_List' and '{}'".format(type(other).__name__))
+
     def __sub__(self, other):
         try:
-            return Muni_List([item for item in self.value if item != other], self.type_specifier)
+            return Muni_List([item for item in self._items if item != other], self.type_specifier)
         except Exception as e:
             raise Muni_Error("Unsupported operand type(s) for -: 'Muni_List' and '{}'".format(type(other).__name__))
 
     def append(self, item):
         self.check_type(item)    
-        self.value.append(item)
+        self._own()
+        try:
+            self._items.append(copy_value(item))
+        except (OverflowError, TypeError):
+            self._unpack()
+            self._items.append(copy_value(item))
         
     
     def remove(self, item):
-        self.value.remove(item)
+        self._own()
+        self._items.remove(item)
 
     def get_item(self, index):
-        return self.value[int(index)]
+        item = self._items[int(index)]
+        if self._shared and isinstance(item, (Muni_List, Muni_Dict)):
+            self._own()
+            item = self._items[int(index)]
+        return item
     
     def set_item(self, index, item):
         self.check_type(item)
-        self.value[int(index)] = item
+        self._own()
+        try:
+            self._items[int(index)] = copy_value(item)
+        except (OverflowError, TypeError):
+            self._unpack()
+            self._items[int(index)] = copy_value(item)
 
     def __getitem__(self, index):
         return self.get_item(index)
@@ -494,10 +668,16 @@ class Muni_List(Muni_Type):
     
     def insert(self, index, item):
         self.check_type(item)
-        self.value.insert(int(index), item)
+        self._own()
+        try:
+            self._items.insert(int(index), copy_value(item))
+        except (OverflowError, TypeError):
+            self._unpack()
+            self._items.insert(int(index), copy_value(item))
 
     def pop(self, index=-1):
-        return self.value.pop(int(index))    
+        self._own()
+        return self._items.pop(int(index))    
     
     
     
@@ -508,48 +688,144 @@ class Muni_List(Muni_Type):
             raise Muni_Error(f"Expected type {types[self.type_specifier]}, got {type(item)}")
     def cast_items(self):
         my_type = types[self.type_specifier]
+        self._own()
+
+        if isinstance(self._items, NumberArray):
+            if self._items.box is my_type:
+                return
+            self._unpack()
 
-        for i in range(len(self.value)):
-            if not isinstance(self.value[i], my_type):
-                self.value[i] = my_type(self.value[i])
+        for i in range(len(self._items)):
+            if not isinstance(self._items[i], my_type):
+                self._items[i] = my_type(self._items[i])
 
             
     def __list__(self):
         return self.value
 
     def __iter__(self):
-        return iter(self.value)
+        # Loop variables are the elements themselves
+        if self._shared and not isinstance(self._items, NumberArray):
+            self._own()
+        return iter(self._items)
     
     def __len__(self):
-        return len(self.value)
+        return len(self._items)
 
 
     def __str__(self):
         try:
-            return f"<{types[self.type_specifier].symbol()}>[{', '.join(str(item) for item in self.value)}]"
+            return f"<{types[self.type_specifier].symbol()}>[{', '.join(str(item) for item in self._items)}]"
         except Exception as e:
-            return f"<{self.type_specifier}>[{', '.join(str(item) for item in self.value)}]"
+            return f"<{self.type_specifier}>[{', '.join(str(item) for item in self._items)}]"
 
     # Add more list-specific methods like remove, get, etc.
     def symbol(self):
         return f'list<{self.type_specifier}>'
 
+class Muni_Range(Muni_List):
+    """The list of ints produced by `a..b` and `a...b:step`, built lazily.
+
+    Iterating, indexing and taking the length work from the python range and
+    box one Muni_Int at a time. Anything that needs the actual storage (a
+    mutation, `.value`, a cast to a typed list) materializes it once, after
+    which the range behaves exactly like a Muni_List.
+    """
+
+    def __init__(self, start, stop, step=1):
+        self._range = range(start, stop, step)
+        self._list = None
+        self._shared = False
+        self.type_specifier = "INT"
+        self.id = id(self)
+
+    @property
+    def _items(self):
+        if self._list is None:
+            try:
+                self._list = NumberArray(Muni_Int, array('q', self._range))
+            except OverflowError:
+                self._list = [Muni_Int(x) for x in self._range]
+        return self._list
+
+    @_items.setter
+    def _items(self, items):
+        self._list = items
+
+    def get_item(self, index):
+        if self._list is None:
+            return Muni_Int(self._range[int(index)])
+        return self._list[int(index)]
+
+    def __iter__(self):
+        if self._list is None:
+            return map(Muni_Int, self._range)
+        return iter(self._list)
+
+    def __len__(self):
+        if self._list is None:
+            return len(self._range)
+        return len(self._list)
+
+    def __str__(self):
+        try:
+            return f"<{types[self.type_specifier].symbol()}>[{', '.join(str(item) for item in self)}]"
+        except Exception as e:
+            return f"<{self.type_specifier}>[{', '.join(str(item) for item in self)}]"
+
 class Muni_Dict(Muni_Type):
+    """A dict with the same copy-on-write value semantics as Muni_List."""
+
     def __init__(self, dict_values=None, key_type_specifier='UNTYPED', value_type_specifier='UNTYPED'):
         if not isinstance(dict_values, dict):
             raise Muni_Error(f"Muni_Dict requires a dict value, got {type(dict_values)}")
         super().__init__(dict_values if dict_values is not None else {})
+        self._shared = False
         self.key_type_specifier = key_type_specifier
         self.value_type_specifier = value_type_specifier
         for key, value in dict_values.items():
             self.check_type(key, value)
 
+    @property
+    def value(self):
+        self._shared = True
+        return self._items
+
+    @value.setter
+    def value(self, items):
+        self._items = items
+        self._shared = True
+
+    def copy(self):
+        self._shared = True
+        return super().copy()
+
+    def retyped(self, key_type_specifier, value_type_specifier):
+        """Return a dict sharing this one's storage, checked against the given types."""
+        new = self.copy()
+        new.id = id(new)
+        new.key_type_specifier = key_type_specifier
+        new.value_type_specifier = value_type_specifier
+        for key, value in new._items.items():
+            new.check_type(key, value)
+        return new
+
+    def _own(self):
+        if self._shared:
+            self._items = {key: value.copy() if isinstance(value, (Muni_List, Muni_Dict)) else value for key, value in self._items.items()}
+            self._shared = False
+
     def set_item(self, key, value):
         self.check_type(key, value)
-        self.value[key] = value
+        self._own()
+        self._items[copy_value(key)] = copy_value(value)
 
     def get_item(self, key):
-        return self.value.get(key, Muni_Void())
+        item = self._items.get(key, Muni_Void())
+        if self._shared and isinstance(item, (Muni_List, Muni_Dict)):
+            self._own()
+            item = self._items[key]
+        return item
     
     def __getitem__(self, key):
         return self.get_item(key)
@@ -559,20 +835,21 @@ class Muni_Dict(Muni_Type):
 
 
     def remove_item(self, key):
-        if key in self.value:
-            del self.value[key]
+        if key in self._items:
+            self._own()
+            del self._items[key]
 
     def contains_key(self, key):
-        return Muni_Boolean(key in self.value)
+        return Muni_Boolean(key in self._items)
 
     def keys(self):
-        return Muni_List(list(self.value.keys()))
+        return Muni_List(list(self._items.keys()))
 
     def values(self):
-        return Muni_List(list(self.value.values()))
+        return Muni_List([copy_value(value) for value in self._items.values()])
 
     def items(self):
-        return Muni_List([Muni_List([k, v]) for k, v in self.value.items()])
+        return Muni_List([Muni_List([k, copy_value(v)]) for k, v in self._items.items()])
     
     def check_type(self, key, value):
         if self.key_type_specifier != "UNTYPED" and not isinstance(key, types[self.key_type_specifier]):
@@ -584,12 +861,9 @@ class Muni_Dict(Muni_Type):
 
 
     def __iter__(self):
-        return iter(self.value)
+        return iter(self._items)
     def __str__(self):
-        return f"{{{' '.join(f'{k}: {v}' for k, v in self.value.items())}}}"
-
-    def __dict__(self):
-        return self.value
+        return f"{{{' '.join(f'{k}: {v}' for k, v in self._items.items())}}}"
 
     def symbol(self):
         return 'dict<{}, {}>'.format(self.key_type_specifier, self.value_type_specifier)
@@ -0,0 +1,186 @@
+import operator as py_operator
+from array import array
+from itertools import repeat
+from muni_types import *
+from muni_error import *
+
+# numpy is only imported the first time a vector operation needs it, so
+# programs that never touch lists of numbers don't pay for it at startup
+numpy = None
+numpy_loaded = False
+
+
+def load_numpy():
+    global numpy, numpy_loaded
+    if not numpy_loaded:
+        numpy_loaded = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+
+python_operators = {
+    '+': py_operator.add,
+    '-': py_operator.sub,
+    '*': py_operator.mul,
+    '/': py_operator.truediv,
+    '%': py_operator.mod,
+    '>': py_operator.gt,
+    '<': py_operator.lt,
+    '==': py_operator.eq,
+    '>=': py_operator.ge,
+    '<=': py_operator.le,
+    '!=': py_operator.ne,
+}
+
+comparison_operators = {'>', '<', '==', '>=', '<=', '!='}
+
+# numpy works on 64 bit ints, so ints only go through it below 2**31, where
+# no +, -, * or % of two operands can wrap around
+INT_LIMIT = 2 ** 31
+
+
+def numbers(values):
+    """Return the python numbers of a numeric Muni list and whether any is a float."""
+    if isinstance(values, Muni_Range) and values._list is None:
+        return values._range, False
+    items = values._items
+    if isinstance(items, NumberArray):
+        return items.data, items.box is Muni_Float
+    is_float = False
+    for item in items:
+        item_type = type(item)
+        if item_type is Muni_Float:
+            is_float = True
+        elif item_type is not Muni_Int:
+            raise Muni_Error(f"Expected a list of numbers, got {item_type.__name__}")
+    return [item.value for item in items], is_float
+
+
+def operand(value):
+    if isinstance(value, Muni_List):
+        return numbers(value)
+    if isinstance(value, (Muni_Int, Muni_Float)):
+        return value.value, isinstance(value, Muni_Float)
+    raise Muni_Error(f"Expected a number or a list of numbers, got {type(value).__name__}")
+
+
+def is_sequence(value):
+    return isinstance(value, (list, array, range))
+
+
+def make_list(values, is_float):
+    box = Muni_Float if is_float else Muni_Int
+    type_specifier = "FLOAT" if is_float else "INT"
+    try:
+        return Muni_List(NumberArray(box, array('d' if is_float else 'q', values)), type_specifier)
+    except OverflowError:
+        return Muni_List([box(value) for value in values], type_specifier)
+
+
+def to_numpy(values):
+    if isinstance(values, range):
+        return numpy.arange(values.start, values.stop, values.step, dtype=numpy.int64)
+    if isinstance(values, array):
+        return numpy.frombuffer(values, dtype=numpy.float64 if values.typecode == 'd' else numpy.int64)
+    return numpy.array(values)
+
+
+def fits_numpy(values, is_float):
+    if is_float:
+        return True
+    if is_sequence(values):
+        return len(values) == 0 or int(numpy.abs(to_numpy(values)).max()) < INT_LIMIT
+    return abs(values) < INT_LIMIT
+
+
+def elementwise(left, right, operator):
+    """Apply a binary or comparison operator item by item.
+
+    Either side can be a scalar, which is used against every item of the
+    other. Two lists must have the same length. Arithmetic gives an INT or
+    FLOAT list following the scalar rules, comparisons give a list of
+    booleans.
+    """
+    left_values, left_float = operand(left)
+    right_values, right_float = operand(right)
+    if is_sequence(left_values) and is_sequence(right_values) and len(left_values) != len(right_values):
+        raise Muni_Error(f"Vector length mismatch: {len(left_values)} and {len(right_values)}")
+    if operator not in python_operators:
+        raise Muni_Error(f"Unknown binary operator: {operator}")
+
+    if operator in ('/', '%'):
+        if (right_values == 0) if not is_sequence(right_values) else (0 in right_values):
+            raise Muni_Error("Division by zero")
+
+    is_float = left_float or right_float or operator == '/'
+    if load_numpy() is not None and fits_numpy(left_values, left_float) and fits_numpy(right_values, right_float):
+        result = python_operators[operator](
+            to_numpy(left_values) if is_sequence(left_values) else left_values,
+            to_numpy(right_values) if is_sequence(right_values) else right_values)
+        if operator in comparison_operators:
+            return Muni_List([Muni_Boolean(bool(value)) for value in result], "BOOLEAN")
+        result = result.astype(numpy.float64 if is_float else numpy.int64)
+        values = array('d' if is_float else 'q')
+        values.frombytes(result.tobytes())
+        return make_list(values, is_float)
+
+    function = python_operators[operator]
+    if not is_sequence(left_values):
+        result = map(function, repeat(left_values), right_values)
+    elif not is_sequence(right_values):
+        result = map(function, left_values, repeat(right_values))
+    else:
+        result = map(function, left_values, right_values)
+    if operator in comparison_operators:
+        return Muni_List([Muni_Boolean(value) for value in result], "BOOLEAN")
+    if is_float:
+        return make_list(map(float, result), True)
+    return make_list(list(result), False)
+
+
+def box_number(value, is_float):
+    return Muni_Float(float(value)) if is_float else Muni_Int(int(value))
+
+
+def total(values):
+    data, is_float = numbers(values)
+    if is_float and len(data) and load_numpy() is not None:
+        return Muni_Float(float(to_numpy(data).sum()))
+    return box_number(sum(data), is_float)
+
+
+def minimum(values):
+    data, is_float = numbers(values)
+    if not len(data):
+        raise Muni_Error("min() of an empty list")
+    return box_number(min(data), is_float)
+
+
+def maximum(values):
+    data, is_float = numbers(values)
+    if not len(data):
+        raise Muni_Error("max() of an empty list")
+    return box_number(max(data), is_float)
+
+
+def mean(values):
+    data, is_float = numbers(values)
+    if not len(data):
+        raise Muni_Error("mean() of an empty list")
+    if is_float and load_numpy() is not None:
+        return Muni_Float(float(to_numpy(data).mean()))
+    return Muni_Float(sum(data) / len(data))
+
+
+def dot(left, right):
+    left_data, left_float = numbers(left)
+    right_data, right_float = numbers(right)
+    if len(left_data) != len(right_data):
+        raise Muni_Error(f"Vector length mismatch: {len(left_data)} and {len(right_data)}")
+    is_float = left_float or right_float
+    if is_float and load_numpy() is not None:
+        return Muni_Float(float(numpy.dot(to_numpy(left_data), to_numpy(right_data))))
+    return box_number(sum(map(py_operator.mul, left_data, right_data)), is_float)
@@ -0,0 +1,403 @@
+from muni_types import *
+from muni_ast_nodes import *
+from muni_error import *
+from muni_bytecode import *
+from muni_runtime import Runtime, ReturnException, Frame, UNBOUND
+
+
+class VMRuntime(Runtime):
+    """Runtime that compiles programs to bytecode and runs them on a stack VM.
+
+    Top-level statements, handler bodies and Muni function bodies each get
+    their own Code object, compiled once and cached. Scopes, signals, casts
+    and imports are shared with the tree-walking runtime.
+    """
+
+    def __init__(self, module_registry=None):
+        super().__init__(module_registry)
+        self.codes = {}
+        self.function_codes = {}
+        self.binary_functions = [self.binary_function(operator) for operator in binary_operators]
+        self.comparison_functions = [self.comparison_function(operator) for operator in comparison_operators]
+
+    def set_vectorize(self, vectorize):
+        super().set_vectorize(vectorize)
+        self.binary_functions = [self.binary_function(operator) for operator in binary_operators]
+        self.comparison_functions = [self.comparison_function(operator) for operator in comparison_operators]
+
+    def binary_function(self, operator):
+        apply_binary_operator = self.apply_binary_operator
+        if self.vectorize:
+            return lambda left, right: apply_binary_operator(left, right, operator)
+        if operator == '+': return lambda left, right: left + right
+        if operator == '-': return lambda left, right: left - right
+        if operator == '*': return lambda left, right: left * right
+        if operator == '%': return lambda left, right: left % right
+        return lambda left, right: apply_binary_operator(left, right, operator)
+
+    def comparison_function(self, operator):
+        if self.vectorize:
+            apply_comparison_operator = self.apply_comparison_operator
+            return lambda left, right: apply_comparison_operator(left, right, operator)
+        if operator == '>': return lambda left, right: left > right
+        if operator == '<': return lambda left, right: left < right
+        if operator == '==': return lambda left, right: left == right
+        if operator == '>=': return lambda left, right: left >= right
+        if operator == '<=': return lambda left, right: left <= right
+        return lambda left, right: left != right
+
+    def compile_statement(self, node):
+        entry = self.codes.get(id(node))
+        if entry is None:
+            entry = (node, BytecodeCompiler().compile_statement(node))
+            self.codes[id(node)] = entry
+        return entry[1]
+
+    def compile_function(self, function):
+        entry = self.function_codes.get(id(function.declaration))
+        if entry is None:
+            entry = (function.declaration, BytecodeCompiler().compile_function(function))
+            self.function_codes[id(function.declaration)] = entry
+        return entry[1]
+
+    def execute(self, ast):
+        statements = ast.statements if isinstance(ast, StatementList) else [ast]
+        for statement in statements:
+            self.compile_statement(statement)
+        for statement in statements:
+            self.context.set_runtime(self)
+            result = self.evaluate(statement)
+            self.flush_watches()
+            yield result
+
+    def release(self, statement):
+        self.codes.pop(id(statement), None)
+
+    def set_profiler(self, profiler):
+        # Bytecode has no nodes left to time
+        raise Muni_Error("The vm engine cannot be profiled, use the tree or closure engine")
+
+    def evaluate(self, node, debug=False):
+        if not isinstance(node, AstNode):
+            return super().evaluate(node, debug)
+        if debug: print(node)
+        if not self.is_running:
+            return
+        try:
+            return self.run(self.compile_statement(node))
+        except Muni_Error as error:
+            print(error)
+            self.error = error
+            self.is_running = False
+
+    def invoke(self, function, values):
+        stable_function = self.functions[function.name]
+        code = self.compile_function(function)
+        frame = Frame(function)
+        self.push_scope(frame)
+        try:
+            self.bind_parameters(function, values)
+            result = self.run(code, frame)
+        finally:
+            self.pop_scope()
+            self.functions[function.name] = stable_function
+        return self.function_result(result)
+
+    def run(self, code, frame=None):
+        ops = code.ops
+        consts = code.consts
+        names = code.names
+        scopes = self.scopes
+        watched = self.watched
+        # The parameters of a function are read straight from its frame
+        slots = frame.slots if frame is not None else None
+        get_variable = self.get_variable
+        functions = self.functions
+        binary_functions = self.binary_functions
+        comparison_functions = self.comparison_functions
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        try:
+            # Opcodes are tested group by group in the order of opnames, so
+            # the instructions of loops go through only a few comparisons
+            while True:
+                opcode = ops[pc]
+                arg = ops[pc + 1]
+                pc += 2
+                if opcode < LOOKUP_FUNCTION:
+                    # Loops and arithmetic
+                    if opcode == LOAD_NAME:
+                        name = names[arg]
+                        value = scopes[-1].get(name, UNBOUND)
+                        push(value if value is not UNBOUND else get_variable(name))
+                    elif opcode == COMPARE_JUMP_IF_FALSE:
+                        index, target, right = consts[arg]
+                        if right is None:
+                            right = pop()
+                        left = pop()
+                        kind = type(left)
+                        if kind is type(right) and kind in scalar_types:
+                            result = scalar_comparisons[index](left.value, right.value)
+                        else:
+                            result = comparison_functions[index](left, right)
+                        if not result:
+                            pc = target
+                    elif opcode == AUG_ASSIGN_CONST:
+                        name, operator, address, index, operand = consts[arg]
+                        # An int or a float updated with one of its own type is
+                        # changed in place, anything else goes through the runtime
+                        if not watched:
+                            variable = scopes[-1].get(name)
+                            kind = type(variable)
+                            if kind is type(operand) and kind in scalar_types:
+                                variable.value = scalar_binary[index](variable.value, operand.value)
+                                continue
+                        self.update_variable(name, operator, operand, address)
+                    elif opcode == JUMP_BACK:
+                        if not self.is_running:
+                            return None
+                        # The end of a loop iteration
+                        if self.pending_watches:
+                            self.flush_watches()
+                        pc = arg
+                    elif opcode == ASSIGN_BINARY:
+                        name, address, index, right = consts[arg]
+                        if right is None:
+                            right = pop()
+                        left = pop()
+                        kind = type(left)
+                        if kind is type(right) and kind in scalar_types and not watched:
+                            variable = scopes[-1].get(name)
+                            if type(variable) is kind:
+                                variable.value = scalar_binary[index](left.value, right.value)
+                                continue
+                        self.assign_variable(name, binary_functions[index](left, right), address)
+                    elif opcode == LOAD_CONST:
+                        push(consts[arg])
+                    elif opcode == LOAD_SLOT:
+                        name, address = consts[arg]
+                        value = slots[address[1]] if slots is not None else UNBOUND
+                        push(value if value is not UNBOUND else get_variable(name, address))
+                    elif opcode == BINARY_OP_CONST:
+                        index, right = consts[arg]
+                        left = stack[-1]
+                        kind = type(left)
+                        apply = scalar_binary[index]
+                        if apply is not None and kind is type(right) and kind in scalar_types:
+                            stack[-1] = kind(apply(left.value, right.value))
+                        else:
+                            stack[-1] = binary_functions[index](left, right)
+                    elif opcode == ASSIGN:
+                        name, address = consts[arg]
+                        value = pop()
+                        if not watched:
+                            variable = scopes[-1].get(name)
+                            kind = type(variable)
+                            if kind is type(value) and kind in scalar_types:
+                                variable.value = value.value
+                                continue
+                        self.assign_variable(name, value, address)
+                    elif opcode == BINARY_OP:
+                        right = pop()
+                        left = stack[-1]
+                        kind = type(left)
+                        apply = scalar_binary[arg]
+                        if apply is not None and kind is type(right) and kind in scalar_types:
+                            stack[-1] = kind(apply(left.value, right.value))
+                        else:
+                            stack[-1] = binary_functions[arg](left, right)
+                    elif opcode == AUG_ASSIGN_SCALAR:
+                        name, operator, address, index = consts[arg]
+                        operand = pop()
+                        if not watched:
+                            variable = scopes[-1].get(name)
+                            kind = type(variable)
+                            if kind is type(operand) and kind in scalar_types:
+                                variable.value = scalar_binary[index](variable.value, operand.value)
+                                continue
+                        self.update_variable(name, operator, operand, address)
+                elif opcode < EVAL_CONST:
+                    # Calls and branches
+                    if opcode == LOOKUP_FUNCTION:
+                        name = consts[arg]
+                        function = functions.get(name)
+                        if function is None:
+                            raise Muni_Error(f"Function Error: {name} not a function.")
+                        push(function)
+                    elif opcode == CALL:
+                        node_name, argc = consts[arg]
+                        values = stack[len(stack) - argc:]
+                        del stack[len(stack) - argc:]
+                        function = pop()
+                        if callable(function):
+                            if node_name in self.imported_functions:
+                                values = [to_standard_type(value) for value in values]
+                            if self.is_running == False:
+                                push(None)
+                            else:
+                                push(function(*values))
+                        else:
+                            push(self.invoke(function, values))
+                    elif opcode == RETURN_VALUE:
+                        return pop()
+                    elif opcode == POP_TOP:
+                        pop()
+                    elif opcode == DECLARE_SCALAR:
+                        name, type_specifier, address, declared_type = consts[arg]
+                        value = pop()
+                        # Declaring an existing variable of the same type only updates it
+                        variable = scopes[-1].get(name)
+                        if type(variable) is declared_type and type(value) is declared_type:
+                            variable.value = value.value
+                        else:
+                            self.define_variable(name, value, type_specifier, address=address)
+                    elif opcode == COMPARE_JUMP_IF_TRUE:
+                        index, target, right = consts[arg]
+                        if right is None:
+                            right = pop()
+                        left = pop()
+                        kind = type(left)
+                        if kind is type(right) and kind in scalar_types:
+                            result = scalar_comparisons[index](left.value, right.value)
+                        else:
+                            result = comparison_functions[index](left, right)
+                        if result:
+                            pc = target
+                    elif opcode == COMPARE_OP:
+                        right = pop()
+                        left = stack[-1]
+                        kind = type(left)
+                        if kind is type(right) and kind in scalar_types:
+                            stack[-1] = Muni_Boolean(scalar_comparisons[arg](left.value, right.value))
+                        else:
+                            stack[-1] = comparison_functions[arg](left, right)
+                    elif opcode == POP_JUMP_IF_FALSE:
+                        if not pop():
+                            pc = arg
+                    elif opcode == POP_JUMP_IF_TRUE:
+                        if pop():
+                            pc = arg
+                    elif opcode == JUMP:
+                        pc = arg
+                    elif opcode == LOAD_COPY:
+                        push(consts[arg].copy())
+                    elif opcode == SUBSCR:
+                        index = pop()
+                        stack[-1] = stack[-1].get_item(index)
+                    elif opcode == FOR_ITER:
+                        try:
+                            push(next(stack[-1]))
+                        except StopIteration:
+                            pop()
+                            pc = arg
+                    elif opcode == BIND_LOOP_VAR:
+                        name, type_specifier = consts[arg]
+                        self.bind_loop_variable(name, pop(), type_specifier)
+                    elif opcode == DECLARE:
+                        name, type_specifier, address = consts[arg]
+                        self.define_variable(name, pop(), type_specifier, address=address)
+                    elif opcode == AUG_ASSIGN:
+                        name, operator, address = consts[arg]
+                        self.update_variable(name, operator, pop(), address)
+                else:
+                    if opcode == EVAL_CONST:
+                        push(Runtime.evaluate(self, consts[arg]))
+                    elif opcode == LOGICAL_OP:
+                        right = pop()
+                        stack[-1] = self.apply_logical_operator(stack[-1], right, logical_operators[arg])
+                    elif opcode == NOT:
+                        stack[-1] = Muni_Boolean(not stack[-1])
+                    elif opcode == NEGATE:
+                        stack[-1] = -stack[-1]
+                    elif opcode == CAST:
+                        stack[-1] = self.perform_cast(consts[arg], stack[-1])
+                    elif opcode == RAISE_RETURN:
+                        raise ReturnException(pop())
+                    elif opcode == REPEAT:
+                        if stack[-1] > 0:
+                            stack[-1] -= 1
+                        else:
+                            pop()
+                            pc = arg
+                    elif opcode == GET_ITER:
+                        stack[-1] = iter(stack[-1])
+                    elif opcode == CASE_MATCH:
+                        case_value = pop()
+                        push(case_value == stack[-1])
+                    elif opcode == BUILD_LIST:
+                        items = stack[len(stack) - arg:] if arg else []
+                        del stack[len(stack) - arg:]
+                        push(Muni_List([copy_value(item) for item in items]))
+                    elif opcode == BUILD_DICT:
+                        items = stack[len(stack) - 2 * arg:] if arg else []
+                        del stack[len(stack) - 2 * arg:]
+                        push(Muni_Dict({copy_value(items[i]): copy_value(items[i + 1]) for i in range(0, len(items), 2)}))
+                    elif opcode == STORE_SUBSCR:
+                        value = pop()
+                        index = pop()
+                        self.assign_element(consts[arg], pop(), index, value)
+                        push(Muni_Void())
+                    elif opcode == BUILD_RANGE:
+                        step = pop()
+                        end = pop()
+                        stack[-1] = self.make_range(stack[-1], end, step, bool(arg))
+                    elif opcode == THROW:
+                        raise Muni_Error(pop())
+                    elif opcode == LOAD_ARG:
+                        push(self.get_argument(arg))
+                    elif opcode == LOAD_DOT:
+                        node = consts[arg]
+                        push(self.evaluate(self.modules[node.container.name][node.attribute]))
+                    elif opcode == DEFINE_FUNCTION:
+                        self.define_function(consts[arg])
+                        push(Muni_Void())
+                    elif opcode == DEFINE_MODULE:
+                        self.define_module(consts[arg])
+                        push(Muni_Void())
+                    elif opcode == IMPORT:
+                        push(self.handle_import(consts[arg]))
+                    elif opcode == DEFINE_SIGNAL:
+                        self.define_signal(names[arg])
+                        push(Muni_Void())
+                    elif opcode == EMIT:
+                        self.emit_signal(names[arg])
+                        push(Muni_Void())
+                    elif opcode == WHEN:
+                        self.assign_signal(*consts[arg])
+                        push(Muni_Void())
+                    elif opcode == WATCH:
+                        self.assign_watching(*consts[arg])
+                        push(Muni_Void())
+                    elif opcode == PARALLEL_FOR:
+                        stack[-1] = self.run_parallel_for(consts[arg], stack[-1])
+                    else:
+                        raise Muni_Error(f"Unknown opcode: {opcode}")
+        except Muni_Error as error:
+            # Errors raised by nested code already carry their own line
+            if not getattr(error, 'located', False):
+                error.line = code.line_at(pc - 2)
+                error.located = True
+            raise
+
+
+def disassemble_program(ast, file=None):
+    """Print the bytecode of every top-level statement and Muni function in a program."""
+    statements = ast.statements if isinstance(ast, StatementList) else [ast]
+    functions = []
+    for statement in statements:
+        disassemble(BytecodeCompiler().compile_statement(statement), file)
+        collect_functions(statement, functions)
+    for function in functions:
+        disassemble(BytecodeCompiler().compile_function(function), file)
+
+
+def collect_functions(node, functions):
+    if isinstance(node, FunctionDeclaration):
+        functions.append(node)
+        for statement in node.body:
+            collect_functions(statement, functions)
+    elif isinstance(node, ModuleDeclaration):
+        for statement in node.body:
+            collect_functions(statement, functions)
@@ -1,61 +1,288 @@
+import time
+started = time.perf_counter()
 import sys
 from muni_types import *
 from muni_parser import *
 from muni_runtime import Runtime
+from muni_scheduler import SCHEDULERS, create_scheduler
+import muni_cache
+import importlib
+import os
 from muni_ast_nodes import *
 import argparse
 import sys
-from muni_lexer import lexer
+imported = time.perf_counter()
 
 
-def run_program(ast, args=[]):
-    runtime = Runtime()
+# The other engines are only imported when they are picked
+engines = {
+    "tree": ("muni_runtime", "Runtime"),
+    "closure": ("muni_compiler", "ClosureRuntime"),
+    "vm": ("muni_vm", "VMRuntime"),
+}
+
+
+def create_runtime(engine="tree", vectorize=False, scheduler=None, coalesce_watches=False, parallel_workers=None):
+    if engine not in engines:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(engines)}")
+    module_name, class_name = engines[engine]
+    runtime = getattr(importlib.import_module(module_name), class_name)()
+    if vectorize:
+        runtime.set_vectorize(True)
+    if scheduler is not None:
+        runtime.set_scheduler(scheduler)
+    if coalesce_watches:
+        runtime.set_coalesce_watches(True)
+    if parallel_workers is not None:
+        runtime.set_parallel_workers(parallel_workers)
+    return runtime
+
+
+def run_program(ast, args=[], engine="tree", vectorize=False):
+    runtime = create_runtime(engine, vectorize)
     runtime.set_args(args)
-    if isinstance(ast, StatementList):
-        for stmt in ast.statements:
-            runtime.evaluate(stmt)
-    else:
-        runtime.evaluate(ast)
+    for _ in runtime.execute(ast):
+        pass
+
+def run_program_with_results(ast, engine="tree", vectorize=False, scheduler=None, coalesce_watches=False):
+    runtime = create_runtime(engine, vectorize, scheduler, coalesce_watches)
+    for result in runtime.execute(ast):
+        yield str(result)
+
+def run(code, engine="tree", vectorize=False, optimize=False, scheduler=None, coalesce_watches=False):
+    ast = parse(code)
+    if optimize:
+        from muni_optimizer import optimize as optimize_ast
+        ast, _ = optimize_ast(ast)
+    return run_program_with_results(ast, engine, vectorize, scheduler, coalesce_watches)
+
+def optimize_program(ast):
+    from muni_optimizer import optimize as optimize_ast
+    ast, removed = optimize_ast(ast)
+    print(f"Optimizer removed {removed} nodes", file=sys.stderr)
+    return ast
+
+def load_program(file_path, optimize=False):
+    ast = parse_file(file_path)
+    if optimize:
+        ast = optimize_program(ast)
+    return ast
+
+def run_stream(file_path, args=[], engine="tree", vectorize=False, optimize=False, scheduler=None, coalesce_watches=False, parallel_workers=None):
+    # Statements run as they are read and are dropped once they have run
+    from muni_stream import stream_statements
+    if optimize:
+        from muni_optimizer import optimize as optimize_ast
+    runtime = create_runtime(engine, vectorize, scheduler, coalesce_watches, parallel_workers)
+    runtime.set_args(args)
+    for statement in stream_statements(file_path):
+        program = StatementList(statements=[statement], lineno=0)
+        if optimize:
+            program, _ = optimize_ast(program)
+        for _ in runtime.execute(program):
+            pass
+        runtime.release(statement)
+        if not runtime.is_running:
+            break
+
+def print_handler_stats(args, scheduler):
+    if args.handler_stats:
+        if not args.drop_pending_handlers:
+            scheduler.wait()
+        scheduler.report()
+
+def print_profile(args, runtime):
+    # The handlers still running are part of the program
+    if not args.drop_pending_handlers:
+        runtime.scheduler.wait()
+    if args.profile:
+        runtime.profiler.report()
+    if args.profile_stacks is not None:
+        runtime.profiler.write_collapsed(args.profile_stacks)
 
-def run_program_with_results(ast):
-    runtime = Runtime()
-    if isinstance(ast, StatementList):
-        for stmt in ast.statements:
-            yield str(runtime.evaluate(stmt))
+def print_startup_stats(phases, file=sys.stderr):
+    print("Startup before the first statement:", file=file)
+    for label, seconds in phases:
+        print(f"  {label:<22}{seconds * 1000:9.2f} ms", file=file)
+
+def bench(args):
+    import muni_bench
+    names = args.bench + ([args.file] if args.file else [])
+    results = muni_bench.run_benchmarks(names, args.engine, args.vectorize, args.bench_repeat, not args.bench_warm_only,
+                                        progress=lambda name: print(f"Running {name}...", file=sys.stderr))
+    muni_bench.print_results(results)
+    if args.bench_json is not None:
+        muni_bench.write_results(results, args.bench_json)
+    if args.bench_check is None:
+        return False
+    path = args.bench_check or muni_bench.BASELINE_PATH
+    timings_path = muni_bench.timings_path(path)
+    if args.bench_update:
+        muni_bench.record_timings(results, timings_path)
+        print(f"Saved the timings of this machine in {timings_path}")
+        return False
+    baseline = muni_bench.load_results(path)
+    timings = None
+    if os.path.exists(timings_path):
+        timings = muni_bench.load_results(timings_path)
+        problem = muni_bench.mismatch(timings, results)
+        if problem is not None:
+            raise ValueError(f"{timings_path} was recorded {problem}, record it again with --bench-check --bench-update")
     else:
-        yield str(runtime.evaluate(ast))
+        print(f"No timings recorded on this machine in {timings_path}, only the outputs are checked, record them with --bench-check --bench-update", file=sys.stderr)
+    rows = muni_bench.check(results, baseline, timings,
+                            lambda names: muni_bench.run_benchmarks(names, args.engine, args.vectorize, args.bench_repeat, not args.bench_warm_only,
+                                                                    progress=lambda name: print(f"Running {name} again...", file=sys.stderr)))
+    print()
+    muni_bench.print_comparison(rows, path)
+    return muni_bench.failed(rows)
+
+def serve(args):
+    from muni_server import ScriptServer
+
+    def make_runtime():
+        scheduler = create_scheduler(args.handlers, args.handler_workers, args.handler_queue, not args.drop_pending_handlers)
+        return create_runtime(args.engine, args.vectorize, scheduler, args.coalesce_watch, args.parallel_workers)
 
-def run(code):
-    ast = parser.parse(code)
-    return run_program_with_results(ast) 
+    server = ScriptServer(args.serve, make_runtime, lambda path: load_program(path, args.optimize), args.serve_pool, args.handler_stats)
+    server.serve_forever()
 
 def main():
     argparser = argparse.ArgumentParser(description='Muni Programming Language Interpreter')
-    argparser.add_argument('file', help='the Muni source file to interpret')
+    argparser.add_argument('file', nargs='?', help='the Muni source file to interpret')
     argparser.add_argument('-l', '--lexer', action='store_true', help='print the lexer output')
     argparser.add_argument('-p', '--parser', action='store_true', help='print the parser output')
+    argparser.add_argument('-e', '--engine', choices=list(engines), default='tree', help='the execution engine (default: tree)')
+    argparser.add_argument('--dis', action='store_true', help='print the bytecode disassembly')
+    argparser.add_argument('--vectorize', action='store_true', help='apply arithmetic and comparisons on lists item by item')
+    argparser.add_argument('-O', '--optimize', action='store_true', help='fold constants and prune dead branches before running')
+    argparser.add_argument('--parser-engine', choices=PARSERS, default=None, help='the parser reading the sources (default: lalr, pratt with --stream)')
+    argparser.add_argument('--stream', action='store_true', help='read the file memory-mapped and run each top-level statement as soon as it is parsed')
+    argparser.add_argument('--handlers', choices=SCHEDULERS, default='threads', help='run signal and watch handlers on a pool of threads, or as asyncio tasks on one event loop (default: threads)')
+    argparser.add_argument('--handler-workers', type=int, default=None, metavar='N', help='threads running signal and watch handlers with --handlers threads (default: CPU count + 4, at most 32)')
+    argparser.add_argument('--handler-queue', type=int, default=1024, metavar='N', help='handlers that can wait for a thread before emitting blocks (default: 1024)')
+    argparser.add_argument('--drop-pending-handlers', action='store_true', help='exit without waiting for the signal and watch handlers still queued')
+    argparser.add_argument('--handler-stats', action='store_true', help='print handler counts, queue depth and latencies when the program ends')
+    argparser.add_argument('--coalesce-watch', action='store_true', help='run a watch block once per loop iteration or statement that changed its variable, instead of once per change')
+    argparser.add_argument('--parallel-workers', type=int, default=None, metavar='N', help='processes running the iterations of parallel for loops, 1 runs them in the program (default: CPU count)')
+    argparser.add_argument('--serve', metavar='SOCKET', help='stay running and run the scripts muni_client.py sends over this Unix socket, with the other options given here')
+    argparser.add_argument('--serve-pool', type=int, default=None, metavar='N', help='warm runtimes waiting for scripts with --serve (default: CPU count)')
+    argparser.add_argument('--profile', action='store_true', help='print the time spent on each line, node type and function when the program ends (tree and closure engines)')
+    argparser.add_argument('--profile-stacks', metavar='FILE', help='profile and write the stacks of functions and lines in the collapsed format of flamegraph tools')
+    argparser.add_argument('--bench', nargs='*', metavar='NAME', help='time the programs of benchmarks/, or the ones named, warm in this process and cold in new ones')
+    argparser.add_argument('--bench-repeat', type=int, default=5, metavar='N', help='timed runs of each benchmark, warm and cold (default: 5)')
+    argparser.add_argument('--bench-warm-only', action='store_true', help='skip the cold runs of --bench')
+    argparser.add_argument('--bench-json', metavar='FILE', help='save the --bench results to FILE as JSON')
+    argparser.add_argument('--bench-check', nargs='?', const='', metavar='BASELINE', help='run the benchmarks and exit with an error when one prints something else than BASELINE or is slower than the timings recorded on this machine allow (default: benchmarks/baseline.json)')
+    argparser.add_argument('--bench-update', action='store_true', help='with --bench-check, record the timings of this machine next to BASELINE')
+    argparser.add_argument('--no-cache', action='store_true', help=f'always parse sources instead of using {muni_cache.CACHE_DIRECTORY}')
+    argparser.add_argument('--startup-stats', action='store_true', help='print where the time goes before the first statement runs')
+    argparser.add_argument('--clear-cache', action='store_true', help=f'remove the {muni_cache.CACHE_DIRECTORY} directory next to the file, or in the current directory, and exit')
 
     args, remaining_args = argparser.parse_known_args()
 
-    with open(args.file, 'r') as file:
-        content = file.read()
+    if args.stream and args.parser_engine == 'lalr':
+        argparser.error("--stream parses each statement as it is read, which only the pratt parser can do")
+    set_parser(args.parser_engine or 'lalr')
+    if args.no_cache:
+        muni_cache.set_enabled(False)
+
+    if args.clear_cache:
+        muni_cache.clear_cache(os.path.dirname(os.path.abspath(args.file)) if args.file else '.')
+        return
+
+    if args.parallel_workers is not None and args.parallel_workers < 1:
+        argparser.error("--parallel-workers needs at least one process")
+
+    profiling = args.profile or args.profile_stacks is not None
+    if profiling and args.engine == 'vm':
+        argparser.error("--profile needs the tree or closure engine")
+    if profiling and (args.stream or args.serve is not None):
+        argparser.error("--profile cannot be used with --stream or --serve")
+
+    if args.bench_check is not None and args.bench is None:
+        args.bench = []
+    if args.bench_update and args.bench_check is None:
+        argparser.error("--bench-update needs --bench-check")
+    if args.bench is not None:
+        if args.bench_repeat < 1:
+            argparser.error("--bench-repeat needs at least one run")
+        try:
+            regressed = bench(args)
+        except ValueError as error:
+            argparser.error(str(error))
+        sys.exit(1 if regressed else 0)
+
+    if args.serve is not None:
+        if args.serve_pool is not None and args.serve_pool < 1:
+            argparser.error("--serve-pool needs at least one runtime")
+        try:
+            create_scheduler(args.handlers, args.handler_workers, args.handler_queue)
+        except ValueError as error:
+            argparser.error(str(error))
+        serve(args)
+        return
+
+    if args.file is None:
+        argparser.error("the following arguments are required: file")
 
     if args.lexer:
+        with open(args.file, 'r') as file:
+            content = file.read()
         lexer.input(content)
         for token in lexer:
             print(token)
 
     if args.parser:
-        ast = parser.parse(content)
+        ast = load_program(args.file, args.optimize)
         print(ast)
 
-    input_strings = sys.argv[2:]
+    if args.dis:
+        from muni_vm import disassemble_program
+        ast = load_program(args.file, args.optimize)
+        disassemble_program(ast)
+
+    input_strings = remaining_args
+    try:
+        scheduler = create_scheduler(args.handlers, args.handler_workers, args.handler_queue, not args.drop_pending_handlers)
+    except ValueError as error:
+        argparser.error(str(error))
+
+    if args.stream and not args.lexer and not args.parser and not args.dis:
+        run_stream(args.file, input_strings, args.engine, args.vectorize, args.optimize, scheduler, args.coalesce_watch, args.parallel_workers)
+        print_handler_stats(args, scheduler)
+        return
+
+    if not args.lexer and not args.parser and not args.dis:
+        phase_started = time.perf_counter()
+        ast = parse_file(args.file)
+        parsed = time.perf_counter()
+        if args.optimize:
+            ast = optimize_program(ast)
+        optimized = time.perf_counter()
+        runtime = create_runtime(args.engine, args.vectorize, scheduler, args.coalesce_watch, args.parallel_workers)
+        runtime.set_args(input_strings)
+        if profiling:
+            from muni_profiler import Profiler
+            runtime.set_profiler(Profiler(runtime))
+        ready = time.perf_counter()
 
-    
+        if args.startup_stats:
+            print_startup_stats([
+                ("imports", imported - started),
+                ("  parser tables", table_time),
+                ("arguments", phase_started - imported),
+                ("parse (cache hit)" if muni_cache.last_hit else "parse", parsed - phase_started),
+                ("optimize", optimized - parsed),
+                (f"{args.engine} runtime setup", ready - optimized),
+                ("total", ready - started),
+            ])
 
-    if not args.lexer and not args.parser:
-        ast = parser.parse(content)
-        run_program(ast, args=input_strings)  
+        for _ in runtime.execute(ast):
+            pass
+        print_handler_stats(args, scheduler)
+        if profiling:
+            print_profile(args, runtime)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,9 +1,11 @@
 from muni_types import *
 import codecs
 import random
-from muni_parser import parser
+from muni_parser import parse
 from muni_runtime import Runtime
+from muni_context_manager import ContextManager
 from muni_ast_nodes import StatementList
+import muni_vector
 
 def muni_print(value):
     print(codecs.decode(str(value), 'unicode_escape'))
@@ -29,6 +31,21 @@ def muni_write(filename, content):
 def muni_sort(values):
     return sorted(values)
 
+def muni_sum(values):
+    return muni_vector.total(values)
+
+def muni_min(values):
+    return muni_vector.minimum(values)
+
+def muni_max(values):
+    return muni_vector.maximum(values)
+
+def muni_mean(values):
+    return muni_vector.mean(values)
+
+def muni_dot(left, right):
+    return muni_vector.dot(left, right)
+
 def muni_join(values, sep):
     return str(sep).join(str(v) for v in values)
 
@@ -45,11 +62,20 @@ def muni_shuffle(values):
 def muni_run_program(program, args=[]):
     program = str(program)
     args = [str(arg) for arg in list(args)]
-    ast = parser.parse(program)
-    runtime = Runtime()
+    ast = parse(program)
+    # Files the calling program imported are not run again, and its handler
+    # pool runs the handlers of both
+    caller = ContextManager().get_runtime()
+    runtime = Runtime(caller.module_registry if caller is not None else None)
+    if caller is not None:
+        runtime.set_scheduler(caller.scheduler)
     runtime.set_args(args)
-    if isinstance(ast, StatementList):
-        for stmt in ast.statements:
-            runtime.evaluate(stmt)
-    else:
-        runtime.evaluate(ast)   
\ No newline at end of file
+    try:
+        if isinstance(ast, StatementList):
+            for stmt in ast.statements:
+                runtime.evaluate(stmt)
+        else:
+            runtime.evaluate(ast)
+    finally:
+        # The new runtime made itself the current one
+        ContextManager().set_runtime(caller)   
\ No newline at end of file
@@ -1,4 +1,6 @@
-from muni_test import TestCase, TestRunner
+import glob
+from muni_test import TestCase, ParserConformanceCase, ConcurrentErrorCase, ConcurrentParseCase, SlowHandlerCase, DisassemblyCase, ProfileCase, ServerCase, CacheCase, BenchGateCase, BenchExitCase, TestRunner
+from muni_scheduler import HandlerScheduler, EventLoopScheduler
 runner = TestRunner()
 
 runner.add_test_case(TestCase(
@@ -62,6 +64,454 @@ runner.add_test_case(TestCase(
     expected_output="true"
 ))
 
+runner.add_test_case(TestCase(
+    description="Test Function Arguments Evaluated In Caller Scope",
+    input_code="int f(int a, int b) { return a - b; } int a = 10; int b = 3; f(b, a);",
+    expected_output="-7"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Resolved Parameters Keep Dynamic Scope",
+    input_code="int x = 100; int h(int y) { return x + y; } int k(int x) { x += 1; return h(1); } k(5);",
+    expected_output="7"
+))
+
+runner.add_test_case(TestCase(
+    description="Test List Copies Are Independent",
+    input_code="int x = 5; list a = [x, 2]; x = 9; list b = a; b = b + [3]; a;",
+    expected_output="<?>[5, 2]"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Nested List Copies Are Independent",
+    input_code="list a = [[1, 2], [3, 4]]; list b = a; a[0][1] = 9; b[1] = [0]; [a, b];",
+    expected_output="<?>[<?>[<?>[1, 9], <?>[3, 4]], <?>[<?>[1, 2], <?>[0]]]"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Nested Dict Copies Are Independent",
+    input_code="dict d = {1: {2: 3}}; dict e = d; e[1][2] = 4; d[5] = 6; [d, e];",
+    expected_output="<?>[{1: {2: 3} 5: 6}, {1: {2: 4}}]",
+    engine="closure"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Parameters Do Not Change The Caller's Nested Values",
+    input_code="void g(list p) { p[0][0] = 100; p[1] = 0; } void h(dict q) { q[1][2] = 7; } list a = [[1, 2], [3]]; dict d = {1: {2: 3}}; g(a); h(d); [a, d];",
+    expected_output="<?>[<?>[<?>[1, 2], <?>[3]], {1: {2: 3}}]",
+    engine="vm"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Range Iteration",
+    input_code="int s = 0; for (int i in 0..5) { s += i; } s;",
+    expected_output="10"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Range Loop Stops On Error",
+    input_code="int n = 0; for (int i in 0..100000000) { n += 1; throw \"stop\"; } n;",
+    expected_output="None"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Range Indexing",
+    input_code="(10..0:-3)[1];",
+    expected_output="7"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Typed List Storage",
+    input_code="list<int> a = [1, 2, 100000000000000000000]; a + (0..2);",
+    expected_output="<int>[1, 2, 100000000000000000000, 0, 1]"
+))
+
+runner.add_test_case(TestCase(
+    description="Test List Scaling",
+    input_code="list<float> a = [1.5, 2.0]; a * 2.0;",
+    expected_output="<float>[3.0, 4.0]"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Vectorized List Addition",
+    input_code="list<int> a = [1, 2]; a + [3, 4];",
+    expected_output="<int>[4, 6]",
+    vectorize=True
+))
+
+runner.add_test_case(TestCase(
+    description="Test Vector Reductions",
+    input_code="dot(0..4, 0..4) + sum(0..4) + max(0..4);",
+    expected_output="23"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Optimizer Folds Constants",
+    input_code="int f(int x) { if (2 > 1) { return x * (2 + 3); } return 0; } f(4) - 10 / 5;",
+    expected_output="18.0",
+    optimize=True
+))
+
+runner.add_test_case(TestCase(
+    description="Test Optimizer Hoisted Literals Are Copied",
+    input_code="list f() { list l = [1, 2]; l = l + [3]; return l; } f(); f();",
+    expected_output="<?>[1, 2, 3]",
+    optimize=True
+))
+
+runner.add_test_case(TestCase(
+    description="Test Optimizer Hoisted Nested Literals Are Copied",
+    input_code="string s = \"\"; for (int i in 0..3) { list a = [[1, 2], [3]]; dict d = {1: {2: 3}}; s += (a -> string) + (d -> string); a[0][0] = 9; d[1][2] = 9; } s;",
+    expected_output="<?>[<?>[1, 2], <?>[3]]{1: {2: 3}}<?>[<?>[1, 2], <?>[3]]{1: {2: 3}}<?>[<?>[1, 2], <?>[3]]{1: {2: 3}}",
+    optimize=True
+))
+
+runner.add_test_case(TestCase(
+    description="Test Optimizer Prunes Constant Top-Level Branches",
+    input_code="int a = 1; if (true) { a = 2; } if (1 > 2) { a = 3; } else { a += 10; } a;",
+    expected_output="12",
+    optimize=True,
+    engine="closure"
+))
+
+runner.add_test_case(CacheCase(
+    description="Test AST Cache Hits And Invalidation",
+    steps=[
+        {"code": "int a = 1; a;", "hit": False, "output": "1"},
+        {"code": None, "hit": True, "output": "1"},
+        {"code": "int a = 2; a;", "hit": False, "output": "2"},
+        {"code": None, "parser": "pratt", "hit": False, "output": "2"},
+        {"code": None, "hit": True, "output": "2"},
+        {"code": None, "parser": "pratt", "hit": True, "output": "2"},
+    ]
+))
+
+runner.add_test_case(CacheCase(
+    description="Test AST Cache Without Caching And With A Corrupted Tree",
+    steps=[
+        {"code": "int a = 1; a;", "hit": False, "output": "1"},
+        {"code": "int a = 3; a;", "cache": False, "hit": False, "output": "3"},
+        {"code": None, "hit": False, "output": "3"},
+        {"code": None, "corrupt": True, "hit": False, "output": "3"},
+        {"code": None, "hit": True, "output": "3"},
+    ]
+))
+
+runner.add_test_case(TestCase(
+    description="Test Scanner Literals",
+    input_code="string s = \"a # b\"; /* skipped\n */ 2.5e1 + 1; # trailing",
+    expected_output="26.0"
+))
+
+runner.add_test_case(ParserConformanceCase(
+    description="Test Pratt Parser Builds The LALR Trees",
+    paths=sorted(glob.glob("docs/Examples/*.mun")) + ["test.mun"]
+))
+
+runner.add_test_case(TestCase(
+    description="Test Pratt Parser Precedence",
+    input_code="int a = 2; int b = 3; a * b - 1 + b > 7 - a; -a * b -> float;",
+    expected_output="-6.0",
+    parser="pratt"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Streamed Statements Across Windows",
+    input_code="string s = \"a /* b\nc\";\n/* long\n comment */ int f(int x) {\n return x * 2; }\nif (f(2) > 3) { s = s + \"!\"; }\nelse { s = \"\"; }\ns;",
+    expected_output="a /* b\nc!",
+    engine="vm",
+    stream=True
+))
+
+runner.add_test_case(TestCase(
+    description="Test Diamond Import Runs Module Once",
+    input_code="int runs = 0; import <./import_left.mun>; import <./import_right.mun>; import <./import_base.mun>; runs * 10 + twice(2);",
+    expected_output="14",
+    files={
+        "./import_base.mun": "runs += 1; int twice(int x) { return x * 2; }",
+        "./import_left.mun": "import <./import_base.mun>;",
+        "./import_right.mun": "import <./import_base.mun>;",
+    }
+))
+
+runner.add_test_case(TestCase(
+    description="Test Signal Handlers On A Full Queue",
+    input_code="signal tick; int n = 0; when (tick) { n += 1; } for (int i = 0; i < 200; i += 1;) { emit tick; } while (n < 200) { int spin = n; } n;",
+    expected_output="200",
+    scheduler=HandlerScheduler(workers=1, queue_size=4)
+))
+
+runner.add_test_case(TestCase(
+    description="Test Event Loop Handlers Run In Emit Order",
+    input_code='signal tick; string log = ""; string expected = ""; when (tick) { log += "a"; } when (tick) { log += "b"; } for (int i = 0; i < 50; i += 1;) { emit tick; expected += "ab"; } while (length(log) < 100) { int spin = 0; } log == expected;',
+    expected_output="true",
+    scheduler=EventLoopScheduler(queue_size=4)
+))
+
+runner.add_test_case(SlowHandlerCase(
+    description="Test Slow Event Loop Handler Does Not Hold Up Coroutines",
+    scheduler=EventLoopScheduler()
+))
+
+runner.add_test_case(TestCase(
+    description="Test Watched Element Assignment",
+    input_code="list l = [1, 2]; int fired = 0; watch (l) { fired += 1; } l[0] = 5; while (fired < 1) { int spin = 0; } l[0] + fired;",
+    expected_output="6",
+    scheduler=EventLoopScheduler()
+))
+
+runner.add_test_case(TestCase(
+    description="Test Watched Element Assignment VM Engine",
+    input_code="list l = [1, 2]; int fired = 0; watch (l) { fired += 1; } l[0] = 5; while (fired < 1) { int spin = 0; } l[0] + fired;",
+    expected_output="6",
+    engine="vm",
+    scheduler=EventLoopScheduler()
+))
+
+runner.add_test_case(TestCase(
+    description="Test Coalesced Watch Runs Once Per Iteration",
+    input_code="signal done; int a = 0; int fired = 0; int finished = 0; watch (a) { fired += 1; } when (done) { finished = 1; } for (int i = 0; i < 10; i += 1;) { a += 1; a += 1; } emit done; while (finished == 0) { int spin = 0; } fired;",
+    expected_output="10",
+    engine="closure",
+    scheduler=EventLoopScheduler(),
+    coalesce_watches=True
+))
+
+# sort fails on the string only after comparing the numbers, long enough
+# for the other threads to run lines of their own in between
+concurrent_programs = {
+    "list l = [];\n" + "\n" * line + "for (int i = 0; i < 1000; i += 1;) { l += [i]; }\n" + 'l += ["a"];\n' + "sort(l);": line + 4
+    for line in range(8)
+}
+
+runner.add_test_case(ConcurrentErrorCase(
+    description="Test Concurrent Runtimes Report Their Own Error Lines",
+    programs=concurrent_programs
+))
+
+runner.add_test_case(ConcurrentErrorCase(
+    description="Test Concurrent Runtimes Report Their Own Error Lines Closure Engine",
+    programs=concurrent_programs,
+    engine="closure"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Ordered Parallel For Reductions",
+    input_code='int total = 0; string log = ""; parallel ordered for (int x in [1, 2, 3, 4, 5, 6, 7, 8, 9]) reduce (+: total, log) { total += x * x; log += x -> string; } log + " " + (total -> string);',
+    expected_output="123456789 285",
+    engine="vm"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Parallel For Ships The Globals Of Called Functions",
+    input_code="int k = 10; int f(int x) { return x + k; } int t = 0; parallel for (int x in [1, 2, 3]) reduce (+: t) { t += f(x); } t;",
+    expected_output="36",
+    engine="closure"
+))
+
+runner.add_test_case(DisassemblyCase(
+    description="Test Disassembly Of A Parallel For",
+    input_code="int t = 0; parallel for (int x in [1, 2]) reduce (+: t) { t += x; } t;",
+    instructions=["BUILD_LIST", "PARALLEL_FOR", "ParallelForInStatement"]
+))
+
+runner.add_test_case(TestCase(
+    description="Test Parallel Still Names Variables",
+    input_code="int parallel = 3; parallel += 1; int t = 0; parallel for (int x in [1, 2]) reduce (+: t) { t += x * parallel; } parallel + t;",
+    expected_output="16"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Parallel Still Names Variables Pratt Parser",
+    input_code='int parallel = 3; parallel += 1; string log = ""; parallel ordered for (int x in [1, 2]) reduce (+: log) { log += (x * parallel) -> string; } log;',
+    expected_output="48",
+    parser="pratt"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Parallel For Iterations Do Not Share Variables",
+    input_code="int seen = 0; int product = 1; parallel for (int x in [1, 2, 3, 4]) reduce (*: product) { seen += x; product *= x + seen; } product + seen;",
+    expected_output="384"
+))
+
+runner.add_test_case(ServerCase(
+    description="Test Server Runs Each Script In A Fresh Runtime",
+    scripts={
+        ('int n = 1; print("first " + $0);', ("a",)): "first a\n",
+        ('print(n);', ()): "Muni Error at line 1: Variable 'n' not found\n",
+        ('int n = 2; print("third " + $0 + $1);', ("b", "c")): "third bc\n",
+    },
+    options=("-e", "vm")
+))
+
+profiled_program = """int fib(int n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+int total = 0;
+for (int i = 0; i < 20; i += 1;) {
+    total += i;
+}
+fib(10) + total;"""
+
+runner.add_test_case(ProfileCase(
+    description="Test Profiler Counts Line And Function Hits",
+    input_code=profiled_program,
+    lines={2: 177, 3: 89, 5: 88, 7: 1, 8: 21, 9: 20, 11: 1},
+    functions={"fib": 177}
+))
+
+runner.add_test_case(ProfileCase(
+    description="Test Profiler Counts Line And Function Hits Closure Engine",
+    input_code=profiled_program,
+    lines={2: 177, 3: 89, 5: 88, 7: 1, 8: 21, 9: 20, 11: 1},
+    functions={"fib": 177},
+    engine="closure"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Closure Engine If Evaluates To Void",
+    input_code="int a = 1; if (a == 1) { a = 2; }",
+    expected_output="void",
+    engine="closure"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Closure Engine Scalar Writes Keep Their Casts",
+    input_code='int x = 1; x += 1.5; float y = 2.0; y = y * 2; int z = 7; int z = 2.9; x -> string + " " + (y -> string) + " " + (z -> string);',
+    expected_output="2 4.0 2",
+    engine="closure"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Closure Engine Scalar Writes Run Watchers",
+    input_code="int a = 0; int seen = 0; watch (a) { seen = a; } a += 5; while (seen == 0) { int spin = 0; } seen;",
+    expected_output="5",
+    engine="closure"
+))
+
+runner.add_test_case(TestCase(
+    description="Test VM Scalar Stores Keep Their Casts",
+    input_code='int x = 1; x += 1.5; float y = 2.0; y = y * 2; int z = 7; int z = 2.9; int n = 0; while (n < 4) { n += 1; y = y + 0.5; } x -> string + " " + (y -> string) + " " + (z -> string) + " " + (n -> string);',
+    expected_output="2 6.0 2 4",
+    engine="vm"
+))
+
+runner.add_test_case(TestCase(
+    description="Test VM Scalar Stores Run Watchers",
+    input_code="int a = 0; int seen = 0; watch (a) { seen = a; } a += 5; while (seen == 0) { int spin = 0; } seen;",
+    expected_output="5",
+    engine="vm"
+))
+
+runner.add_test_case(DisassemblyCase(
+    description="Test Disassembly Of Scalar Stores And Compare Jumps",
+    input_code="float y = 0.0; int i = 0; while (i < 10) { y = y + 0.5; i += 1; } y;",
+    instructions=["DECLARE_SCALAR", "COMPARE_JUMP_IF_FALSE", "ASSIGN_BINARY", "AUG_ASSIGN_CONST", "(< 10 to"]
+))
+
+runner.add_test_case(ConcurrentParseCase(
+    description="Test Parses On Several Threads",
+    input_code="int f(int x) { return x + 1; } if (f(1) > 1) { print(2); } " * 50
+))
+
+def bench_results(medians, outputs=None):
+    """Made-up results of warm benchmark runs, medians maps names to seconds or (seconds, stdev)."""
+    outputs = outputs or {}
+    benchmarks = {}
+    for name, median in medians.items():
+        median, stdev = median if isinstance(median, tuple) else (median, 0.001)
+        benchmarks[name] = {"output": outputs.get(name, "1"), "warm": {"median": median, "stdev": stdev}}
+    return {"engine": "tree", "interpreter": {}, "benchmarks": benchmarks}
+
+bench_baseline = {
+    "default_tolerance": 0.25,
+    "benchmarks": {name: {"output": "1"} for name in ("slow", "noisy", "fast", "wrong")},
+}
+bench_baseline["benchmarks"]["strict"] = {"output": "1", "tolerance": 0.05}
+slower_results = bench_results({"slow": 1.5, "noisy": (1.5, 0.4), "strict": 1.1, "fast": 0.5, "wrong": 1.0, "added": 1.0}, {"wrong": "2"})
+
+runner.add_test_case(BenchGateCase(
+    description="Test Bench Gate Tolerances, Spread And Outputs",
+    results=slower_results,
+    baseline=bench_baseline,
+    timings=bench_results({"slow": 1.0, "noisy": 1.0, "strict": 1.0, "fast": 1.0, "wrong": 1.0}),
+    statuses={
+        ("slow", "output"): "ok", ("slow", "warm"): "REGRESSION",
+        ("noisy", "output"): "ok", ("noisy", "warm"): "ok",
+        ("strict", "output"): "ok", ("strict", "warm"): "REGRESSION",
+        ("fast", "output"): "ok", ("fast", "warm"): "faster",
+        ("wrong", "output"): "WRONG OUTPUT", ("wrong", "warm"): "ok",
+        ("added", "output"): "new",
+    },
+    rerun=slower_results,
+    reruns=["slow", "strict"],
+    fails=True
+))
+
+runner.add_test_case(BenchGateCase(
+    description="Test Bench Gate Runs Suspects Again",
+    results=bench_results({"slow": 1.5, "fast": 1.0}),
+    baseline=bench_baseline,
+    timings=bench_results({"slow": 1.0, "fast": 1.0}),
+    statuses={("slow", "output"): "ok", ("slow", "warm"): "ok", ("fast", "output"): "ok", ("fast", "warm"): "ok"},
+    rerun=bench_results({"slow": 1.02}),
+    reruns=["slow"]
+))
+
+runner.add_test_case(BenchGateCase(
+    description="Test Bench Gate Without Recorded Timings",
+    results=bench_results({"slow": 1.5}),
+    baseline=bench_baseline,
+    timings=None,
+    statuses={("slow", "output"): "ok", ("slow", "warm"): "not recorded"}
+))
+
+runner.add_test_case(BenchExitCase(
+    description="Test Bench Check Fails On A Wrong Output",
+    benchmark="recursion",
+    baseline={"benchmarks": {"recursion": {"output": "0"}}},
+    status=1
+))
+
+runner.add_test_case(BenchExitCase(
+    description="Test Bench Check Refuses Timings Of Another Machine",
+    benchmark="recursion",
+    baseline={"benchmarks": {"recursion": {"output": "1660"}}},
+    timings={"engine": "tree", "interpreter": {"host": "elsewhere"}, "benchmarks": {}},
+    status=2
+))
+
+runner.add_test_case(TestCase(
+    description="Test Closure Engine Loop",
+    input_code="int a = 0; int i = 0; while (i < 10) { a += i; i += 1; } a;",
+    expected_output="45",
+    engine="closure"
+))
+
+runner.add_test_case(TestCase(
+    description="Test Closure Engine Recursion",
+    input_code="int fib(int n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); } fib(10);",
+    expected_output="55",
+    engine="closure"
+))
+
+runner.add_test_case(TestCase(
+    description="Test VM Engine Loop",
+    input_code="int a = 0; for (int i = 0; i < 10; i += 1;) { a += i; } a;",
+    expected_output="45",
+    engine="vm"
+))
+
+runner.add_test_case(TestCase(
+    description="Test VM Engine Recursion",
+    input_code="int fib(int n) { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); } fib(10);",
+    expected_output="55",
+    engine="vm"
+))
+
 
 
 runner.run()
\ No newline at end of file